@@ -0,0 +1,64 @@
+import sys
+import os
+import time
+
+# Add the dags directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dags')))
+
+from nubanner_utils import CLASS_FIELDS, NUBannerHarvester  # Import after updating sys.path
+from nubanner_stub_server import NUBannerStubServer, expand_recording, load_recordings
+
+RECORDINGS = os.path.join(os.path.dirname(__file__), "fixtures", "nubanner")
+
+
+def test_harvest_pages_through_search_results_in_the_class_schema():
+    with NUBannerStubServer.from_directory(RECORDINGS) as server:
+        harvester = NUBannerHarvester(server.url, page_size=2, min_interval=0, backoff=0)
+        records = harvester.harvest("202410", "CSYE")
+
+        assert [list(record) for record in records] == [list(CLASS_FIELDS)] * 3
+        assert records[0] == {
+            "term": "Fall 2023 Semester",
+            "course_code": "CSYE 6200",
+            "crn": "10234",
+            "campus": "Boston",
+            "schedule_type": "Lecture",
+            "instructional_method": "Traditional",
+            "instructor": "Rao, Priya",
+            "start_date": "09/06/2023",
+            "end_date": "12/13/2023",
+            "timing_location": "Class on: Monday, Wednesday | 01:45 PM - 03:25 PM Type: Class "
+                               "Location: Boston Building: Richards Hall Room: 235",
+            "enrollment_max": "60",
+            "seats_available": "4",
+            "waitlist_capacity": "10",
+            "waitlist_seats_available": "10",
+        }
+        assert records[1]["instructor"] == "Chen, Li; Hillyard, Robin"
+        # Meetings left out of the search results come from the section-detail endpoint
+        assert records[2]["instructor"] == "Kim, Daniel"
+        assert records[2]["timing_location"].startswith("Class on: Thursday | 06:00 PM - 09:20 PM")
+        assert server.hits["searchResults/searchResults"] == 2
+        assert server.hits["searchResults/getFacultyMeetingTimes"] == 1
+
+        # A second subject in the same term resets the form instead of selecting the term again;
+        # an expired session is re-established once and the search resumes
+        server.expire_sessions()
+        assert len(harvester.harvest("202410", "CSYE")) == 3
+        assert server.hits["term/search"] == 2 and server.hits["classSearch/resetDataForm"] == 1
+        harvester.close()
+
+
+def test_retries_throttling_and_spaces_requests():
+    recordings = {key: expand_recording(recording, 12) for key, recording in load_recordings(RECORDINGS).items()}
+    with NUBannerStubServer(recordings, fail_first=2) as server:
+        harvester = NUBannerHarvester(server.url, page_size=5, min_interval=0.05, backoff=0)
+        started = time.monotonic()
+        records = harvester.harvest("202410", "CSYE")
+        elapsed = time.monotonic() - started
+        harvester.close()
+
+    assert len({record["crn"] for record in records}) == 12
+    # Term selection, three search pages and four detail lookups, the first retried twice after 503s
+    assert harvester.requests == 8
+    assert elapsed >= 7 * 0.05
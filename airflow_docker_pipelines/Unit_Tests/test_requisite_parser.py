@@ -0,0 +1,50 @@
+import sys
+import os
+
+# Add the dags directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../dags')))
+
+from requisite_parser import parse_requisites, flatten_requisite_tree  # Import after updating sys.path
+
+
+def course(course_code, min_grade=None):
+    return {"type": "COURSE", "course_code": course_code, "min_grade": min_grade}
+
+
+def test_parses_catalog_requisite_structure():
+    """Parenthesised ORs, ';' conjunctions and minimum grades survive parsing."""
+    text = (
+        "(INFO 5100 with a minimum grade of C- or CSYE 6200 with a minimum grade of C- ); "
+        "DAMG 6210 with a minimum grade of B+"
+    )
+    assert parse_requisites(text) == {
+        "type": "AND",
+        "children": [
+            {"type": "OR", "children": [course("INFO 5100", "C-"), course("CSYE 6200", "C-")]},
+            course("DAMG 6210", "B+"),
+        ],
+    }
+
+
+def test_operator_precedence_and_free_text():
+    """'and' binds tighter than 'or'; non-course requirements are kept as text leaves."""
+    assert parse_requisites("MATH 1341 and CS 2500 or Graduate Program Admission") == {
+        "type": "OR",
+        "children": [
+            {"type": "AND", "children": [course("MATH 1341"), course("CS 2500")]},
+            {"type": "TEXT", "text": "Graduate Program Admission"},
+        ],
+    }
+    # Blocks joined by extract_requisites with " AND " are conjunctions too
+    assert parse_requisites("INFO 5100 AND INFO 6105")["type"] == "AND"
+    assert parse_requisites(None) is None
+    assert parse_requisites("(INFO 5100 or") == course("INFO 5100")
+
+
+def test_flatten_requisite_tree_rows():
+    rows = flatten_requisite_tree("INFO 6105", "PREREQUISITE", parse_requisites("INFO 5100 or CSYE 6200"))
+    assert rows == [
+        ("INFO 6105", "PREREQUISITE", 1, None, 0, "OR", None, None, None),
+        ("INFO 6105", "PREREQUISITE", 2, 1, 0, "COURSE", "INFO 5100", None, None),
+        ("INFO 6105", "PREREQUISITE", 3, 1, 1, "COURSE", "CSYE 6200", None, None),
+    ]
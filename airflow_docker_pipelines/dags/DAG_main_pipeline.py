@@ -1,5 +1,6 @@
 from airflow import DAG
 from airflow.operators.python import PythonOperator
+from airflow.operators.bash import BashOperator
 from datetime import datetime
 from snowflake_setup import snowflake_setup
 from load_program_requirements_data import load_program_requirements
@@ -115,7 +116,18 @@ with DAG(
         provide_context=True
     )
 
+    # Catalog/requirements changes leave every user's eligibility stale; rebuild it with the backend job.
+    # The checkpoint lives on the logs volume so a retry resumes where the failed attempt stopped.
+    recalculate_all_eligibility_task = BashOperator(
+        task_id='recalculate_all_eligibility',
+        bash_command=(
+            'cd /opt/airflow/backend && python -m neu_sa.utils.bulk_recalculate '
+            '--resume --checkpoint /opt/airflow/logs/bulk_eligibility_checkpoint.json'
+        )
+    )
+
     # Define task dependencies
     setup_snowflake_task >> load_program_requirements_task >> load_classes_data_task
     load_classes_data_task >> scrape_course_catalog_task >> load_course_catalog_to_snowflake_task >> store_course_catalog_to_pinecone_task
+    load_course_catalog_to_snowflake_task >> recalculate_all_eligibility_task
     process_resources_task >> process_graduation_info_task >> process_faq_task
@@ -1,6 +1,28 @@
 import snowflake.connector
 import os
+import json
 from io import StringIO
+from requisite_parser import parse_requisites, flatten_requisite_tree
+
+def build_requisite_rows(df):
+    """
+    COURSE_REQUISITES rows for every course in the DataFrame. Uses the trees parsed at scrape
+    time and falls back to parsing the raw text (e.g. for catalogs scraped before the tree columns existed).
+    """
+    rows = []
+    for _, row in df.iterrows():
+        for requisite_type, tree_column, text_column in (
+            ("PREREQUISITE", "PREREQUISITE_TREE", "PREREQUISITES"),
+            ("COREQUISITE", "COREQUISITE_TREE", "COREQUISITES"),
+        ):
+            tree_json = row.get(tree_column)
+            if isinstance(tree_json, str):
+                tree = json.loads(tree_json)
+            else:
+                text = row.get(text_column)
+                tree = parse_requisites(text) if isinstance(text, str) else None
+            rows.extend(flatten_requisite_tree(row["COURSE_CODE"], requisite_type, tree))
+    return rows
 
 def load_course_catalog_to_snowflake(df):
     """
@@ -74,6 +96,30 @@ def load_course_catalog_to_snowflake(df):
         """)
         print(f"Data merged successfully into {table_name}.")
 
+        # Replace the requisite trees of the loaded courses
+        print("Loading requisite trees into COURSE_REQUISITES...")
+        cursor.execute(f"DELETE FROM COURSE_REQUISITES WHERE COURSE_CODE IN (SELECT COURSE_CODE FROM TEMP_{table_name});")
+        requisite_rows = build_requisite_rows(df)
+        if requisite_rows:
+            cursor.executemany(
+                """
+                INSERT INTO COURSE_REQUISITES (
+                    COURSE_CODE, REQUISITE_TYPE, NODE_ID, PARENT_ID, POSITION, NODE_TYPE, REQUIRED_COURSE, MIN_GRADE, DETAIL
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                requisite_rows,
+            )
+        print(f"Loaded {len(requisite_rows)} requisite nodes.")
+
+        # Signal the backend program catalog cache to reload (course credits/prerequisites may have changed)
+        cursor.execute("""
+            MERGE INTO CATALOG_GENERATION AS target
+            USING (SELECT 'PROGRAM_CATALOG' AS NAME) AS source
+            ON target.NAME = source.NAME
+            WHEN MATCHED THEN UPDATE SET GENERATION = target.GENERATION + 1, UPDATED_AT = CURRENT_TIMESTAMP()
+            WHEN NOT MATCHED THEN INSERT (NAME, GENERATION, UPDATED_AT) VALUES (source.NAME, 1, CURRENT_TIMESTAMP());
+        """)
+
         # Commit and close the connection
         conn.commit()
         cursor.close()
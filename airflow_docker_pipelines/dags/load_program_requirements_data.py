@@ -183,7 +183,16 @@ def load_program_requirements():
         """INSERT INTO ELECTIVE_REQUIREMENTS (PROGRAM_ID, SUBJECT_CODE) VALUES ('MP_TN_MS', 'TELE');""",
 
         """INSERT INTO SUBJECT_AREAS (PROGRAM_ID, SUBJECT_CODE, MIN_CREDIT_HOURS) VALUES ('MP_SES_MS', 'CSYE', 12);""",
-        """INSERT INTO SUBJECT_AREAS (PROGRAM_ID, SUBJECT_CODE, MIN_CREDIT_HOURS) VALUES ('MP_IS_MSIS', 'INFO', 16);"""
+        """INSERT INTO SUBJECT_AREAS (PROGRAM_ID, SUBJECT_CODE, MIN_CREDIT_HOURS) VALUES ('MP_IS_MSIS', 'INFO', 16);""",
+
+        # Signal the backend program catalog cache to reload
+        """
+            MERGE INTO CATALOG_GENERATION AS target
+            USING (SELECT 'PROGRAM_CATALOG' AS NAME) AS source
+            ON target.NAME = source.NAME
+            WHEN MATCHED THEN UPDATE SET GENERATION = target.GENERATION + 1, UPDATED_AT = CURRENT_TIMESTAMP()
+            WHEN NOT MATCHED THEN INSERT (NAME, GENERATION, UPDATED_AT) VALUES (source.NAME, 1, CURRENT_TIMESTAMP());
+        """
      ]
 
     loader = SnowflakeLoader()
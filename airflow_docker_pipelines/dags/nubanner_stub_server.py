@@ -0,0 +1,203 @@
+import argparse
+import copy
+import json
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Path prefix of the registration endpoints, as on NUBanner
+BASE_PATH = "/StudentRegistrationSsb/ssb"
+
+# Largest page Banner serves, whatever pageMaxSize asks for
+MAX_PAGE_SIZE = 500
+
+
+def load_recordings(path):
+    """
+    Recordings are `<term>_<subject>.json` files holding `sections` (search results, as NUBanner
+    returns them) and optionally `faculty_meeting_times` (CRN -> getFacultyMeetingTimes entries).
+    """
+    recordings = {}
+    for name in os.listdir(path):
+        if name.endswith(".json"):
+            term_id, subject_code = name[:-len(".json")].split("_", 1)
+            with open(os.path.join(path, name)) as f:
+                recordings[(term_id, subject_code)] = json.load(f)
+    return recordings
+
+
+def expand_recording(recording, size):
+    """A recording with `size` sections, repeating the recorded ones under new CRNs (for benchmarks)."""
+    sections, meeting_times = [], {}
+    recorded = recording["sections"]
+    for index in range(size):
+        section = copy.deepcopy(recorded[index % len(recorded)])
+        recorded_crn = section["courseReferenceNumber"]
+        crn = str(int(recorded_crn) + 100000 * (index // len(recorded)))
+        if recorded_crn in recording.get("faculty_meeting_times", {}):
+            meeting_times[crn] = recording["faculty_meeting_times"][recorded_crn]
+        section["courseReferenceNumber"] = crn
+        section["id"] = index + 1
+        sections.append(section)
+    return {"sections": sections, "faculty_meeting_times": meeting_times}
+
+
+class NUBannerStubServer:
+    """
+    Local stand-in for NUBanner's class search endpoints, serving recorded responses so the
+    harvester runs offline. Like Banner, searches only work in a session whose term was
+    selected first, and pages are capped at MAX_PAGE_SIZE. `latency` delays every response,
+    `fail_first` answers the first requests with 503s, and expire_sessions() drops every
+    session, to exercise the harvester's retries.
+    """
+
+    def __init__(self, recordings, latency=0.0, fail_first=0, host="127.0.0.1", port=0):
+        self.recordings = dict(recordings)
+        self.latency = latency
+        self.fail_first = fail_first
+        self.hits = {}
+        self._sessions = {}  # JSESSIONID -> selected term
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @classmethod
+    def from_directory(cls, path, **kwargs):
+        return cls(load_recordings(path), **kwargs)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{BASE_PATH}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def expire_sessions(self):
+        with self._lock:
+            self._sessions.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handle(self, method, path, query, form, session_id):
+        """:return: (status, JSON body, session ID to set or None)"""
+        with self._lock:
+            self.hits[path] = self.hits.get(path, 0) + 1
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                return 503, {"error": "Service Unavailable"}, None
+            term_id = self._sessions.get(session_id)
+
+        if method == "POST" and path == "term/search":
+            session_id = session_id or uuid.uuid4().hex
+            with self._lock:
+                self._sessions[session_id] = form.get("term", "")
+            return 200, {"fwdURL": f"{BASE_PATH}/classSearch/classSearch"}, session_id
+
+        if method == "POST" and path == "classSearch/resetDataForm":
+            return 200, True, None
+
+        if method == "GET" and path == "searchResults/searchResults":
+            recording = self.recordings.get((query.get("txt_term"), query.get("txt_subject")), {"sections": []})
+            if term_id is None or term_id != query.get("txt_term"):
+                return 200, {"success": False, "totalCount": 0, "data": None}, None
+            offset = int(query.get("pageOffset", 0))
+            size = min(int(query.get("pageMaxSize", 10)), MAX_PAGE_SIZE)
+            sections = recording["sections"]
+            page = sections[offset:offset + size]
+            return 200, {
+                "success": True,
+                "totalCount": len(sections),
+                "data": page,
+                "pageOffset": offset,
+                "pageMaxSize": size,
+                "sectionsFetchedCount": len(page),
+            }, None
+
+        if method == "GET" and path == "searchResults/getFacultyMeetingTimes":
+            for (recorded_term, _), recording in self.recordings.items():
+                meeting_times = recording.get("faculty_meeting_times", {})
+                if recorded_term == query.get("term") and query.get("courseReferenceNumber") in meeting_times:
+                    return 200, {"fmt": meeting_times[query["courseReferenceNumber"]]}, None
+            return 200, {"fmt": []}, None
+
+        return 404, {"error": f"Unknown endpoint: {method} {path}"}, None
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self, method):
+                parsed = urlparse(self.path)
+                path = parsed.path[len(BASE_PATH) + 1:] if parsed.path.startswith(BASE_PATH + "/") else parsed.path
+                query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+                form = {}
+                if method == "POST":
+                    body = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode()
+                    form = {key: values[-1] for key, values in parse_qs(body, keep_blank_values=True).items()}
+                cookies = dict(
+                    part.strip().split("=", 1) for part in (self.headers.get("Cookie") or "").split(";") if "=" in part
+                )
+
+                if stub.latency:
+                    time.sleep(stub.latency)
+                status, body, session_id = stub._handle(method, path, query, form, cookies.get("JSESSIONID"))
+
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if status == 503:
+                    self.send_header("Retry-After", "0")
+                if session_id:
+                    self.send_header("Set-Cookie", f"JSESSIONID={session_id}; Path={BASE_PATH}")
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._respond("GET")
+
+            def do_POST(self):
+                self._respond("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+# Serve recordings for local runs and benchmarks:
+#   python nubanner_stub_server.py ../Unit_Tests/fixtures/nubanner --port 8099 --sections 2000 --latency 0.05
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded NUBanner class search responses locally.")
+    parser.add_argument("recordings", help="Directory of <term>_<subject>.json recordings")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--sections", type=int, help="Repeat each recording's sections up to this many")
+    args = parser.parse_args()
+
+    recordings = load_recordings(args.recordings)
+    if args.sections:
+        recordings = {key: expand_recording(recording, args.sections) for key, recording in recordings.items()}
+    server = NUBannerStubServer(recordings, latency=args.latency, port=args.port)
+    server.start()
+    print(f"Serving {len(recordings)} recordings at {server.url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
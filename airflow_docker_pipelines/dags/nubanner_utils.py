@@ -1,248 +1,225 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import argparse
+import threading
 import time
-from selenium.common.exceptions import WebDriverException
+import uuid
 import boto3
 import os
 from io import StringIO
 
-def init_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    
-    service = Service("/usr/local/bin/chromedriver")
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    return driver
-
-
-def fetch_class_details(driver, subject_code):
-    """Extract class details."""
-    try:
-        popup_section = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "section[aria-labelledby='classDetails']"))
-        )
-
-        section_text = popup_section.text
-        course_number = popup_section.find_element(By.ID, "courseNumber").text.strip()
-        details = {
-            "term": section_text.split("Associated Term:")[1].split("\n")[0].strip(),
-            "course_code": f"{subject_code} {course_number}",
-            "crn": popup_section.find_element(By.ID, "courseReferenceNumber").text.strip(),
-            "campus": section_text.split("Campus:")[1].split("\n")[0].strip(),
-            "schedule_type": section_text.split("Schedule Type:")[1].split("\n")[0].strip(),
-            "instructional_method": section_text.split("Instructional Method:")[1].split("\n")[0].strip(),
-        }
-        return details
-    except Exception as e:
-        print(f"Error fetching class details: {e}")
-        return {}
+# NUBanner self-service registration; point it at nubanner_stub_server for tests and benchmarks
+NUBANNER_BASE_URL = os.getenv("NUBANNER_BASE_URL", "https://nubanner.neu.edu/StudentRegistrationSsb/ssb")
 
-def fetch_instructor_meeting_times(driver):
-    """Extract instructor and meeting times with labeled classes for multiple entries."""
-    try:
-        instructor_tab = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//h3[@id='facultyMeetingTimes']/a"))
-        )
-        instructor_tab.click()
+# Sections requested per search page (Banner serves at most 500)
+NUBANNER_PAGE_SIZE = min(int(os.getenv("NUBANNER_PAGE_SIZE", "500")), 500)
 
-        # Wait for all meeting entries to load
-        meeting_entries = WebDriverWait(driver, 10).until(
-            EC.presence_of_all_elements_located((By.CLASS_NAME, "meeting-faculty"))
-        )
+# Minimum seconds between two requests, so a harvest stays polite to the registration system
+NUBANNER_MIN_INTERVAL = float(os.getenv("NUBANNER_MIN_INTERVAL", "0.5"))
 
-        instructors = []  # Collect unique instructor names
-        start_date, end_date = "", ""
-        timing_location_details = []  # Collect all timing and location combinations
-
-        for idx, entry in enumerate(meeting_entries, start=1):  # Enumerate entries for labeling
-            try:
-                # Check if the entry is collapsible (has an accordion trigger)
-                expand_button = entry.find_element(By.CLASS_NAME, "accordion-trigger")
-                if expand_button.get_attribute("aria-expanded") == "false":
-                    expand_button.click()
-            except Exception:
-                # If no accordion-trigger is found, assume the entry is expanded
-                pass
-
-            # Check if the Type is "Class"
-            meeting_type_element = entry.find_element(By.XPATH, ".//div[contains(text(), 'Type:')]")
-            meeting_type = meeting_type_element.text.split(":")[-1].strip()
-
-            if meeting_type.lower() == "class":
-                # Extract instructor details (if not already captured)
-                if not instructors:
-                    instructor_elements = entry.find_elements(By.CSS_SELECTOR, "span.meeting-faculty-member a")
-                    instructors = [el.text for el in instructor_elements]
-
-                # Extract dates (if not already captured)
-                if not start_date and not end_date:
-                    dates_element = entry.find_element(By.CLASS_NAME, "dates")
-                    start_date, end_date = dates_element.text.split(" - ") if " - " in dates_element.text else (dates_element.text, "")
-
-                # Extract timing and location
-                timing_location_element = entry.find_element(By.CLASS_NAME, "right")
-                timing_location = timing_location_element.text.strip()
-
-                # Extract days (Class on)
-                class_on_element = entry.find_element(By.CLASS_NAME, "ui-pillbox")
-                class_on = class_on_element.get_attribute("title").replace("Class on: ", "").strip()
-
-
-                # Combine `Class on` with `Timing and Location` and label it
-                labeled_timing_location = f"Class on: {class_on} | {timing_location}"
-                timing_location_details.append(labeled_timing_location)
-
-        # Combine all instructors into a single string and join timing/location details
-        instructors_str = "; ".join(set(instructors))  # Remove duplicates, if any
-        timing_location_combined = " | ".join(timing_location_details)
-
-        return {
-            "instructor": instructors_str,
-            "start_date": start_date.strip(),
-            "end_date": end_date.strip(),
-            "timing_location": timing_location_combined.strip(),
-        }
-    except Exception as e:
-        print(f"Error fetching instructor/meeting times: {e}")
-        return {}
-
-
-
-def fetch_enrollment_details(driver):
-    """Extract enrollment and waitlist details."""
-    try:
-        enrollment_tab = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//h3[@id='enrollmentInfo']/a"))
-        )
-        enrollment_tab.click()
-
-        enrollment_section = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "section[aria-labelledby='enrollmentInfo']"))
-        )
+# Retries of connection errors, throttling and 5xx responses, with exponential backoff (Retry-After is honoured)
+NUBANNER_RETRIES = int(os.getenv("NUBANNER_RETRIES", "5"))
+NUBANNER_BACKOFF = float(os.getenv("NUBANNER_BACKOFF", "1.0"))
 
-        details = {
-            "enrollment_max": enrollment_section.find_element(By.XPATH, ".//span[contains(text(), 'Enrollment Maximum:')]/following-sibling::span").text.strip(),
-            "seats_available": enrollment_section.find_element(By.XPATH, ".//span[contains(text(), 'Enrollment Seats Available:')]/following-sibling::span").text.strip(),
-            "waitlist_capacity": enrollment_section.find_element(By.XPATH, ".//span[contains(text(), 'Waitlist Capacity:')]/following-sibling::span").text.strip(),
-            "waitlist_seats_available": enrollment_section.find_element(By.XPATH, ".//span[contains(text(), 'Waitlist Seats Available:')]/following-sibling::span").text.strip(),
-        }
-        return details
-    except Exception as e:
-        print(f"Error fetching enrollment details: {e}")
-        return {}
+# Seconds to wait for a response
+NUBANNER_TIMEOUT = float(os.getenv("NUBANNER_TIMEOUT", "30"))
 
-def main(term, term_id, program, subject_code):
-    driver = init_driver()
-    data = []  # List to store all course details
+RETRY_STATUSES = (429, 500, 502, 503, 504)
 
-    try:
-        driver.get("https://nubanner.neu.edu/StudentRegistrationSsb/ssb/registration/registration")
-        print(f"Page loaded: {term}, {program}, {subject_code}.")
+# Meeting days in the order Banner lists them
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
 
-        browse_classes_link = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.ID, "classSearchLink"))
-        )
-        browse_classes_link.click()
-        print("Navigated to Browse Classes.")
+# Record fields, in the column order of the CLASSES table (COPY INTO maps CSV columns by position)
+CLASS_FIELDS = (
+    "term", "course_code", "crn", "campus", "schedule_type", "instructional_method",
+    "instructor", "start_date", "end_date", "timing_location",
+    "enrollment_max", "seats_available", "waitlist_capacity", "waitlist_seats_available",
+)
 
-        term_dropdown = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CLASS_NAME, "select2-choice"))
-        )
-        term_dropdown.click()
 
-        term_search_input = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "s2id_autogen1_search"))
-        )
-        term_search_input.send_keys(term)
-        time.sleep(2)
+class NUBannerSessionError(RuntimeError):
+    """NUBanner kept rejecting searches after the term was selected again."""
 
-        matching_term = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, f"//div[@id='{term_id}']"))
-        )
-        matching_term.click()
 
-        continue_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.ID, "term-go"))
-        )
-        continue_button.click()
+class NUBannerHarvester:
+    """
+    Reads class sections from NUBanner's JSON endpoints over one pooled HTTP session.
 
-        subject_input = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "ul.select2-choices input.select2-input"))
-        )
-        subject_input.send_keys(program)
-        time.sleep(2)
+    A search page carries up to 500 sections with their enrollment, instructors and meeting
+    times, so a subject usually takes a handful of requests; the section-detail endpoint is
+    only called for sections whose meetings the search left out. Requests are spaced at
+    least `min_interval` seconds apart and retried with backoff on throttling and 5xx.
+    """
 
-        matching_subject = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, f"//div[@id='{subject_code}']"))
-        )
-        matching_subject.click()
+    def __init__(self, base_url=NUBANNER_BASE_URL, page_size=NUBANNER_PAGE_SIZE, min_interval=NUBANNER_MIN_INTERVAL,
+                 retries=NUBANNER_RETRIES, backoff=NUBANNER_BACKOFF, timeout=NUBANNER_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.page_size = page_size
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.requests = 0
 
-        search_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.ID, "search-go"))
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "POST"}),  # Term selection and form resets are idempotent
+            respect_retry_after_header=True,
+            raise_on_status=False,
         )
-        search_button.click()
-        print("Search completed.")
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept": "application/json", "User-Agent": "neu-sa-class-harvester/1.0"})
+
+        self._lock = threading.Lock()
+        self._next_request_at = 0.0
+        self._term_id = None
+        self._searched = False
+        self._unique_session_id = uuid.uuid4().hex[:5] + str(int(time.time() * 1000))
+
+    def _request(self, method, path, **kwargs):
+        with self._lock:
+            wait = self._next_request_at - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._next_request_at = time.monotonic() + self.min_interval
+            self.requests += 1
+        response = self.session.request(method, f"{self.base_url}/{path}", timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def select_term(self, term_id):
+        """Start a search session for the term (Banner keeps the selected term server-side)."""
+        self._request("POST", "term/search", params={"mode": "search"}, data={
+            "term": term_id, "studyPath": "", "studyPathText": "",
+            "startDatepicker": "", "endDatepicker": "", "uniqueSessionId": self._unique_session_id,
+        })
+        self._term_id = term_id
+        self._searched = False
+
+    def _search_page(self, term_id, subject_code, offset):
+        return self._request("GET", "searchResults/searchResults", params={
+            "txt_subject": subject_code, "txt_term": term_id,
+            "startDatepicker": "", "endDatepicker": "", "uniqueSessionId": self._unique_session_id,
+            "pageOffset": offset, "pageMaxSize": self.page_size,
+            "sortColumn": "subjectDescription", "sortDirection": "asc",
+        }).json()
+
+    def search_sections(self, term_id, subject_code):
+        """Yield the raw sections of a subject in a term, page by page."""
+        if self._term_id != term_id:
+            self.select_term(term_id)
+        elif self._searched:
+            # The previous search's criteria stay in the session until the form is reset
+            self._request("POST", "classSearch/resetDataForm")
+        self._searched = True
+
+        offset, total = 0, None
+        reselected = False
+        while total is None or offset < total:
+            page = self._search_page(term_id, subject_code, offset)
+            if not page.get("success") or page.get("data") is None:
+                # An expired session forgets the term; select it again once, then resume at this page
+                if reselected:
+                    raise NUBannerSessionError(f"NUBanner rejected the search for {subject_code} in {term_id}.")
+                reselected = True
+                self.select_term(term_id)
+                self._searched = True
+                continue
+            reselected = False
+            sections = page["data"]
+            if not sections:
+                break
+            yield from sections
+            total = page.get("totalCount", 0)
+            offset += len(sections)
+
+    def faculty_meeting_times(self, term_id, crn):
+        """Instructors and meeting times of one section, from the section-detail endpoint."""
+        return self._request("GET", "searchResults/getFacultyMeetingTimes", params={
+            "term": term_id, "courseReferenceNumber": crn,
+        }).json().get("fmt") or []
+
+    def harvest(self, term_id, subject_code):
+        """Records (see CLASS_FIELDS) for every section of a subject in a term."""
+        records = []
+        for section in self.search_sections(term_id, subject_code):
+            meetings = section.get("meetingsFaculty")
+            if meetings is None:
+                meetings = self.faculty_meeting_times(term_id, section["courseReferenceNumber"])
+            records.append(section_record(section, meetings))
+        return records
+
+    def close(self):
+        self.session.close()
+
+
+def _clock_time(value):
+    # Banner times are "HHMM" on a 24-hour clock
+    if not value:
+        return ""
+    hours, minutes = int(value[:2]), value[2:]
+    return f"{(hours - 1) % 12 + 1:02d}:{minutes} {'AM' if hours < 12 else 'PM'}"
+
+
+def _timing_location(meeting_time):
+    days = ", ".join(day.capitalize() for day in WEEKDAYS if meeting_time.get(day))
+    begin, end = _clock_time(meeting_time.get("beginTime")), _clock_time(meeting_time.get("endTime"))
+    timing = f"{begin} - {end}" if begin else "None"
+    return (
+        f"Class on: {days or 'None'} | {timing} Type: Class "
+        f"Location: {meeting_time.get('campusDescription') or 'None'} "
+        f"Building: {meeting_time.get('buildingDescription') or 'None'} "
+        f"Room: {meeting_time.get('room') or 'None'}"
+    )
 
-        total_pages_element = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "span.paging-text.total-pages"))
-        )
-        total_pages = int(total_pages_element.text)
-        print(f"Total pages: {total_pages}")
-
-        for page in range(1, total_pages + 1):
-            print(f"Processing page {page}...")
-
-            sections = WebDriverWait(driver, 10).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "a.section-details-link"))
-            )
-
-            for section in sections:
-                retry_attempts = 3
-                for attempt in range(retry_attempts):
-                    try:
-                        driver.execute_script("arguments[0].scrollIntoView(true);", section)
-                        section.click()
-                        break
-                    except WebDriverException as e:
-                        print(f"Retry {attempt + 1}: Element not clickable. Retrying...")
-                        time.sleep(2)
-
-                class_details = fetch_class_details(driver, subject_code)
-                meeting_details = fetch_instructor_meeting_times(driver)
-                enrollment_details = fetch_enrollment_details(driver)
-
-                if class_details and meeting_details and enrollment_details:
-                    combined_details = {**class_details, **meeting_details, **enrollment_details}
-                    data.append(combined_details)
-
-                close_button = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "a.ui-dialog-titlebar-close"))
-                )
-                close_button.click()
-                time.sleep(2)
-
-            if page < total_pages:
-                next_button = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "button.paging-control.next"))
-                )
-                next_button.click()
-                time.sleep(3)
 
+def section_record(section, meetings):
+    """One class record from a search result section and its faculty/meeting entries."""
+    class_meetings = [
+        meeting["meetingTime"] for meeting in meetings
+        if (meeting.get("meetingTime") or {}).get("meetingTypeDescription", "").lower() == "class"
+    ]
+    faculty = section.get("faculty") or [person for meeting in meetings for person in meeting.get("faculty") or []]
+    instructors = sorted({person["displayName"] for person in faculty if person.get("displayName")})
+    first = class_meetings[0] if class_meetings else {}
+
+    return {
+        "term": section.get("termDesc", ""),
+        "course_code": f"{section['subject']} {section['courseNumber']}",
+        "crn": str(section["courseReferenceNumber"]),
+        "campus": section.get("campusDescription") or "",
+        "schedule_type": section.get("scheduleTypeDescription") or "",
+        "instructional_method": section.get("instructionalMethodDescription") or "",
+        "instructor": "; ".join(instructors),
+        "start_date": first.get("startDate") or "",
+        "end_date": first.get("endDate") or "",
+        "timing_location": " | ".join(_timing_location(meeting_time) for meeting_time in class_meetings),
+        "enrollment_max": str(section.get("maximumEnrollment", "")),
+        "seats_available": str(section.get("seatsAvailable", "")),
+        "waitlist_capacity": str(section.get("waitCapacity", "")),
+        "waitlist_seats_available": str(section.get("waitAvailable", "")),
+    }
+
+
+def main(term, term_id, program, subject_code, harvester=None):
+    """Collect the class sections of one subject in one term."""
+    owned = harvester is None
+    harvester = harvester or NUBannerHarvester()
+    data = []
+    try:
+        print(f"Harvesting: {term}, {program}, {subject_code}.")
+        data = harvester.harvest(term_id, subject_code)
+        print(f"Collected {len(data)} sections in {harvester.requests} requests so far.")
     except Exception as e:
         print(f"An error occurred: {e}")
-
     finally:
-        # Close the WebDriver
-        driver.quit()
+        if owned:
+            harvester.close()
 
     return data
 
@@ -275,15 +252,20 @@ def save_to_s3_in_memory(df, bucket_name, s3_key):
 def collect_data_by_semester(semester_name, calls):
     """Collect and store data for a specific semester."""
     all_data = []
-    for term, term_id, program, subject_code in calls:
-        print(f"Starting data collection for: {term}, {program}, {subject_code}")
-        data = main(term, term_id, program, subject_code)
-        if data:
-            all_data.extend(data)
+    # One pooled session serves every subject of the semester
+    harvester = NUBannerHarvester()
+    try:
+        for term, term_id, program, subject_code in calls:
+            print(f"Starting data collection for: {term}, {program}, {subject_code}")
+            data = main(term, term_id, program, subject_code, harvester)
+            if data:
+                all_data.extend(data)
+    finally:
+        harvester.close()
 
     # Save data to S3 for this semester
     if all_data:
-        df = pd.DataFrame(all_data)
+        df = pd.DataFrame(all_data, columns=CLASS_FIELDS)
         s3_key = f"neu_data/{semester_name}_classes.csv"
         save_to_s3_in_memory(df, S3_BUCKET_NAME, s3_key)
         print(f"{semester_name} data saved to S3 at {s3_key}.")
@@ -309,4 +291,22 @@ def merge_all_semesters(file_names):
     merged_s3_key = "neu_data/all_classes.csv"
     save_to_s3_in_memory(merged_data, S3_BUCKET_NAME, merged_s3_key)
     print(f"Merged data saved to S3 at {merged_s3_key}.")
-    return merged_s3_key
\ No newline at end of file
+    return merged_s3_key
+
+# Time a harvest, e.g. against nubanner_stub_server:
+#   python nubanner_utils.py 202410 CSYE --base-url http://127.0.0.1:8099/StudentRegistrationSsb/ssb --min-interval 0
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Harvest one subject's class sections from NUBanner.")
+    parser.add_argument("term_id", help="Banner term code, e.g. 202410")
+    parser.add_argument("subject_code", help="Subject code, e.g. CSYE")
+    parser.add_argument("--base-url", default=NUBANNER_BASE_URL)
+    parser.add_argument("--min-interval", type=float, default=NUBANNER_MIN_INTERVAL)
+    args = parser.parse_args()
+
+    harvester = NUBannerHarvester(args.base_url, min_interval=args.min_interval)
+    started = time.perf_counter()
+    records = harvester.harvest(args.term_id, args.subject_code)
+    elapsed = time.perf_counter() - started
+    harvester.close()
+    print(f"{len(records)} sections in {harvester.requests} requests, {elapsed:.2f}s "
+          f"({len(records) / elapsed if elapsed else 0.0:.1f} sections/s)")
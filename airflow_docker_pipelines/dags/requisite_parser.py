@@ -0,0 +1,165 @@
+import json
+import re
+
+# Catalog requisite text looks like
+#   "(INFO 5100 with a minimum grade of C- or CSYE 6200 with a minimum grade of C- ); DAMG 6210 with a minimum grade of C-"
+# ";" (and the " AND " used by extract_requisites to join blocks) binds loosest, then "or", then "and".
+TOKEN_PATTERN = re.compile(
+    r"\s*(?:"
+    r"(?P<lparen>\()|(?P<rparen>\))|(?P<semi>;|\bAND\b)"
+    r"|(?P<course>\b[A-Z]{2,4} \d{4}[A-Z]?\b)(?: with a minimum grade of (?P<grade>[A-F][+-]?|S)(?![\w+-]))?"
+    r"|(?P<op>\b(?:and|or|OR)\b)"
+    r"|(?P<word>[^\s();]+)"
+    r")"
+)
+
+# Node types stored in COURSE_REQUISITES.NODE_TYPE
+AND_NODE = "AND"
+OR_NODE = "OR"
+COURSE_NODE = "COURSE"
+TEXT_NODE = "TEXT"  # Non-course requirement (e.g. "Graduate Program Admission"), kept verbatim
+
+
+def tokenize_requisites(text):
+    tokens = []
+    words = []
+
+    def flush_words():
+        if words:
+            tokens.append(("text", " ".join(words)))
+            words.clear()
+
+    for match in TOKEN_PATTERN.finditer(text):
+        if match.group("word"):
+            words.append(match.group("word"))
+            continue
+        flush_words()
+        if match.group("lparen"):
+            tokens.append(("(",))
+        elif match.group("rparen"):
+            tokens.append((")",))
+        elif match.group("semi"):
+            tokens.append((";",))
+        elif match.group("course"):
+            tokens.append(("course", match.group("course"), match.group("grade")))
+        elif match.group("op"):
+            tokens.append((match.group("op").lower(),))
+    flush_words()
+    return tokens
+
+
+def _make_node(node_type, children):
+    """Drops empty operands, flattens nested nodes of the same type and collapses single children."""
+    flattened = []
+    for child in children:
+        if child is None:
+            continue
+        if child["type"] == node_type:
+            flattened.extend(child["children"])
+        else:
+            flattened.append(child)
+    if not flattened:
+        return None
+    if len(flattened) == 1:
+        return flattened[0]
+    return {"type": node_type, "children": flattened}
+
+
+def parse_requisites(text):
+    """
+    Parses catalog prerequisite/corequisite text into a boolean expression tree.
+
+    :param text: Raw requisite text from the catalog (may be None).
+    :return: Nested dicts: {"type": "AND"|"OR", "children": [...]},
+             {"type": "COURSE", "course_code": ..., "min_grade": ...} or {"type": "TEXT", "text": ...};
+             None when there is nothing to parse.
+    """
+    if not text or not text.strip():
+        return None
+
+    tokens = tokenize_requisites(text)
+    position = 0
+
+    def peek():
+        return tokens[position][0] if position < len(tokens) else None
+
+    def parse_sequence():
+        nonlocal position
+        operands = [parse_or()]
+        while peek() == ";":
+            position += 1
+            operands.append(parse_or())
+        return _make_node(AND_NODE, operands)
+
+    def parse_or():
+        nonlocal position
+        operands = [parse_and()]
+        while peek() == "or":
+            position += 1
+            operands.append(parse_and())
+        return _make_node(OR_NODE, operands)
+
+    def parse_and():
+        nonlocal position
+        operands = [parse_atom()]
+        while peek() == "and":
+            position += 1
+            operands.append(parse_atom())
+        return _make_node(AND_NODE, operands)
+
+    def parse_atom():
+        nonlocal position
+        kind = peek()
+        if kind == "(":
+            position += 1
+            node = parse_sequence()
+            if peek() == ")":
+                position += 1
+            return node
+        if kind == "course":
+            _, course_code, min_grade = tokens[position]
+            position += 1
+            return {"type": COURSE_NODE, "course_code": course_code, "min_grade": min_grade}
+        if kind == "text":
+            position += 1
+            return {"type": TEXT_NODE, "text": tokens[position - 1][1]}
+        # Dangling operator or end of input: no operand here
+        return None
+
+    operands = []
+    while position < len(tokens):
+        start = position
+        operands.append(parse_sequence())
+        # Skip an unbalanced ")" (or any token the grammar could not consume) and keep going
+        if position == start or peek() == ")":
+            position += 1
+    return _make_node(AND_NODE, operands)
+
+
+def flatten_requisite_tree(course_code, requisite_type, tree):
+    """
+    Flattens a requisite tree into COURSE_REQUISITES rows in pre-order.
+
+    :return: List of (COURSE_CODE, REQUISITE_TYPE, NODE_ID, PARENT_ID, POSITION, NODE_TYPE,
+             REQUIRED_COURSE, MIN_GRADE, DETAIL) tuples; the root has NODE_ID 1 and no parent.
+    """
+    rows = []
+
+    def visit(node, parent_id, position):
+        node_id = len(rows) + 1
+        rows.append((
+            course_code, requisite_type, node_id, parent_id, position, node["type"],
+            node.get("course_code"), node.get("min_grade"), node.get("text"),
+        ))
+        for child_position, child in enumerate(node.get("children", [])):
+            visit(child, node_id, child_position)
+
+    if tree:
+        visit(tree, None, 0)
+    return rows
+
+
+def requisite_tree_json(text):
+    """Parsed tree serialized for the scraped DataFrame/CSV (None when there are no requisites)."""
+    tree = parse_requisites(text)
+    return json.dumps(tree) if tree else None
@@ -5,6 +5,7 @@ import re
 import boto3
 from io import StringIO
 import os
+from requisite_parser import requisite_tree_json
 
 # Function to clean text
 def clean_text(text):
@@ -80,6 +81,9 @@ def scrape_and_save_to_s3(subject_codes, bucket_name, s3_key):
                     'DESCRIPTION': description,
                     'PREREQUISITES': prerequisites,
                     'COREQUISITES': corequisites,
+                    # Parsed once here so the backend never re-parses free text
+                    'PREREQUISITE_TREE': requisite_tree_json(prerequisites),
+                    'COREQUISITE_TREE': requisite_tree_json(corequisites),
                     'CREDITS': credit_hours,
                     'SUBJECT_CODE': subject_code_upper
                 })
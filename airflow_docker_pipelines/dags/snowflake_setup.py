@@ -97,7 +97,8 @@ def snowflake_setup():
             COLLEGE VARCHAR(50),
             PROGRAM_NAME VARCHAR(100),
             PROGRAM_ID VARCHAR(25),
-            TRANSCRIPT_LINK VARCHAR(100)
+            TRANSCRIPT_LINK VARCHAR(100),
+            VERSION INT DEFAULT 1 -- Bumped by every profile/course change; used as the ETag of GET /user/{id}
         );
         """
 
@@ -124,6 +125,16 @@ def snowflake_setup():
             FOREIGN KEY (USER_ID) REFERENCES {database_name}.{schema_name}.USER_PROFILE(USER_ID)
         );
         """
+        # Pre-summarized advising context (credits per bucket, remaining requirements, eligible courses),
+        # written with USER_ELIGIBILITY and read by the chat agents in one key lookup
+        create_user_advising_context_table = f"""
+        CREATE OR REPLACE TABLE {database_name}.{schema_name}.USER_ADVISING_CONTEXT (
+            USER_ID INT NOT NULL PRIMARY KEY,
+            CONTEXT VARIANT,
+            UPDATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (USER_ID) REFERENCES {database_name}.{schema_name}.USER_PROFILE(USER_ID)
+        );
+        """
 
         create_classes_table = f"""
         CREATE OR REPLACE TABLE {database_name}.{schema_name}.CLASSES (
@@ -158,6 +169,33 @@ def snowflake_setup():
         );
         """
 
+        # Prerequisite/corequisite expression trees, one row per node (parsed at ingestion)
+        create_course_requisites_table = f"""
+        CREATE OR REPLACE TABLE {database_name}.{schema_name}.COURSE_REQUISITES (
+            COURSE_CODE VARCHAR(10),
+            REQUISITE_TYPE VARCHAR(20), -- PREREQUISITE or COREQUISITE
+            NODE_ID INT,
+            PARENT_ID INT,
+            POSITION INT,
+            NODE_TYPE VARCHAR(10), -- AND, OR, COURSE or TEXT
+            REQUIRED_COURSE VARCHAR(10),
+            MIN_GRADE VARCHAR(5),
+            DETAIL TEXT,
+            PRIMARY KEY (COURSE_CODE, REQUISITE_TYPE, NODE_ID)
+        );
+        """
+
+        # Bumped by the requirements/catalog loads so the backend knows when to reload its program cache.
+        # Not replaced on setup, so generations keep increasing across re-runs.
+        create_catalog_generation_table = f"""
+        CREATE TABLE IF NOT EXISTS {database_name}.{schema_name}.CATALOG_GENERATION (
+            NAME VARCHAR(50),
+            GENERATION INT,
+            UPDATED_AT TIMESTAMP,
+            PRIMARY KEY (NAME)
+        );
+        """
+
         # Execute scripts sequentially
         print(f"Creating warehouse '{warehouse_name}'...")
         cursor.execute(create_warehouse_script)
@@ -196,12 +234,21 @@ def snowflake_setup():
         cursor.execute(create_user_eligibility_table)
         print("USER_ELIGIBILITY table created.")
 
+        cursor.execute(create_user_advising_context_table)
+        print("USER_ADVISING_CONTEXT table created.")
+
         cursor.execute(create_classes_table)
         print("CLASSES table created.")
 
         cursor.execute(create_course_catalog_table)
         print("COURSE_CATALOG table created.")
 
+        cursor.execute(create_course_requisites_table)
+        print("COURSE_REQUISITES table created.")
+
+        cursor.execute(create_catalog_generation_table)
+        print("CATALOG_GENERATION table created or exists.")
+
     except snowflake.connector.errors.ProgrammingError as e:
         print(f"Error during setup: {e}")
 
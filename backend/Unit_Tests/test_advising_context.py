@@ -0,0 +1,94 @@
+import sys
+import os
+import json
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from neu_sa.utils.advising_context import build_advising_context  # Import after updating sys.path
+from neu_sa.utils.eligibility_kernel import build_program_requirements
+from neu_sa.utils.prerequisite_graph import PrerequisiteGraph
+from neu_sa.utils.recalculate_eligibility import write_user_eligibility
+
+PROGRAM = build_program_requirements(
+    {
+        "program_id": "MP_TEST",
+        "program_name": "Test Program",
+        "core_credit_req": 8,
+        "core_options_credit_req": 4,
+        "elective_credit_req": 8,
+        "max_credit_hours": 32,
+    },
+    core_courses=[
+        {"course_code": "INFO 5100", "credits": 4},
+        {"course_code": "INFO 5101", "credits": 4},
+    ],
+    core_option_courses=[
+        {"course_code": "INFO 6150", "credits": 4},
+        {"course_code": "DAMG 6210", "credits": 4},
+    ],
+    subject_areas={"INFO": 4},
+    elective_subjects={"INFO", "DAMG"},
+)
+
+GRAPH = PrerequisiteGraph.from_rows([
+    ("INFO 5101", "PREREQUISITE", 1, None, 0, "COURSE", "INFO 5100", "B", None),
+    ("DAMG 6210", "PREREQUISITE", 1, None, 0, "COURSE", "INFO 6105", "C", None),
+])
+
+TRANSCRIPT = [
+    {"course_code": "INFO 5100", "credits": 4, "grade": "A"},
+    {"course_code": "INFO 6150", "credits": 4, "grade": "IP (In Progress)"},
+]
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.statements = []
+        self.committed_after = None
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=()):
+        self.statements.append((query.split()[0], params))
+
+    def executemany(self, query, rows):
+        self.statements.append((query.split()[0], rows))
+
+    def commit(self):
+        self.committed_after = len(self.statements)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_context_pack_summarizes_credits_requirements_and_eligible_courses():
+    pack = build_advising_context(PROGRAM, TRANSCRIPT, GRAPH)
+
+    assert pack["credits"] == {"completed": 4, "in_progress": 4, "program_total": 32, "remaining": 24}
+    assert pack["remaining_requirements"] == ["CORE", "SUBJECT_AREA_INFO", "ELECTIVES"]
+    core = pack["requirements"][0]
+    assert (core["requirement"], core["credits"], core["remaining_credits"]) == ("CORE", 4, 4)
+
+    # Core options are covered by the in-progress course, so DAMG 6210 is only useful as an elective
+    assert pack["eligible_now"] == [{"course_code": "INFO 5101", "credits": 4, "requirement": "CORE"}]
+    assert pack["blocked"] == [
+        {"course_code": "DAMG 6210", "credits": 4, "requirement": "ELECTIVES", "missing_prerequisites": ["INFO 6105"]}
+    ]
+    assert pack["courses"] == {"completed": ["INFO 5100 (A)"], "in_progress": ["INFO 6150"], "failed": []}
+
+
+def test_context_pack_is_written_in_the_eligibility_transaction():
+    conn = RecordingConnection()
+    pack = build_advising_context(PROGRAM, TRANSCRIPT, GRAPH)
+    write_user_eligibility(conn, 7, [("ELECTIVES", True, "0/8", "CALCULATED")], advising_context=pack)
+
+    kinds = [kind for kind, _ in conn.statements]
+    assert kinds == ["BEGIN;", "DELETE", "INSERT", "MERGE"]
+    assert conn.committed_after == len(kinds)
+    user_id, stored = conn.statements[-1][1]
+    assert user_id == 7 and json.loads(stored) == pack
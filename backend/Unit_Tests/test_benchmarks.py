@@ -0,0 +1,39 @@
+import sys
+import os
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.baselines import extract_user_profile_and_courses, table_text  # Import after updating sys.path
+from benchmarks.generators import make_textract_blocks, transcript_rows, transcript_text
+from benchmarks.run_benchmarks import baseline, find_regressions
+from neu_sa.utils.textract_tables import TableAssembler
+
+
+def test_synthetic_textract_blocks_parse_like_a_transcript():
+    """Generated blocks assemble into the generated rows, which the transcript parser understands."""
+    rows = transcript_rows(size=50)
+    _, blocks_map = make_textract_blocks(rows)
+    assembler = TableAssembler()
+    assembler.add(blocks_map.values())
+    text = table_text(assembler.rows())
+    assert text == transcript_text(rows)
+
+    profile, courses = extract_user_profile_and_courses(text)
+    assert profile["college"] == "College of Engineering"
+    assert profile["gpa"] == 3.75
+    assert len(courses) == 50
+
+
+def test_regressions_are_measured_against_recent_runs_on_the_same_machine():
+    history = [
+        {"machine": "ci", "results": {"parse": 1.0, "rules": 2.0}},
+        {"machine": "ci", "results": {"parse": 1.2, "rules": 2.0}},
+        {"machine": "ci", "results": {"parse": 1.1, "rules": 2.2}},
+        {"machine": "laptop", "results": {"parse": 0.1, "rules": 0.2}},
+    ]
+    reference = baseline(history, "ci")
+    assert reference == {"parse": 1.1, "rules": 2.0}
+
+    regressions = find_regressions({"parse": 1.5, "rules": 2.2, "new": 9.0}, reference, threshold=0.25)
+    assert [name for name, *_ in regressions] == ["parse"]
@@ -0,0 +1,51 @@
+import sys
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from neu_sa.utils.bulk_recalculate import _init_worker, compute_batch  # Import after updating sys.path
+from neu_sa.utils.eligibility_kernel import build_program_requirements, compute_eligibility, index_transcript
+
+PROGRAMS = {
+    "MP_TEST": build_program_requirements(
+        {"program_id": "MP_TEST", "core_credit_req": 4, "core_options_credit_req": 0, "elective_credit_req": 4},
+        core_courses=[{"course_code": "INFO 5100", "credits": 4}],
+        core_option_courses=[],
+        subject_areas={"INFO": 4},
+        elective_subjects={"INFO", "DAMG"},
+    )
+}
+
+USERS = [
+    (1, "MP_TEST", [{"course_code": "INFO 5100", "credits": 4, "grade": "A"}]),
+    (2, "MP_TEST", [{"course_code": "DAMG 6210", "credits": 4, "grade": "B"}]),
+    (3, "MP_UNKNOWN", []),
+]
+
+
+def test_program_requirements_survive_pickling():
+    """Programs are shipped to worker processes, so they must round-trip through pickle."""
+    program = PROGRAMS["MP_TEST"]
+    assert pickle.loads(pickle.dumps(program)) == program
+
+
+def test_compute_batch_matches_kernel_and_reports_unknown_programs():
+    """Worker output is the kernel output per user; users without a program are reported, not written."""
+    rows, failed = compute_batch(USERS, PROGRAMS)
+
+    for user_id, _, courses in USERS[:2]:
+        expected = [(user_id, *record) for record in compute_eligibility(PROGRAMS["MP_TEST"], index_transcript(courses))]
+        assert [row for row in rows if row[0] == user_id] == expected
+    assert 3 in failed and all(row[0] != 3 for row in rows)
+
+
+def test_compute_batch_in_process_pool():
+    """The pool initializer installs the catalog once per worker."""
+    with ProcessPoolExecutor(max_workers=2, initializer=_init_worker, initargs=(PROGRAMS,)) as pool:
+        results = list(pool.map(compute_batch, [USERS[:1], USERS[1:]]))
+
+    rows = [row for batch_rows, _ in results for row in batch_rows]
+    assert rows == compute_batch(USERS, PROGRAMS)[0]
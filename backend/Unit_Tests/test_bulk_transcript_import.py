@@ -0,0 +1,151 @@
+import sys
+import os
+import io
+import pytest
+from PyPDF2 import PdfWriter
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.generators import make_transcript_pdf, transcript_rows  # Import after updating sys.path
+from neu_sa.routers import transcript_router
+from neu_sa.utils import bulk_transcript_import
+from neu_sa.utils.aws_clients import StubTextractClient
+from neu_sa.utils.eligibility_queue import EligibilityQueue, InMemoryJobStore
+
+RECORDINGS = os.path.join(os.path.dirname(__file__), "fixtures", "textract")
+
+
+class FakeS3:
+    def __init__(self):
+        self.stored = []
+
+    def put_object(self, Bucket, Key, Body):
+        self.stored.append(Key)
+
+    def delete_object(self, Bucket, Key):
+        self.stored.remove(Key)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = []
+
+    def execute(self, sql, params=()):
+        self.conn.statements.append((" ".join(sql.split()), list(params)))
+        if sql.startswith("SELECT USER_ID FROM USER_PROFILE"):
+            self.result = [(user_id,) for user_id in params if user_id in self.conn.users]
+
+    def executemany(self, sql, rows):
+        self.conn.inserted.extend(rows)
+
+    def fetchall(self):
+        return self.result
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, users, fail_commit=False):
+        self.users = users
+        self.fail_commit = fail_commit
+        self.statements, self.inserted = [], []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        if self.fail_commit:
+            raise RuntimeError("Transaction aborted")
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def scanned_pdf_bytes():
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_cohort_import_writes_batches_and_queues_one_recalculation_per_user(tmp_path, monkeypatch):
+    files = {
+        "11.pdf": make_transcript_pdf(transcript_rows(size=12, seed=1)),
+        "12_transcript.pdf": scanned_pdf_bytes(),  # Read by Textract
+        "13.pdf": make_transcript_pdf(transcript_rows(size=5, seed=2)),  # No such user
+        "14.pdf": b"not a pdf",
+        "advisor notes.pdf": b"%PDF-1.4",
+    }
+    for name, data in files.items():
+        (tmp_path / name).write_bytes(data)
+
+    s3 = FakeS3()
+    stub = StubTextractClient.from_directory(RECORDINGS, polls_until_done=1)
+    monkeypatch.setattr(bulk_transcript_import, "get_s3_client", lambda: s3)
+    monkeypatch.setattr(bulk_transcript_import, "TRANSCRIPT_JOB_INITIAL_DELAY", 0.01)
+    monkeypatch.setattr(transcript_router, "get_textract_client", lambda: stub)
+    conn = FakeConnection(users={11, 12, 14})
+    queue = EligibilityQueue(InMemoryJobStore())
+
+    summary = bulk_transcript_import.bulk_import_transcripts(
+        [str(tmp_path)], concurrency=4, batch_size=2, queue=queue, connection_factory=lambda: conn
+    )
+
+    report = {os.path.basename(entry["file"]): entry for entry in summary["report"]}
+    assert report["11.pdf"]["status"] == report["12_transcript.pdf"]["status"] == "imported"
+    assert report["11.pdf"]["source"] == "text_layer" and report["12_transcript.pdf"]["source"] == "textract"
+    assert "No user profile" in report["13.pdf"]["error"]
+    assert "not a valid PDF" in report["14.pdf"]["error"]
+    assert "user ID" in report["advisor notes.pdf"]["error"]
+    assert (summary["files"], summary["imported"], summary["failed"]) == (5, 2, 3)
+
+    # Courses for every imported user, written in transactions of at most two users
+    assert {row[0] for row in conn.inserted} == {11, 12}
+    assert [row[1] for row in conn.inserted if row[0] == 12] == ["INFO 5100", "DAMG 6210", "INFO 6105"]
+    assert conn.commits == summary["batches"] >= 1
+    assert any("VERSION = COALESCE(target.VERSION, 0) + 1" in sql for sql, _ in conn.statements)
+    # Stored under this run's keys, which the profiles now link to
+    assert sorted(s3.stored) == sorted(report[name]["s3_key"] for name in ("11.pdf", "12_transcript.pdf"))
+    assert all(key.startswith("transcripts/1") and "_import_" in key for key in s3.stored)
+    assert report["11.pdf"]["file_url"].endswith(report["11.pdf"]["s3_key"])
+    assert any(report["11.pdf"]["file_url"] in params for sql, params in conn.statements if "MERGE" in sql)
+
+    # One full recalculation requested per imported user
+    assert queue.status(11)["requested_version"] == queue.status(12)["requested_version"] == 1
+    assert queue.status(13)["status"] == "unknown"
+
+
+def test_failed_batch_leaves_the_stored_transcripts_alone(tmp_path, monkeypatch):
+    (tmp_path / "11.pdf").write_bytes(make_transcript_pdf(transcript_rows(size=6, seed=3)))
+    s3 = FakeS3()
+    s3.stored.append("transcripts/11_transcript.pdf")  # Uploaded earlier through the API
+    monkeypatch.setattr(bulk_transcript_import, "get_s3_client", lambda: s3)
+    queue = EligibilityQueue(InMemoryJobStore())
+
+    summary = bulk_transcript_import.bulk_import_transcripts(
+        [str(tmp_path)], queue=queue, connection_factory=lambda: FakeConnection(users={11}, fail_commit=True)
+    )
+
+    entry, = summary["report"]
+    assert entry["status"] == "failed" and "Transaction aborted" in entry["error"]
+    assert entry["s3_object"] == "deleted"
+    assert s3.stored == ["transcripts/11_transcript.pdf"]
+    assert queue.status(11)["status"] == "unknown"
+
+
+def test_cli_requires_the_api_queue_file_or_in_process_eligibility(tmp_path, monkeypatch, capsys):
+    for argv in ([str(tmp_path)], [str(tmp_path), "--queue", str(tmp_path / "missing.db")]):
+        monkeypatch.setattr(sys, "argv", ["bulk-import-transcripts", *argv])
+        with pytest.raises(SystemExit) as error:
+            bulk_transcript_import.main()
+        assert error.value.code == 2
+    assert "ELIGIBILITY_QUEUE_PATH" in capsys.readouterr().err
@@ -0,0 +1,113 @@
+import sys
+import os
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from neu_sa.utils.eligibility_kernel import (  # Import after updating sys.path
+    build_program_requirements,
+    compute_eligibility,
+    index_transcript,
+    rows_to_rewrite,
+)
+
+PROGRAM = build_program_requirements(
+    {
+        "program_id": "MP_TEST",
+        "core_credit_req": 8,
+        "core_options_credit_req": 4,
+        "elective_credit_req": 8,
+        "elective_exceptions": ["CSYE 6220"],
+    },
+    core_courses=[
+        {"course_code": "INFO 5100", "credits": 4},
+        {"course_code": "INFO 5101", "credits": 4, "prerequisites": "INFO 5100 with a minimum grade of C-"},
+    ],
+    core_option_courses=[
+        {"course_code": "DAMG 6210", "credits": 4},
+        {"course_code": "INFO 6150", "credits": 4},
+    ],
+    subject_areas={"INFO": 4},
+    elective_subjects={"INFO", "DAMG", "CSYE"},
+)
+
+
+def records_by_code(records):
+    return {record.course_or_requirement: record for record in records}
+
+
+def test_core_courses_reflect_transcript_status():
+    """Completed, failed and untaken core courses each get the matching row."""
+    transcript = index_transcript([{"course_code": "INFO 5100", "credits": 4, "grade": "A"}])
+    records = records_by_code(compute_eligibility(PROGRAM, transcript))
+
+    assert records["INFO 5100"].eligible is False
+    assert "Already completed with grade 'A'" in records["INFO 5100"].details
+    assert records["INFO 5101"].eligible is True
+    assert "Prerequisites: INFO 5100 with a minimum grade of C-" in records["INFO 5101"].details
+
+    failed = index_transcript([{"course_code": "INFO 5100", "credits": 4, "grade": "F"}])
+    assert records_by_code(compute_eligibility(PROGRAM, failed))["INFO 5100"].eligible is True
+
+
+def test_satisfied_core_options_overflow_to_electives():
+    """Once core options are met, further option courses count toward electives."""
+    transcript = index_transcript([
+        {"course_code": "DAMG 6210", "credits": 4, "grade": "B"},
+        {"course_code": "INFO 6150", "credits": 4, "grade": "A-"},
+    ])
+    electives = records_by_code(compute_eligibility(PROGRAM, transcript))["ELECTIVES"]
+
+    assert "4/8 credits completed for elective requirements. Which are (INFO 6150)" in electives.details
+    assert "Electives are subject code with (CSYE, DAMG, INFO)" in electives.details
+    assert "Exceptions are (CSYE 6220)" in electives.details
+
+
+def test_subject_area_excess_counts_as_elective():
+    """Credits beyond the subject area minimum spill over into electives."""
+    transcript = index_transcript([
+        {"course_code": "INFO 7390", "credits": 4, "grade": "A"},
+        {"course_code": "INFO 7500", "credits": 4, "grade": "IP (In Progress)"},
+        {"course_code": "CSYE 7374", "credits": 4, "grade": "B+"},
+    ])
+    records = records_by_code(compute_eligibility(PROGRAM, transcript))
+
+    assert records["SUBJECT_AREA_INFO"].eligible is False
+    assert "4/4 credits completed for subject area (INFO)" in records["SUBJECT_AREA_INFO"].details
+    assert "4/8 credits completed for elective requirements. Which are (CSYE 7374)" in records["ELECTIVES"].details
+    assert records["ELECTIVES"].eligible is True
+
+
+def test_kernel_is_deterministic_and_does_not_mutate_inputs():
+    """The kernel is a pure function of its inputs."""
+    courses = [{"course_code": "INFO 5100", "credits": 4, "grade": "A"}]
+    transcript = index_transcript(courses)
+
+    assert compute_eligibility(PROGRAM, transcript) == compute_eligibility(PROGRAM, transcript)
+    assert courses == [{"course_code": "INFO 5100", "credits": 4, "grade": "A"}]
+
+
+def test_incremental_rewrite_matches_full_rebuild():
+    """Replacing only the affected codes yields the same rows as a full rebuild."""
+    before = [
+        {"course_code": "INFO 5100", "credits": 4, "grade": "A"},
+        {"course_code": "INFO 7390", "credits": 4, "grade": "B"},
+        {"course_code": "DAMG 7370", "credits": 4, "grade": "A"},
+    ]
+    after = [
+        {"course_code": "INFO 5100", "credits": 4, "grade": "A"},
+        {"course_code": "INFO 7390", "credits": 4, "grade": "B"},
+        {"course_code": "CSYE 7374", "credits": 4, "grade": "IP (In Progress)"},
+    ]
+    old_records = compute_eligibility(PROGRAM, index_transcript(before))
+    new_records = compute_eligibility(PROGRAM, index_transcript(after))
+
+    codes, rows = rows_to_rewrite(PROGRAM, new_records, {"DAMG 7370", "CSYE 7374"})
+    assert {"DAMG 7370", "CSYE 7374", "ELECTIVES"} <= codes
+    assert "INFO 5100" not in codes and "SUBJECT_AREA_INFO" not in codes  # Core and subject area untouched
+
+    patched = [record for record in old_records if record.course_or_requirement not in codes] + rows
+    assert sorted(patched) == sorted(new_records)
+
+    # Courses outside every requirement bucket do not touch the stored rows
+    assert rows_to_rewrite(PROGRAM, new_records, {"MATH 5000"}) == (frozenset(), [])
@@ -0,0 +1,134 @@
+import sys
+import os
+import threading
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from neu_sa.utils.eligibility_queue import (  # Import after updating sys.path
+    EligibilityQueue,
+    InMemoryJobStore,
+    SQLiteJobStore,
+)
+
+
+class RecordingHandler:
+    """Records calls and fails the first `failures` of them."""
+
+    def __init__(self, failures=0):
+        self.calls = []
+        self.failures = failures
+        self.lock = threading.Lock()
+
+    def __call__(self, user_id, changed_courses):
+        with self.lock:
+            self.calls.append((user_id, changed_courses))
+            if len(self.calls) <= self.failures:
+                raise RuntimeError("warehouse unavailable")
+
+
+def test_pending_jobs_coalesce_per_user():
+    """Several saves before the worker picks the job up run one recalculation with all changes."""
+    handler = RecordingHandler()
+    queue = EligibilityQueue(InMemoryJobStore(), handler=handler, workers=2, retry_backoff=0)
+
+    queue.enqueue(1, {"INFO 5100"})
+    queue.enqueue(1, {"INFO 6105"})
+    version = queue.enqueue(1, {"INFO 5100", "DAMG 6210"})
+    queue.enqueue(2, None)
+    assert queue.status(1)["status"] == "pending"
+
+    queue.start()
+    assert queue.wait_until_idle()
+    queue.stop()
+
+    assert sorted(handler.calls, key=lambda call: call[0]) == [(1, ["DAMG 6210", "INFO 5100", "INFO 6105"]), (2, None)]
+    status = queue.status(1)
+    assert status["status"] == "fresh"
+    assert status["completed_version"] == version
+
+
+def test_failed_jobs_are_retried_then_reported():
+    handler = RecordingHandler(failures=1)
+    queue = EligibilityQueue(InMemoryJobStore(), handler=handler, workers=1, retry_backoff=0)
+    queue.enqueue(1, {"INFO 5100"})
+    queue.start()
+    assert queue.wait_until_idle()
+    queue.stop()
+
+    assert handler.calls == [(1, ["INFO 5100"]), (1, ["INFO 5100"])]
+    assert queue.status(1)["status"] == "fresh"
+
+    always_failing = RecordingHandler(failures=10)
+    queue = EligibilityQueue(InMemoryJobStore(), handler=always_failing, workers=1, max_attempts=3, retry_backoff=0)
+    queue.enqueue(1, None)
+    queue.start()
+    assert queue.wait_until_idle()
+    queue.stop()
+
+    assert len(always_failing.calls) == 3
+    status = queue.status(1)
+    assert status["status"] == "failed"
+    assert "warehouse unavailable" in status["last_error"]
+
+
+def test_enqueue_after_failure_keeps_the_failed_changes():
+    """Courses from a run that gave up are recalculated with the next request's changes."""
+    failing = RecordingHandler(failures=2)
+    store = InMemoryJobStore()
+    queue = EligibilityQueue(store, handler=failing, workers=1, max_attempts=2, retry_backoff=0)
+    queue.enqueue(1, {"INFO 5100"})
+    queue.start()
+    assert queue.wait_until_idle()
+    assert queue.status(1)["status"] == "failed"
+
+    queue.enqueue(1, {"DAMG 6210"})
+    assert queue.wait_until_idle()
+    queue.stop()
+
+    assert failing.calls[-1] == (1, ["DAMG 6210", "INFO 5100"])
+    assert queue.status(1)["status"] == "fresh"
+
+
+def test_sqlite_store_survives_restart(tmp_path):
+    """Jobs queued (or interrupted while running) before a restart are run afterwards."""
+    path = str(tmp_path / "queue.db")
+    queue = EligibilityQueue(SQLiteJobStore(path), handler=RecordingHandler())
+    queue.enqueue(1, {"INFO 5100"})
+    job = queue._claim()  # Simulate a worker that died mid-job
+    assert job["running_changes"] == ["INFO 5100"]
+    queue.enqueue(1, {"INFO 6105"})
+    queue.store.close()
+
+    handler = RecordingHandler()
+    restarted = EligibilityQueue(SQLiteJobStore(path), handler=handler, workers=1)
+    restarted.start()
+    assert restarted.wait_until_idle()
+    restarted.stop()
+
+    assert handler.calls == [(1, ["INFO 5100", "INFO 6105"])]
+    assert restarted.status(1)["status"] == "fresh"
+
+
+def test_processes_sharing_the_sqlite_file_do_not_lose_updates(tmp_path):
+    """A request from another process (e.g. the bulk transcript import) waits for the API's write lock."""
+    path = str(tmp_path / "queue.db")
+    api = EligibilityQueue(SQLiteJobStore(path))
+    importer = EligibilityQueue(SQLiteJobStore(path))
+    api.enqueue(1, {"INFO 5100"})
+    claimed = api._claim()
+
+    with api.store.transaction():
+        request = threading.Thread(target=importer.enqueue, args=(1,))
+        request.start()
+        request.join(0.2)
+        assert request.is_alive()
+    request.join()
+    api._finish(claimed)
+
+    # The import's full rebuild request survived the API's read-modify-write
+    job = api.store.get(1)
+    assert (job["status"], job["version"], job["changed_courses"]) == ("PENDING", 2, None)
+    assert api._claim()["running_changes"] is None
+    api.store.close()
+    importer.store.close()
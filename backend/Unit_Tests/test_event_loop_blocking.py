@@ -0,0 +1,117 @@
+import sys
+import os
+import asyncio
+import time
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from neu_sa.routers import auth, user_router, transcript_router  # Import after updating sys.path
+from neu_sa.routers.auth import LoginModel, RegisterModel, ph
+from neu_sa.utils import user_context
+
+# Maximum time the event loop may go without running a ready callback
+MAX_EVENT_LOOP_LAG = 0.1
+# Simulated latency of a single warehouse round trip
+QUERY_LATENCY = 0.3
+
+
+class SlowCursor:
+    """Cursor stand-in that blocks like a slow Snowflake query."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, *args, **kwargs):
+        time.sleep(QUERY_LATENCY)
+
+    def executemany(self, *args, **kwargs):
+        time.sleep(QUERY_LATENCY)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class SlowConnection:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def cursor(self):
+        return SlowCursor(self.rows)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+async def max_event_loop_lag(coro):
+    """Run `coro` alongside a heartbeat and return the longest gap between beats."""
+    lag = 0.0
+    done = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal lag
+        interval = 0.01
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag = max(lag, time.perf_counter() - started - interval)
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)  # Let the heartbeat start its first interval
+    try:
+        await coro
+    finally:
+        done.set()
+        await beat
+    return lag
+
+
+def test_login_does_not_block_event_loop(monkeypatch):
+    """Login must keep the event loop responsive while querying and verifying the password."""
+    hashed_password = ph.hash("Password1!")
+    monkeypatch.setattr(auth, "get_snowflake_connection", lambda: SlowConnection([(hashed_password, 1)]))
+
+    lag = asyncio.run(max_event_loop_lag(auth.login_user(LoginModel(username="alice", password="Password1!"))))
+    assert lag < MAX_EVENT_LOOP_LAG, f"Event loop blocked for {lag:.3f}s during login"
+
+
+def test_register_does_not_block_event_loop(monkeypatch):
+    """Registration must hash the password and write the profile off the event loop."""
+    monkeypatch.setattr(auth, "get_snowflake_connection", lambda: SlowConnection([(0,)]))
+    user = RegisterModel(
+        username="alice",
+        password="Password1!",
+        campus="Boston",
+        program_name="Information Systems, MSIS",
+        college="College of Engineering",
+    )
+
+    lag = asyncio.run(max_event_loop_lag(auth.register_user(user)))
+    assert lag < MAX_EVENT_LOOP_LAG, f"Event loop blocked for {lag:.3f}s during registration"
+
+
+def test_user_and_transcript_reads_do_not_block_event_loop(monkeypatch):
+    """Profile and transcript link lookups must run their queries on the executor."""
+    monkeypatch.setattr(user_router, "get_snowflake_connection", lambda: SlowConnection([]))
+    monkeypatch.setattr(user_context, "get_snowflake_connection", lambda: SlowConnection([]))
+    monkeypatch.setattr(user_router, "user_context_cache", user_context.UserContextCache())
+    monkeypatch.setattr(transcript_router, "get_snowflake_connection", lambda: SlowConnection([]))
+    token = {"user_id": 1, "username": "alice"}
+
+    lag = asyncio.run(max_event_loop_lag(user_router.get_user_data(1, token)))
+    assert lag < MAX_EVENT_LOOP_LAG, f"Event loop blocked for {lag:.3f}s while fetching user data"
+
+    lag = asyncio.run(max_event_loop_lag(transcript_router.get_transcript_link(1, token)))
+    assert lag < MAX_EVENT_LOOP_LAG, f"Event loop blocked for {lag:.3f}s while fetching the transcript link"
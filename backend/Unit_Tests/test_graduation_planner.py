@@ -0,0 +1,122 @@
+import sys
+import os
+from datetime import date
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from neu_sa.utils.eligibility_kernel import build_program_requirements  # Import after updating sys.path
+from neu_sa.utils.graduation_planner import (
+    GraduationPlanner, Term, current_term_key, plan_graduation, project_terms, term_sort_key,
+)
+from neu_sa.utils.prerequisite_graph import PrerequisiteGraph
+
+PROGRAM = build_program_requirements(
+    {
+        "program_id": "MP_TEST",
+        "core_credit_req": 8,
+        "core_options_credit_req": 4,
+        "elective_credit_req": 4,
+        "elective_exceptions": ["INFO 6999"],
+        "max_credit_hours": 16,
+    },
+    core_courses=[
+        {"course_code": "INFO 5100", "credits": 4},
+        {"course_code": "INFO 6105", "credits": 4},
+    ],
+    core_option_courses=[
+        {"course_code": "DAMG 6210", "credits": 4},
+        {"course_code": "INFO 6150", "credits": 4},
+    ],
+    subject_areas={},
+    elective_subjects={"INFO", "CSYE"},
+)
+
+CREDITS = {"INFO 5100": 4, "INFO 6105": 4, "DAMG 6210": 4, "INFO 6150": 4, "CSYE 7374": 4, "INFO 6999": 4}
+
+# INFO 6105 requires INFO 5100
+GRAPH = PrerequisiteGraph.from_rows([
+    ("INFO 6105", "PREREQUISITE", 1, None, 0, "COURSE", "INFO 5100", "C", None),
+])
+
+EVERYTHING = frozenset(CREDITS)
+
+
+def test_plans_respect_prerequisites_term_caps_and_offerings():
+    terms = [
+        Term("Fall 2024 Semester", EVERYTHING),
+        Term("Spring 2025 Semester", EVERYTHING - {"DAMG 6210"}),
+    ]
+    planner = GraduationPlanner(PROGRAM, [], terms, CREDITS, GRAPH, max_term_credits=8)
+    plans = planner.plan(k=3)
+
+    assert plans, "16 credits fit in two 8-credit terms"
+    for plan in plans:
+        assert plan.graduation_term == "Spring 2025 Semester"
+        assert plan.total_credits == 16
+        first, second = plan.terms
+        assert "INFO 5100" in first.courses and "INFO 6105" in second.courses  # Prerequisite in an earlier term
+        assert all(term.credits <= 8 for term in plan.terms)
+        assert "DAMG 6210" not in second.courses  # Not offered that term
+        assert "INFO 6999" not in first.courses + second.courses  # Elective exception never counts
+    assert len({plan.terms for plan in plans}) == len(plans)
+
+
+def test_transcript_and_total_credit_limit():
+    """Completed work is not repeated; failed courses are retaken; plans stay within MAX_CREDIT_HOURS."""
+    completed = [
+        {"course_code": "INFO 5100", "credits": 4, "grade": "A"},
+        {"course_code": "DAMG 6210", "credits": 4, "grade": "F"},
+        {"course_code": "INFO 6150", "credits": 4, "grade": "IP (In Progress)"},
+    ]
+    planner = GraduationPlanner(PROGRAM, completed, [Term("Spring 2025 Semester", EVERYTHING)], CREDITS, GRAPH,
+                                max_term_credits=8)
+    plans = planner.plan(k=5)
+    assert [plan.terms[0].courses for plan in plans] == [("CSYE 7374", "INFO 6105")]
+
+    # Credit limit too low for what is left: no plan rather than a plan over the limit
+    tight = PROGRAM._replace(max_credit_hours=12)
+    assert GraduationPlanner(tight, completed, [Term("Spring 2025 Semester", EVERYTHING)], CREDITS, GRAPH).plan() == []
+
+
+def test_terms_are_ordered_and_projected():
+    assert sorted(["Spring 2025 Semester", "Fall 2024 Semester", "Summer 1 2025 Semester"], key=term_sort_key) == [
+        "Fall 2024 Semester", "Spring 2025 Semester", "Summer 1 2025 Semester",
+    ]
+    projected = project_terms([Term("Fall 2024 Semester", EVERYTHING), Term("Spring 2025 Semester", EVERYTHING)], 5)
+    assert [term.name for term in projected] == [
+        "Fall 2024 Semester", "Spring 2025 Semester", "Fall 2025 Semester", "Spring 2026 Semester", "Fall 2026 Semester",
+    ]
+    assert [term.projected for term in projected] == [False, False, True, True, True]
+
+    # With one course per term the planner needs the projected terms
+    plans = GraduationPlanner(PROGRAM, [], projected, CREDITS, GRAPH, max_term_credits=4).plan(k=1)
+    assert plans[0].graduation_term == "Spring 2026 Semester"
+    assert plans[0].terms[-1].projected
+
+
+def test_projection_repeats_only_the_latest_academic_year_and_skips_past_terms():
+    """The NUBanner DAG loads two academic years; each semester is planned once, in order, after today."""
+    known = [
+        Term("Fall 2023 Semester", EVERYTHING),
+        Term("Spring 2024 Semester", EVERYTHING),
+        Term("Fall 2024 Semester", EVERYTHING),
+        Term("Spring 2025 Semester", EVERYTHING - {"DAMG 6210"}),
+    ]
+    projected = project_terms(known, 6)
+    assert [term.name for term in projected] == [
+        "Fall 2023 Semester", "Spring 2024 Semester", "Fall 2024 Semester", "Spring 2025 Semester",
+        "Fall 2025 Semester", "Spring 2026 Semester",
+    ]
+    assert "DAMG 6210" not in projected[-1].courses  # Repeats Spring 2025, not Spring 2024
+
+    assert current_term_key(date(2025, 3, 1)) < term_sort_key("Summer 1 2025 Semester")[:3]
+    upcoming = project_terms(known, 3, after=current_term_key(date(2025, 3, 1)))
+    assert [(term.name, term.projected) for term in upcoming] == [
+        ("Fall 2025 Semester", True), ("Spring 2026 Semester", True), ("Fall 2026 Semester", True),
+    ]
+
+    # Remaining courses are never scheduled in semesters that are already over
+    plans = plan_graduation(PROGRAM, [], known, CREDITS, GRAPH, k=1, max_terms=4, today=date(2024, 10, 1))
+    assert plans[0].terms[0].term == "Spring 2025 Semester"
+    assert plans[0].graduation_term == "Fall 2025 Semester"
@@ -0,0 +1,74 @@
+import sys
+import os
+import io
+from PyPDF2 import PdfWriter
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.generators import make_transcript_pdf, transcript_rows  # Import after updating sys.path
+from neu_sa.fastapp import app
+from neu_sa.routers import transcript_router
+from neu_sa.routers.auth import validate_jwt
+from neu_sa.utils.pdf_transcript import parse_transcript_pdf
+from neu_sa.utils.transcript_cache import TranscriptParseCache
+from neu_sa.utils.transcript_parser import parse_transcript_rows
+from neu_sa.utils.transcript_jobs import SUCCEEDED, TranscriptJobQueue
+
+from fastapi.testclient import TestClient
+
+
+def scanned_pdf_bytes():
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_text_layer_parse_matches_the_table_row_parse():
+    rows = transcript_rows(size=120)
+    stream = io.BytesIO(make_transcript_pdf(rows))
+    assert parse_transcript_pdf(stream) == parse_transcript_rows(rows)[:2]
+    assert stream.tell() == 0
+
+    # No text layer (a scan) or no courses: Textract has to read it
+    assert parse_transcript_pdf(io.BytesIO(scanned_pdf_bytes())) is None
+    assert parse_transcript_pdf(io.BytesIO(make_transcript_pdf(rows[:2] + rows[-1:]))) is None
+
+
+def test_digital_transcripts_are_processed_without_textract(monkeypatch):
+    saved_links = []
+
+    def no_textract():
+        raise AssertionError("Textract should not be called for a digital transcript")
+
+    queue = TranscriptJobQueue(transcript_router.process_transcript_job)
+    monkeypatch.setattr(transcript_router, "transcript_jobs", queue)
+    monkeypatch.setattr(transcript_router, "transcript_parse_cache", TranscriptParseCache())
+    monkeypatch.setattr(transcript_router, "get_textract_client", no_textract)
+    monkeypatch.setattr(transcript_router, "get_s3_client", lambda: None)  # Small files only touch S3 on upload
+    monkeypatch.setattr(transcript_router, "upload_to_s3", lambda staged: (
+        "https://presigned.example/transcript.pdf",
+        f"https://bucket.s3.us-east-1.amazonaws.com/{staged.key}",
+    ))
+    monkeypatch.setattr(transcript_router, "save_transcript_link_to_snowflake",
+                        lambda user_id, file_url: saved_links.append((user_id, file_url)))
+    app.dependency_overrides[validate_jwt] = lambda: {"user_id": 5, "username": "student"}
+    try:
+        client = TestClient(app)
+        response = client.post(
+            "/transcripts/upload_transcript",
+            data={"user_id": 5},
+            files={"file": ("transcript.pdf", make_transcript_pdf(transcript_rows(size=10)), "application/pdf")},
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == SUCCEEDED and len(body["courses"]) == 10
+        assert saved_links == [(5, "https://bucket.s3.us-east-1.amazonaws.com/transcripts/5_transcript.pdf")]
+
+        # The finished job is served by the status endpoint like any other
+        job = client.get(f"/transcripts/jobs/{body['job_id']}").json()
+        assert job["status"] == SUCCEEDED and job["courses"] == body["courses"]
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,67 @@
+import sys
+import os
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from neu_sa.utils.prerequisite_graph import PrerequisiteGraph, best_grades  # Import after updating sys.path
+
+# COURSE_REQUISITES rows as written by the catalog ingestion DAG:
+#   INFO 6105: (INFO 5100 >= C- or CSYE 6200 >= C-) and DAMG 6210
+#   INFO 7390: INFO 6105 >= B
+#   INFO 7500: INFO 7390 and Graduate Program Admission
+ROWS = [
+    ("INFO 6105", "PREREQUISITE", 1, None, 0, "AND", None, None, None),
+    ("INFO 6105", "PREREQUISITE", 2, 1, 0, "OR", None, None, None),
+    ("INFO 6105", "PREREQUISITE", 3, 2, 0, "COURSE", "INFO 5100", "C-", None),
+    ("INFO 6105", "PREREQUISITE", 4, 2, 1, "COURSE", "CSYE 6200", "C-", None),
+    ("INFO 6105", "PREREQUISITE", 5, 1, 1, "COURSE", "DAMG 6210", None, None),
+    ("INFO 7390", "PREREQUISITE", 1, None, 0, "COURSE", "INFO 6105", "B", None),
+    ("INFO 7500", "PREREQUISITE", 1, None, 0, "AND", None, None, None),
+    ("INFO 7500", "PREREQUISITE", 2, 1, 0, "COURSE", "INFO 7390", None, None),
+    ("INFO 7500", "PREREQUISITE", 3, 1, 1, "TEXT", None, None, "Graduate Program Admission"),
+    ("INFO 7500", "COREQUISITE", 1, None, 0, "COURSE", "INFO 7510", None, None),
+]
+
+GRAPH = PrerequisiteGraph.from_rows(ROWS)
+
+
+def test_can_take_evaluates_and_or_structure_with_minimum_grades():
+    """Either OR branch satisfies it, the AND operand is mandatory and minimum grades apply."""
+    assert GRAPH.can_take("INFO 6105", {"CSYE 6200": "B", "DAMG 6210": "A"})
+    assert not GRAPH.can_take("INFO 6105", {"CSYE 6200": "B"})
+    assert not GRAPH.can_take("INFO 6105", {"INFO 5100": "D", "DAMG 6210": "A"})
+    assert GRAPH.can_take("INFO 6105", {"INFO 5100": "IP (In Progress)", "DAMG 6210": "A"})
+    assert not GRAPH.can_take("INFO 6105", {"INFO 5100": "IP (In Progress)", "DAMG 6210": "A"}, allow_in_progress=False)
+    assert GRAPH.can_take("INFO 5100", {})  # No prerequisites
+    assert GRAPH.unmet_prerequisites("INFO 7390", {"INFO 6105": "C"}) == ["INFO 6105"]
+
+
+def test_transitive_closures_and_free_text_requirements():
+    """Closures follow every prerequisite path; free text cannot be checked and counts as met."""
+    assert GRAPH.transitive_prerequisites("INFO 7500") == {"INFO 7390", "INFO 6105", "INFO 5100", "CSYE 6200", "DAMG 6210"}
+    assert GRAPH.unlocks("DAMG 6210") == {"INFO 6105", "INFO 7390", "INFO 7500"}
+    assert GRAPH.can_take("INFO 7500", {"INFO 7390": "A"})
+    assert "INFO 7500" in GRAPH.corequisites
+
+
+def test_best_grades_counts_retakes():
+    grades = best_grades([
+        {"course_code": "INFO 6105", "grade": "F"},
+        {"course_code": "INFO 6105", "grade": "B+"},
+    ])
+    assert grades == {"INFO 6105": "B+"}
+    assert GRAPH.can_take("INFO 7390", grades)
+
+
+def test_retaken_failure_resolves_to_the_retake_grade():
+    """GRADE_PRECEDENCE ranks F ahead of S and IP, but a failed attempt never wins over a retake."""
+    for retake in ("S", "IP (In Progress)"):
+        grades = best_grades([
+            {"course_code": "DAMG 6210", "grade": "F"},
+            {"course_code": "DAMG 6210", "grade": retake},
+            {"course_code": "CSYE 6200", "grade": "B"},
+        ])
+        assert grades["DAMG 6210"] == retake
+        assert GRAPH.can_take("INFO 6105", grades)
+    assert best_grades([{"course_code": "DAMG 6210", "grade": "F"}]) == {"DAMG 6210": "F"}
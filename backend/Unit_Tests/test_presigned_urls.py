@@ -0,0 +1,72 @@
+import sys
+import os
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from neu_sa.fastapp import app  # Import after updating sys.path
+from neu_sa.routers import transcript_router
+from neu_sa.routers.auth import validate_jwt
+from neu_sa.utils.presigned_urls import PresignedUrlCache
+from neu_sa.utils.user_context import UserContext, UserContextCache
+
+from fastapi.testclient import TestClient
+
+FILE_URL = "https://bucket.s3.us-east-1.amazonaws.com/transcripts/8_transcript.pdf"
+
+
+def test_urls_are_reused_per_user_until_close_to_expiry():
+    now = [0.0]
+    signed = []
+
+    def presign(file_url, expires_in):
+        signed.append((file_url, expires_in))
+        return f"{file_url}?signature={len(signed)}"
+
+    cache = PresignedUrlCache(maxsize=2, expires_in=3600, min_remaining=600, clock=lambda: now[0])
+    first = cache.get(8, FILE_URL, presign)
+    now[0] = 2999
+    assert cache.get(8, FILE_URL, presign) == first
+    assert cache.get(9, FILE_URL, presign) != first  # Never shared between users
+
+    # Past expiry less the minimum remaining lifetime, the URL is signed again
+    now[0] = 3001
+    assert cache.get(8, FILE_URL, presign) != first
+    assert signed == [(FILE_URL, 3600)] * 3
+
+    cache.put(10, FILE_URL, "https://presigned.example/uploaded.pdf")
+    assert cache.get(10, FILE_URL, presign) == "https://presigned.example/uploaded.pdf"
+    assert cache.stats()["evictions"] == 1 and cache.stats()["hits"] == 2
+
+
+def test_transcript_link_reads_the_cached_user_context(monkeypatch):
+    loads, signed = [], []
+
+    def load_user_context(user_id):
+        loads.append(user_id)
+        profile = {"transcript_link": FILE_URL if user_id == 8 else None}
+        return UserContext(user_id, 1, profile, [], [])
+
+    def presign(file_url, expires_in=3600):
+        signed.append(file_url)
+        return "https://presigned.example/8.pdf"
+
+    monkeypatch.setattr(transcript_router, "user_context_cache", UserContextCache(loader=load_user_context))
+    monkeypatch.setattr(transcript_router, "presigned_url_cache", PresignedUrlCache())
+    monkeypatch.setattr(transcript_router, "presign_transcript", presign)
+    monkeypatch.setattr(transcript_router, "get_snowflake_connection", None)  # No dedicated connection
+    try:
+        client = TestClient(app)
+
+        app.dependency_overrides[validate_jwt] = lambda: {"user_id": 8, "username": "student"}
+        for _ in range(3):
+            response = client.get("/transcripts/transcript_link/8")
+            assert response.status_code == 200
+            assert response.json() == {"transcript_presigned_url": "https://presigned.example/8.pdf"}
+        assert loads == [8] and signed == [FILE_URL]
+
+        app.dependency_overrides[validate_jwt] = lambda: {"user_id": 9, "username": "student"}
+        response = client.get("/transcripts/transcript_link/9")
+        assert response.json() == {"message": "No transcript found for this user."}
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,111 @@
+import sys
+import os
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+import pytest
+
+from neu_sa.utils.program_catalog import ProgramCatalog  # Import after updating sys.path
+
+
+class FakeWarehouse:
+    """Answers the catalog queries from in-memory rows and counts round trips."""
+
+    def __init__(self):
+        self.generation = 1
+        self.max_credit_hours = 32
+        self.queries = 0
+
+    def rows_for(self, query):
+        if "COURSE_REQUISITES" in query:
+            return [
+                ("DAMG 6210", "PREREQUISITE", 1, None, 0, "COURSE", "INFO 5100", "C-", None),
+            ]
+        if "SELECT COURSE_CODE, CREDITS FROM COURSE_CATALOG" in query:
+            return [("INFO 5100", 4), ("DAMG 6210", 4), ("INFO 7500", 2)]
+        if "CATALOG_GENERATION" in query:
+            return [(self.generation,)]
+        if "FROM PROGRAM_REQUIREMENTS" in query:
+            return [("MP_TEST", "Test Program", self.max_credit_hours, 3.0, 8, 4, 8, 4, "CSYE 6220, INFO 7500")]
+        if "CORE_REQUIREMENTS" in query:
+            return [
+                ("MP_TEST", "CORE", "INFO 5100", 4, "", None),
+                ("MP_TEST", "CORE_OPTION", "DAMG 6210", 4, "INFO 5100 with a minimum grade of C-", None),
+            ]
+        if "SUBJECT_AREAS" in query:
+            return [("MP_TEST", "INFO", 4)]
+        if "ELECTIVE_REQUIREMENTS" in query:
+            return [("MP_TEST", "INFO"), ("MP_TEST", "DAMG")]
+        return []
+
+
+class FakeCursor:
+    def __init__(self, warehouse):
+        self.warehouse = warehouse
+        self.rows = []
+
+    def execute(self, query, params=None):
+        self.warehouse.queries += 1
+        self.rows = self.warehouse.rows_for(query)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, warehouse):
+        self.warehouse = warehouse
+
+    def cursor(self):
+        return FakeCursor(self.warehouse)
+
+    def close(self):
+        pass
+
+
+def test_catalog_loads_all_programs_in_fixed_queries():
+    """One generation check plus six set-based queries load every program, the prerequisite graph and course credits."""
+    warehouse = FakeWarehouse()
+    catalog = ProgramCatalog(lambda: FakeConnection(warehouse), check_interval=60)
+    catalog.load()
+
+    program = catalog.get("MP_TEST")
+    assert warehouse.queries == 7
+    assert program.max_credit_hours == 32
+    assert program.elective_exceptions == ("CSYE 6220", "INFO 7500")
+    assert [course.course_code for course in program.core_courses] == ["INFO 5100"]
+    assert program.core_courses[0].prerequisites is None
+    assert program.core_option_courses[0].prerequisites == "INFO 5100 with a minimum grade of C-"
+    assert program.elective_subjects == frozenset({"INFO", "DAMG"})
+
+    graph = catalog.prerequisite_graph()
+    assert graph.can_take("DAMG 6210", {"INFO 5100": "B"})
+    assert not graph.can_take("DAMG 6210", {"INFO 5100": "D"})
+
+    assert catalog.course_credits()["INFO 7500"] == 2
+
+    with pytest.raises(ValueError):
+        catalog.get("MP_UNKNOWN")
+
+
+def test_catalog_reloads_only_when_generation_changes():
+    """Reads are served from memory until the generation marker is bumped."""
+    warehouse = FakeWarehouse()
+    catalog = ProgramCatalog(lambda: FakeConnection(warehouse), check_interval=0)
+    catalog.load()
+    queries_after_load = warehouse.queries
+
+    warehouse.max_credit_hours = 40
+    assert catalog.get("MP_TEST").max_credit_hours == 32
+    assert warehouse.queries == queries_after_load + 1  # Generation check only
+
+    warehouse.generation = 2
+    assert catalog.get("MP_TEST").max_credit_hours == 40
+    assert catalog.generation == 2
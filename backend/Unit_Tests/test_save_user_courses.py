@@ -0,0 +1,157 @@
+import sys
+import os
+import pytest
+from fastapi import HTTPException
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from neu_sa.fastapp import app  # Import after updating sys.path
+from neu_sa.routers import user_router
+from neu_sa.routers.auth import validate_jwt
+from neu_sa.routers.user_router import UserCourse, save_user_courses, validate_user_courses
+from neu_sa.utils.eligibility_kernel import build_program_requirements, compute_eligibility, index_transcript, rows_to_rewrite
+from neu_sa.utils.eligibility_queue import EligibilityQueue, InMemoryJobStore
+
+from fastapi.testclient import TestClient
+
+
+class RecordingConnection:
+    """Answers the USER_COURSES lookup with `existing` and records every statement."""
+
+    def __init__(self, existing):
+        self.existing = existing
+        self.statements = []
+        self.committed = False
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=()):
+        # Every placeholder must have a bound value
+        assert query.count("%s") == len(params)
+        self.statements.append((" ".join(query.split()), params))
+
+    def fetchall(self):
+        return self.existing
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def course(code, grade="A", credits=4, name="Course"):
+    return UserCourse(course_code=code, course_name=name, grade=grade, credits=credits)
+
+
+def save(monkeypatch, existing, courses):
+    conn = RecordingConnection(existing)
+    monkeypatch.setattr(user_router, "get_snowflake_connection", lambda: conn)
+    return conn, save_user_courses(1, courses)
+
+
+def test_course_list_is_applied_with_a_fixed_number_of_statements(monkeypatch):
+    existing = [("INFO 5100", "Course", "A", 4), ("INFO 6105", "Course", "B", 4), ("DAMG 6210", "Course", "A", 4)]
+    conn, (total_credits, changed) = save(monkeypatch, existing, [
+        course("INFO 5100"),               # Unchanged
+        course("INFO 6105", grade="A-"),   # Regraded
+        course("CSYE 7374", credits=2),    # New
+    ])
+
+    assert changed == {"INFO 6105", "CSYE 7374", "DAMG 6210"}
+    assert total_credits == 10
+    assert conn.committed
+    kinds = [statement.split()[0] for statement, _ in conn.statements]
+    assert kinds == ["SELECT", "BEGIN;", "DELETE", "MERGE", "UPDATE"]
+
+    delete, params = conn.statements[2]
+    assert "NOT IN (%s, %s, %s)" in delete and params == (1, "CSYE 7374", "INFO 5100", "INFO 6105")
+    merge, params = conn.statements[3]
+    assert params == (1, "INFO 6105", "Course", "A-", 4, "CSYE 7374", "Course", "A", 2)
+
+    # A transcript 50 times longer needs the same statements
+    many = [course(f"INFO {5000 + index}") for index in range(150)]
+    conn, _ = save(monkeypatch, existing, many)
+    assert [statement.split()[0] for statement, _ in conn.statements] == kinds
+
+
+def test_unchanged_list_only_recomputes_credits_and_empty_list_deletes_all(monkeypatch):
+    existing = [("INFO 5100", "Course", "A", 4)]
+    conn, (_, changed) = save(monkeypatch, existing, [course("INFO 5100")])
+    assert changed == set()
+    assert [statement.split()[0] for statement, _ in conn.statements] == ["SELECT", "BEGIN;", "UPDATE"]
+
+    conn, (total_credits, changed) = save(monkeypatch, existing, [])
+    assert changed == {"INFO 5100"} and total_credits == 0
+    assert conn.statements[2] == ("DELETE FROM USER_COURSES WHERE user_id = %s", (1,))
+
+
+def test_whole_payload_is_validated_before_any_write():
+    with pytest.raises(HTTPException) as error:
+        validate_user_courses([course("INFO 5100"), course("INFO 6105", grade="Z")])
+    assert error.value.status_code == 400
+    with pytest.raises(HTTPException):
+        validate_user_courses([course("info5100")])
+    validate_user_courses([course("INFO 5100", grade="IP (In Progress)", credits=0)])
+
+
+def program(program_id, core):
+    return build_program_requirements(
+        {"program_id": program_id, "core_credit_req": 8, "core_options_credit_req": 0, "elective_credit_req": 4},
+        core_courses=[{"course_code": code, "credits": 4} for code in core],
+        core_option_courses=[],
+        subject_areas={},
+        elective_subjects={"INFO", "CSYE"},
+    )
+
+
+def test_program_change_rebuilds_eligibility_before_incremental_course_saves(monkeypatch):
+    old, new = program("MP_IS_MSIS", ["INFO 5100", "INFO 6105"]), program("MP_SES_MS", ["CSYE 6200", "CSYE 7200"])
+    user = {"program": old, "courses": [{"course_code": "INFO 5100", "credits": 4, "grade": "A"}]}
+    stored = compute_eligibility(old, index_transcript(user["courses"]))  # USER_ELIGIBILITY
+
+    def recalculate(user_id, changed_courses):
+        records = compute_eligibility(user["program"], index_transcript(user["courses"]))
+        if changed_courses is None:
+            stored[:] = records
+        else:
+            codes, rows = rows_to_rewrite(user["program"], records, changed_courses)
+            stored[:] = [record for record in stored if record.course_or_requirement not in codes] + rows
+
+    def save_courses(user_id, courses):
+        user["courses"] = [{"course_code": c.course_code, "credits": int(c.credits), "grade": c.grade} for c in courses]
+        return 8, {"CSYE 6200"}
+
+    queue = EligibilityQueue(InMemoryJobStore(), handler=recalculate, workers=1, poll_interval=0.01)
+    monkeypatch.setattr(user_router, "eligibility_queue", queue)
+    monkeypatch.setattr(user_router, "save_user_profile", lambda user_id, profile: user.update(program=new))
+    monkeypatch.setattr(user_router, "save_user_courses", save_courses)
+    app.dependency_overrides[validate_jwt] = lambda: {"user_id": 1, "username": "student"}
+    queue.start()
+    try:
+        client = TestClient(app)
+        response = client.put("/user/1/profile", json={
+            "college": "College of Engineering", "program_name": "Software Engineering Systems, MS",
+            "program_id": "MP_SES_MS", "gpa": 3.5, "campus": "Boston",
+        })
+        assert response.status_code == 200 and response.json()["eligibility_version"] == 1
+        assert queue.wait_until_idle()
+
+        response = client.put("/user/1/courses", json=[
+            {"course_code": "INFO 5100", "course_name": "Course", "grade": "A", "credits": 4},
+            {"course_code": "CSYE 6200", "course_name": "Course", "grade": "A", "credits": 4},
+        ])
+        assert response.status_code == 200
+        assert queue.wait_until_idle()
+    finally:
+        queue.stop()
+        app.dependency_overrides.clear()
+
+    # Nothing is left over from the old program's buckets
+    assert sorted(stored) == sorted(compute_eligibility(new, index_transcript(user["courses"])))
+    assert "INFO 6105" not in {record.course_or_requirement for record in stored}
@@ -0,0 +1,40 @@
+import sys
+import os
+import pytest
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.generators import make_textract_blocks, transcript_rows  # Import after updating sys.path
+from neu_sa.routers import transcript_router
+from neu_sa.utils.aws_clients import StubTextractClient
+from neu_sa.utils.textract_tables import TableAssembler
+
+
+def test_rows_are_assembled_across_result_pages_in_any_block_order():
+    rows = transcript_rows(size=30)
+    _, blocks_map = make_textract_blocks(rows)
+    # The table and its cells arrive before the words they reference
+    blocks = list(reversed(list(blocks_map.values())))
+
+    assembler = TableAssembler()
+    for start in range(0, len(blocks), 25):
+        assembler.add(blocks[start:start + 25])
+    assert assembler.rows() == rows
+
+    empty = TableAssembler()
+    empty.add([{"Id": "w", "BlockType": "WORD", "Text": "College:"}])
+    with pytest.raises(ValueError, match="No tables"):
+        empty.rows()
+
+
+def test_every_next_token_page_is_read(monkeypatch):
+    rows = transcript_rows(size=40)
+    _, blocks_map = make_textract_blocks(rows)
+    stub = StubTextractClient({"default": list(blocks_map.values())}, polls_until_done=1, page_size=100)
+    monkeypatch.setattr(transcript_router, "get_textract_client", lambda: stub)
+
+    job_id = stub.start_document_analysis(DocumentLocation={"S3Object": {"Bucket": "b", "Name": "transcripts/5.pdf"}})["JobId"]
+    assert transcript_router.fetch_textract_table_rows(job_id) is None  # Still in progress
+    assert len(blocks_map) > 100
+    assert transcript_router.fetch_textract_table_rows(job_id) == rows
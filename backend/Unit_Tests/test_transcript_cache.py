@@ -0,0 +1,101 @@
+import sys
+import os
+import io
+from PyPDF2 import PdfWriter
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from neu_sa.fastapp import app  # Import after updating sys.path
+from neu_sa.routers import transcript_router
+from neu_sa.routers.auth import validate_jwt
+from neu_sa.utils.aws_clients import StubTextractClient
+from neu_sa.utils.presigned_urls import PresignedUrlCache
+from neu_sa.utils.transcript_cache import TranscriptParseCache
+from neu_sa.utils.transcript_jobs import PENDING, SUCCEEDED, TranscriptJobQueue
+
+from fastapi.testclient import TestClient
+
+RECORDINGS = os.path.join(os.path.dirname(__file__), "fixtures", "textract")
+FILE_URL = "https://bucket.s3.us-east-1.amazonaws.com/transcripts/5_transcript.pdf"
+
+
+def scanned_pdf_bytes():
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_entries_are_per_user_bounded_and_track_the_stored_object():
+    cache = TranscriptParseCache(maxsize=3)
+    profile, courses = {"gpa": 3.5}, [{"course_code": "INFO 5100"}]
+    cache.put(5, "a", profile, courses, FILE_URL)
+    assert cache.get(5, "a").completed_courses == courses
+    assert cache.get(6, "a") is None  # Another user uploading the same bytes does not see the parse
+
+    # A different upload replaced the user's stored object: the parse is kept, the object is not
+    cache.stored(5, "b", FILE_URL)
+    assert cache.get(5, "a").file_url is None
+
+    for digest in ("c", "d", "e"):
+        cache.put(7, digest, profile, courses, f"https://bucket/{digest}")
+    assert cache.get(5, "a") is None
+    assert cache.stats()["evictions"] == 1 and cache.stats()["size"] == 3
+
+
+def test_retries_and_reuploads_skip_textract_and_s3(monkeypatch):
+    calls = {"upload": 0, "textract": 0}
+    stub = StubTextractClient.from_directory(RECORDINGS, polls_until_done=1)
+
+    def textract():
+        calls["textract"] += 1
+        return stub
+
+    def upload(staged):
+        calls["upload"] += 1
+        return "https://presigned.example/transcript.pdf", FILE_URL
+
+    queue = TranscriptJobQueue(transcript_router.process_transcript_job, workers=1, initial_delay=0.05,
+                               max_delay=0.05, poll_interval=0.01)
+    monkeypatch.setattr(transcript_router, "transcript_jobs", queue)
+    monkeypatch.setattr(transcript_router, "transcript_parse_cache", TranscriptParseCache())
+    monkeypatch.setattr(transcript_router, "get_textract_client", textract)
+    monkeypatch.setattr(transcript_router, "get_s3_client", lambda: None)  # Small files only touch S3 on upload
+    monkeypatch.setattr(transcript_router, "upload_to_s3", upload)
+    monkeypatch.setattr(transcript_router, "presign_transcript",
+                        lambda file_url, expires_in=3600: "https://presigned.example/again.pdf")
+    monkeypatch.setattr(transcript_router, "presigned_url_cache", PresignedUrlCache())
+    monkeypatch.setattr(transcript_router, "save_transcript_link_to_snowflake", lambda user_id, file_url: None)
+    app.dependency_overrides[validate_jwt] = lambda: {"user_id": 5, "username": "student"}
+    try:
+        client = TestClient(app)
+
+        def upload_transcript():
+            return client.post(
+                "/transcripts/upload_transcript",
+                data={"user_id": 5},
+                files={"file": ("transcript.pdf", scanned_pdf_bytes(), "application/pdf")},
+            )
+
+        first = upload_transcript()
+        # A retry while the job is running joins it instead of starting another analysis
+        retry = upload_transcript()
+        assert first.status_code == retry.status_code == 202
+        assert retry.json() == {"message": "Transcript is already being processed.",
+                                "job_id": first.json()["job_id"], "status": PENDING}
+
+        queue.start()
+        assert queue.wait_until_idle(5)
+        assert calls["upload"] == 1 and calls["textract"] == 3  # start + two status polls
+
+        again = upload_transcript()
+        assert again.status_code == 200 and again.json()["status"] == SUCCEEDED
+        assert [course["course_code"] for course in again.json()["courses"]] == ["INFO 5100", "DAMG 6210", "INFO 6105"]
+        # The URL signed when the file was uploaded is still fresh, so it is reused
+        assert again.json()["transcript_presigned_url"] == "https://presigned.example/transcript.pdf"
+        assert calls["upload"] == 1 and calls["textract"] == 3
+    finally:
+        queue.stop()
+        app.dependency_overrides.clear()
@@ -0,0 +1,98 @@
+import sys
+import os
+import io
+import time
+from PyPDF2 import PdfWriter
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from neu_sa.fastapp import app  # Import after updating sys.path
+from neu_sa.routers import transcript_router
+from neu_sa.routers.auth import validate_jwt
+from neu_sa.utils.aws_clients import StubTextractClient
+from neu_sa.utils.transcript_cache import TranscriptParseCache
+from neu_sa.utils.transcript_jobs import FAILED, SUCCEEDED, TranscriptJobQueue
+
+from fastapi.testclient import TestClient
+
+RECORDINGS = os.path.join(os.path.dirname(__file__), "fixtures", "textract")
+
+
+def pdf_bytes():
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_jobs_are_polled_with_backoff_until_done_or_failed():
+    polled_at = {}
+
+    def handler(job):
+        polled_at.setdefault(job["job_id"], []).append(time.time())
+        if job["details"].get("fail"):
+            raise RuntimeError("AWS Textract job failed: bad document")
+        return {"done": True} if job["polls"] == 4 else None
+
+    queue = TranscriptJobQueue(handler, workers=1, initial_delay=0.02, max_delay=0.1, timeout=5, poll_interval=0.01)
+    queue.start()
+    try:
+        ok = queue.submit(1, textract_job_id="a")
+        bad = queue.submit(1, textract_job_id="b", fail=True)
+        assert queue.status(ok)["status"] in ("PENDING", "RUNNING")
+        assert queue.wait_until_idle(5)
+    finally:
+        queue.stop()
+
+    assert queue.status(ok)["status"] == SUCCEEDED and queue.status(ok)["result"] == {"done": True}
+    gaps = [later - earlier for earlier, later in zip(polled_at[ok], polled_at[ok][1:])]
+    assert len(gaps) == 3 and gaps[0] < gaps[2]  # 0.04s, 0.08s, then capped at 0.1s
+
+    failed = queue.status(bad)
+    assert failed["status"] == FAILED and "bad document" in failed["error"]
+
+
+def test_upload_returns_a_job_id_and_the_status_endpoint_serves_the_result(monkeypatch):
+    saved_links = []
+    stub = StubTextractClient.from_directory(RECORDINGS, polls_until_done=2)
+    queue = TranscriptJobQueue(transcript_router.process_transcript_job, workers=1, initial_delay=0.01,
+                               max_delay=0.02, poll_interval=0.01)
+    monkeypatch.setattr(transcript_router, "transcript_jobs", queue)
+    monkeypatch.setattr(transcript_router, "transcript_parse_cache", TranscriptParseCache())
+    monkeypatch.setattr(transcript_router, "get_textract_client", lambda: stub)
+    monkeypatch.setattr(transcript_router, "get_s3_client", lambda: None)  # Small files only touch S3 on upload
+    monkeypatch.setattr(transcript_router, "upload_to_s3", lambda staged: (
+        "https://presigned.example/transcript.pdf",
+        f"https://bucket.s3.us-east-1.amazonaws.com/{staged.key}",
+    ))
+    monkeypatch.setattr(transcript_router, "save_transcript_link_to_snowflake",
+                        lambda user_id, file_url: saved_links.append((user_id, file_url)))
+    app.dependency_overrides[validate_jwt] = lambda: {"user_id": 5, "username": "student"}
+    queue.start()
+    try:
+        client = TestClient(app)
+        response = client.post(
+            "/transcripts/upload_transcript",
+            data={"user_id": 5},
+            files={"file": ("transcript.pdf", pdf_bytes(), "application/pdf")},
+        )
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert response.json()["status"] == "PENDING"
+
+        assert queue.wait_until_idle(5)
+        job = client.get(f"/transcripts/jobs/{job_id}").json()
+        assert job["status"] == SUCCEEDED
+        assert [course["course_code"] for course in job["courses"]] == ["INFO 5100", "DAMG 6210", "INFO 6105"]
+        assert job["courses"][2]["grade"] == "IP (In Progress)"
+        assert job["additional_details"]["user_profile"]["gpa"] == 3.85
+        assert saved_links == [(5, "https://bucket.s3.us-east-1.amazonaws.com/transcripts/5_transcript.pdf")]
+
+        # Jobs are only visible to the user who uploaded the transcript
+        app.dependency_overrides[validate_jwt] = lambda: {"user_id": 6, "username": "other"}
+        assert client.get(f"/transcripts/jobs/{job_id}").status_code == 404
+    finally:
+        queue.stop()
+        app.dependency_overrides.clear()
@@ -0,0 +1,43 @@
+import sys
+import os
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.baselines import extract_user_profile_and_courses, table_text  # Import after updating sys.path
+from benchmarks.generators import transcript_rows
+from neu_sa.utils.transcript_parser import IN_PROGRESS_GRADE, parse_transcript_rows
+
+
+def test_row_parse_matches_the_regex_parse_on_registrar_layout():
+    rows = transcript_rows(size=200)
+    parsed = parse_transcript_rows(rows)
+    assert (parsed.user_profile, parsed.completed_courses) == extract_user_profile_and_courses(table_text(rows))
+    assert parsed.errors == []
+
+
+def test_columns_are_mapped_by_header_and_bad_rows_are_reported():
+    rows = [
+        ["College:", "College of Engineering"],
+        ["Major and Department:", "Information Systems", "MSIS"],
+        ["Title", "Subject", "Course", "Level", "Credit Hours", "Grade"],
+        ["Program Structure & Design: Advanced", "INFO", "6150", "GR", "4.000", "A-"],
+        ["Data Science", "INFO", "6105", "GR", "4.000", "W"],
+        ["Database Design", "DAMG", "62", "GR", "4.000", "A"],
+        ["Capstone", "INFO", "7390", "GR", "six", "B"],
+        # In-progress courses have no grade column
+        ["Subject", "Course", "Level", "Title", "Credit Hours"],
+        ["CSYE", "7374", "GR", "Generative AI", "4.000"],
+        ["Transcript Totals", "Attempt Hours", "Passed Hours", "GPA", "Quality Points"],
+        ["Overall:", "8.000", "8.000", "3.667", "29.336"],
+    ]
+    parsed = parse_transcript_rows(rows)
+
+    assert parsed.user_profile == {"college": "College of Engineering",
+                                   "program_id": "Information Systems, MSIS", "gpa": 3.667}
+    assert parsed.completed_courses == [
+        {"course_code": "INFO 6150", "course_name": "Program Structure & Design: Advanced", "grade": "A-", "credits": 4.0},
+        {"course_code": "CSYE 7374", "course_name": "Generative AI", "grade": IN_PROGRESS_GRADE, "credits": 4.0},
+    ]
+    assert [error.row for error in parsed.errors] == [4, 5, 6]
+    assert "'W'" in parsed.errors[0].error and "course code" in parsed.errors[1].error
@@ -0,0 +1,89 @@
+import sys
+import os
+import io
+import hashlib
+import pytest
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.generators import make_transcript_pdf, transcript_rows  # Import after updating sys.path
+from neu_sa.utils import transcript_upload
+from neu_sa.utils.pdf_transcript import parse_transcript_document, parse_transcript_pdf
+from neu_sa.utils.transcript_upload import InvalidTranscriptFile, stage_upload
+
+
+class RecordingS3:
+    """Records the S3 calls a staged upload makes."""
+
+    def __init__(self):
+        self.calls = []
+        self.parts = {}
+
+    def create_multipart_upload(self, Bucket, Key):
+        self.calls.append("create_multipart_upload")
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.calls.append("upload_part")
+        self.parts[PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.calls.append("complete_multipart_upload")
+        assert [part["PartNumber"] for part in MultipartUpload["Parts"]] == sorted(self.parts)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.calls.append("abort_multipart_upload")
+
+    def put_object(self, Bucket, Key, Body):
+        self.calls.append("put_object")
+        self.parts[1] = Body
+
+
+def test_one_pass_validates_hashes_counts_pages_and_uploads_in_parts(monkeypatch):
+    monkeypatch.setattr(transcript_upload, "READ_CHUNK_SIZE", 1000)  # Page markers split across reads
+    data = make_transcript_pdf(transcript_rows(size=400))
+    stream = io.BytesIO(data)
+
+    # Small files go up in a single request once complete
+    s3 = RecordingS3()
+    staged = stage_upload(stream, s3, "bucket", "transcripts/5_transcript.pdf")
+    assert staged.pages == 7 and staged.size == len(data)
+    assert staged.digest == hashlib.sha256(data).hexdigest() and stream.tell() == 0
+    assert s3.calls == []
+    staged.complete()
+    assert s3.calls == ["put_object"] and s3.parts[1] == data
+
+    # Larger files are sent part by part while they are read
+    s3 = RecordingS3()
+    staged = stage_upload(stream, s3, "bucket", "transcripts/5_transcript.pdf", part_size=8000)
+    assert s3.calls[0] == "create_multipart_upload" and "put_object" not in s3.calls
+    staged.complete()
+    assert s3.calls[-1] == "complete_multipart_upload"
+    assert b"".join(s3.parts[number] for number in sorted(s3.parts)) == data
+
+    # The text layer is parsed from the staged bytes, without reading the upload again
+    upload = io.BytesIO(data)
+    staged = stage_upload(upload, RecordingS3(), "bucket", "key")
+    upload.close()
+    assert parse_transcript_document(staged.reader) == parse_transcript_pdf(io.BytesIO(data)) is not None
+    assert staged.reader() is staged.reader()
+
+    # A discarded upload never becomes visible
+    s3 = RecordingS3()
+    stage_upload(stream, s3, "bucket", "key", part_size=8000).abort()
+    assert s3.calls[-1] == "abort_multipart_upload" and "complete_multipart_upload" not in s3.calls
+
+
+def test_invalid_files_are_rejected_and_their_parts_discarded(monkeypatch):
+    monkeypatch.setattr(transcript_upload, "READ_CHUNK_SIZE", 1000)
+    s3 = RecordingS3()
+    with pytest.raises(InvalidTranscriptFile, match="not a valid PDF"):
+        stage_upload(io.BytesIO(b"GIF89a..."), s3, "bucket", "key")
+
+    data = make_transcript_pdf(transcript_rows(size=800))  # 14 pages
+    with pytest.raises(InvalidTranscriptFile, match="must not exceed 10 pages"):
+        stage_upload(io.BytesIO(data), s3, "bucket", "key", part_size=8000)
+    # Rejected as soon as the 11th page is read, with the parts sent so far discarded
+    assert s3.calls[-1] == "abort_multipart_upload" and len(s3.parts) < len(data) // 8000
@@ -0,0 +1,92 @@
+import sys
+import os
+import json
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from neu_sa.utils.user_context import UserContext, UserContextCache, fetch_user_context  # Import after updating sys.path
+
+
+class UnionConnection:
+    """Answers the context query with (KIND, DATA) rows, OBJECT columns as JSON text."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=()):
+        self.queries.append((query, params))
+
+    def fetchall(self):
+        return [(kind, json.dumps(data) if data is not None else None) for kind, data in self.rows]
+
+    def close(self):
+        pass
+
+
+def test_profile_courses_and_eligibility_are_read_in_one_round_trip():
+    conn = UnionConnection([
+        ("COURSE", {"course_code": "INFO 5100", "course_name": "App Engineering", "grade": "A", "credits": 4}),
+        ("PROFILE", {"username": "student", "program_id": "MP_IS", "gpa": 3.5, "completed_credits": 4, "version": 7}),
+        ("ELIGIBILITY", {"course_or_requirement": "INFO 6105", "eligible": True, "details": "Prerequisites satisfied.", "status": "ELIGIBLE"}),
+    ])
+    context = fetch_user_context(conn, 42)
+
+    assert len(conn.queries) == 1
+    query, params = conn.queries[0]
+    assert query.count("UNION ALL") == 3 and params == (42, 42, 42, 42)
+    assert context.version == 7 and context.profile["program_id"] == "MP_IS"
+    assert context.completed_courses == [{"course_code": "INFO 5100", "credits": 4, "grade": "A"}]
+    assert context.eligibility[0]["course_or_requirement"] == "INFO 6105"
+    assert context.advising is None
+
+    missing = fetch_user_context(UnionConnection([]), 43)
+    assert missing.profile is None and missing.version == 0
+
+    # A NULL advising context reads as none rather than failing the whole load
+    null_advising = fetch_user_context(UnionConnection([("PROFILE", {"version": 2}), ("ADVISING", None)]), 44)
+    assert null_advising.advising is None and null_advising.version == 2
+
+
+def test_cache_reads_through_evicts_lru_and_honours_invalidation():
+    loads = []
+
+    def loader(user_id):
+        loads.append(user_id)
+        return UserContext(user_id, 1, {"program_id": "MP_IS"}, [], [])
+
+    cache = UserContextCache(maxsize=2, ttl=60, loader=loader)
+    cache.get(1)
+    cache.get(2)
+    cache.get(1)          # Hit; user 2 is now least recently used
+    cache.get(3)          # Evicts user 2
+    cache.get(2)          # Reloaded
+    assert loads == [1, 2, 3, 2]
+
+    # A caller that knows a newer version, or a write, forces a reload
+    cache.get(2, version=2)
+    cache.invalidate(2)
+    cache.get(2)
+    assert loads == [1, 2, 3, 2, 2, 2]
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 6
+    assert stats["evictions"] == 2 and stats["invalidations"] == 1
+    assert stats["size"] == 2 and round(stats["hit_rate"], 3) == round(1 / 7, 3)
+
+
+def test_invalidation_during_a_load_is_not_lost():
+    cache = UserContextCache(ttl=60)
+
+    def loader(user_id):
+        # A write lands while the (now stale) context is being read
+        cache.invalidate(user_id)
+        return UserContext(user_id, 1, None, [], [])
+
+    cache._loader = loader
+    cache.get(1)
+    assert cache.stats()["size"] == 0
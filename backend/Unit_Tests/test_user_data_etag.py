@@ -0,0 +1,50 @@
+import sys
+import os
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from neu_sa.fastapp import app  # Import after updating sys.path
+from neu_sa.routers import user_router
+from neu_sa.routers.auth import validate_jwt
+from neu_sa.utils.user_context import UserContext, UserContextCache
+
+from fastapi.testclient import TestClient
+
+
+def test_conditional_get_uses_the_version_stamp(monkeypatch):
+    versions = {1: 3}
+    full_reads = []
+
+    def load_user_context(user_id):
+        full_reads.append(user_id)
+        return UserContext(user_id, versions[user_id], None, [], [])
+
+    monkeypatch.setattr(user_router, "fetch_user_version", lambda user_id: versions[user_id])
+    monkeypatch.setattr(user_router, "user_context_cache", UserContextCache(loader=load_user_context))
+    app.dependency_overrides[validate_jwt] = lambda: {"user_id": 1, "username": "student"}
+    try:
+        client = TestClient(app)
+
+        response = client.get("/user/1")
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert etag == '"user-1-v3"'
+
+        # Unchanged: 304 from the version lookup alone
+        response = client.get("/user/1", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+        # A client without the ETag is served from the in-process cache
+        assert client.get("/user/1").status_code == 200
+        assert full_reads == [1]
+
+        # A profile or course update bumps the version: full response with a new ETag
+        versions[1] = 4
+        response = client.get("/user/1", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] == '"user-1-v4"'
+        assert full_reads == [1, 1]
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,104 @@
+import sys
+import os
+
+# Add the backend directory to PYTHONPATH dynamically
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from neu_sa.utils.eligibility_kernel import build_program_requirements  # Import after updating sys.path
+from neu_sa.utils.prerequisite_graph import PrerequisiteGraph
+from neu_sa.utils.what_if import evaluate_scenarios
+
+PROGRAM = build_program_requirements(
+    {
+        "program_id": "MP_TEST",
+        "core_credit_req": 8,
+        "core_options_credit_req": 4,
+        "elective_credit_req": 8,
+        "max_credit_hours": 32,
+    },
+    core_courses=[
+        {"course_code": "INFO 5100", "credits": 4},
+        {"course_code": "INFO 5101", "credits": 4},
+    ],
+    core_option_courses=[
+        {"course_code": "DAMG 6210", "credits": 4},
+        {"course_code": "INFO 6150", "credits": 4},
+    ],
+    subject_areas={"INFO": 4},
+    elective_subjects={"INFO", "DAMG", "CSYE"},
+)
+
+COURSE_CREDITS = {"INFO 5101": 4, "INFO 7390": 4, "CSYE 7374": 2}
+
+GRAPH = PrerequisiteGraph.from_rows([
+    ("INFO 7390", "PREREQUISITE", 1, None, 0, "COURSE", "INFO 5101", "B", None),
+])
+
+TRANSCRIPT = [
+    {"course_code": "INFO 5100", "credits": 4, "grade": "A"},
+    {"course_code": "DAMG 6210", "credits": 4, "grade": "B"},
+]
+
+
+def progress(result):
+    return {bucket["requirement"]: bucket for bucket in result["requirements"]}
+
+
+def test_scenarios_report_per_requirement_progress():
+    """Adds default to in progress with catalog credits; drops remove real transcript courses."""
+    results = evaluate_scenarios(PROGRAM, TRANSCRIPT, [
+        {"name": "current"},
+        {"name": "finish core", "add": [{"course_code": "INFO 5101"}, {"course_code": "CSYE 7374"}]},
+        {"name": "drop option", "drop": ["DAMG 6210"]},
+    ], COURSE_CREDITS, GRAPH)
+
+    assert [result["scenario"] for result in results] == ["current", "finish core", "drop option"]
+
+    current = progress(results[0])
+    assert current["CORE"]["credits"] == 4 and not current["CORE"]["satisfied"]
+    assert current["CORE_OPTIONS"]["satisfied"]
+    assert results[0]["total_credits"] == 8
+    assert results[0]["remaining_credits"] == 24
+
+    finish_core = progress(results[1])
+    assert finish_core["CORE"]["satisfied"]
+    assert finish_core["CORE"]["courses"] == ["INFO 5100", "INFO 5101"]
+    assert finish_core["ELECTIVES"]["credits"] == 2  # Catalog credits for CSYE 7374
+    assert results[1]["total_credits"] == 14
+
+    assert not progress(results[2])["CORE_OPTIONS"]["satisfied"]
+    assert results[2]["total_credits"] == 4
+
+
+def test_prerequisites_of_added_courses_use_the_real_transcript():
+    """Courses added in the same scenario do not satisfy each other's prerequisites."""
+    results = evaluate_scenarios(PROGRAM, TRANSCRIPT, [
+        {"add": [{"course_code": "INFO 5101"}, {"course_code": "INFO 7390"}]},
+    ], COURSE_CREDITS, GRAPH)
+    assert results[0]["scenario"] == "0"
+    assert results[0]["prerequisite_issues"] == {"INFO 7390": ["INFO 5101"]}
+
+    taken = TRANSCRIPT + [{"course_code": "INFO 5101", "credits": 4, "grade": "B+"}]
+    results = evaluate_scenarios(PROGRAM, taken, [{"add": [{"course_code": "INFO 7390"}]}], COURSE_CREDITS, GRAPH)
+    assert results[0]["prerequisite_issues"] == {}
+
+
+def test_identical_scenarios_share_one_evaluation():
+    scenario = {"add": [{"course_code": "INFO 7390", "grade": "A"}], "drop": ["DAMG 6210"]}
+    results = evaluate_scenarios(PROGRAM, TRANSCRIPT, [dict(scenario, name=str(i)) for i in range(300)], COURSE_CREDITS)
+
+    assert len(results) == 300
+    assert results[0]["requirements"] is results[-1]["requirements"]
+    assert results[-1]["scenario"] == "299"
+
+
+def test_added_course_replaces_a_failed_attempt():
+    """Retaking a failed course counts the new grade, once."""
+    transcript = TRANSCRIPT + [{"course_code": "INFO 5101", "credits": 4, "grade": "F"}]
+    results = evaluate_scenarios(PROGRAM, transcript, [
+        {"add": [{"course_code": "INFO 5101", "grade": "A"}]},
+    ], COURSE_CREDITS, GRAPH)
+
+    core = progress(results[0])["CORE"]
+    assert core["satisfied"] and core["credits"] == 8
+    assert results[0]["total_credits"] == 12
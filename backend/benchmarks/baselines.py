@@ -0,0 +1,46 @@
+import re
+from typing import Dict, List, Tuple
+
+# The transcript parse transcript_router used before parse_transcript_rows: table rows joined
+# into comma-separated text, then matched with regexes. Kept so the benchmarks can compare.
+
+
+def table_text(rows: List[List[str]]) -> str:
+    """The comma-joined text the regex parser reads."""
+    return "".join(",".join(cell.strip() for cell in row) + "\n" for row in rows)
+
+
+def extract_user_profile_and_courses(data: str) -> Tuple[Dict, List[Dict]]:
+    college_pattern = re.compile(r"College:\s*,(.*)")
+    program_pattern = re.compile(r"Major and Department:\s*,(.*)")
+    overall_gpa_pattern = re.compile(r"Overall:.*?,.*?,.*?,.*?,.*?,.*?,.*?,([\d.]+)")
+
+    college_match = re.search(college_pattern, data)
+    program_match = re.search(program_pattern, data)
+    gpa_match = re.search(overall_gpa_pattern, data)
+
+    college = college_match.group(1).strip() if college_match else "Not Found"
+    program = program_match.group(1).strip() if program_match else "Not Found"
+    gpa = float(gpa_match.group(1)) if gpa_match else None
+
+    user_profile = {
+        "college": college,
+        "program_id": program,
+        "gpa": gpa if gpa else "Not Found",
+    }
+
+    course_pattern = re.compile(
+        r"(\w+)\s*,(\d+)\s*,(GR|UG)\s*,([\w\s&\/\-]+)(?:,([A-F][+-]?|S|N/A))?,([\d.]+)?,?"
+    )
+    completed_courses = []
+
+    for match in course_pattern.finditer(data):
+        subject, course, level, title, grade, credits = match.groups()
+        completed_courses.append({
+            "course_code": f"{subject} {course}",
+            "course_name": title.strip(),
+            "grade": grade if grade else "IP (In Progress)",
+            "credits": float(credits) if credits else 0.0,
+        })
+
+    return user_profile, completed_courses
@@ -0,0 +1,165 @@
+import random
+from typing import Any, Dict, List, Tuple
+from neu_sa.utils.eligibility_kernel import ProgramRequirements, build_program_requirements
+
+# Synthetic inputs for the benchmarks. Everything is seeded, so runs are comparable.
+
+SUBJECTS = ("INFO", "CSYE", "DAMG", "TELE", "ENCP")
+GRADES = ("A", "A-", "B+", "B", "B-", "C+", "C", "F", "IP (In Progress)")
+MIN_GRADES = ("C-", "C", "B-", "B")
+TITLE_WORDS = ("Data", "Systems", "Engineering", "Design", "Cloud", "Networks", "Applied", "Security", "Analytics")
+
+
+def course_codes(count: int, seed: int = 0) -> List[str]:
+    """Distinct course codes such as 'INFO 5100'."""
+    rnd = random.Random(seed)
+    codes = set()
+    while len(codes) < count:
+        codes.add(f"{rnd.choice(SUBJECTS)} {rnd.randint(5000, 7999)}")
+    return sorted(codes)
+
+
+def prerequisite_text(codes: List[str], rnd: random.Random, terms: int = 3) -> str:
+    """Catalog-style prerequisite text with ORs, ';' conjunctions and minimum grades."""
+    parts = []
+    for _ in range(terms):
+        options = [
+            f"{code} with a minimum grade of {rnd.choice(MIN_GRADES)}" for code in rnd.sample(codes, 2)
+        ]
+        parts.append(f"({' or '.join(options)} )")
+    return "; ".join(parts)
+
+
+def make_program(core: int = 40, core_options: int = 40, seed: int = 0) -> Tuple[ProgramRequirements, List[str]]:
+    """A program definition far larger than real ones, plus the pool of course codes it draws on."""
+    rnd = random.Random(seed)
+    codes = course_codes(core + core_options + 200, seed)
+    core_codes, option_codes = codes[:core], codes[core:core + core_options]
+
+    def courses(selected):
+        return [
+            {
+                "course_code": code,
+                "credits": rnd.choice((2, 4)),
+                "prerequisites": prerequisite_text(codes, rnd) if rnd.random() < 0.5 else None,
+            }
+            for code in selected
+        ]
+
+    program = build_program_requirements(
+        {
+            "program_id": "MP_BENCHMARK",
+            "core_credit_req": core * 3,
+            "core_options_credit_req": core_options,
+            "elective_credit_req": 32,
+            "elective_exceptions": rnd.sample(codes, 10),
+            "max_credit_hours": 400,
+        },
+        core_courses=courses(core_codes),
+        core_option_courses=courses(option_codes),
+        subject_areas={"INFO": 16, "CSYE": 8},
+        elective_subjects=set(SUBJECTS[:4]),
+    )
+    return program, codes
+
+
+def make_transcript(codes: List[str], size: int = 200, seed: int = 0) -> List[Dict[str, Any]]:
+    """Transcript course dicts (course_code, credits, grade), including retakes."""
+    rnd = random.Random(seed)
+    return [
+        {"course_code": rnd.choice(codes), "credits": float(rnd.choice((0, 2, 4))), "grade": rnd.choice(GRADES)}
+        for _ in range(size)
+    ]
+
+
+def transcript_rows(size: int = 400, seed: int = 0) -> List[List[str]]:
+    """Table rows (cells) as Textract returns them for a transcript: header, profile and course rows."""
+    rnd = random.Random(seed)
+    rows = [
+        ["College:", "College of Engineering"],
+        ["Major and Department:", "Information Systems, MSIS"],
+    ]
+    for code in course_codes(size, seed):
+        subject, number = code.split()
+        title = " ".join(rnd.sample(TITLE_WORDS, 3))
+        if rnd.random() < 0.1:
+            rows.append([subject, number, "GR", title, "", ""])  # In progress: no grade or credits yet
+        else:
+            rows.append([subject, number, "GR", title, rnd.choice(("A", "A-", "B+", "B", "C", "S")), "4.000"])
+    rows.append(["Overall:", "", "", "", "", "", "", "3.750"])
+    return rows
+
+
+def transcript_text(rows: List[List[str]]) -> str:
+    """The comma-joined text transcript_router.table_text builds from table rows."""
+    return "".join(",".join(cell.strip() for cell in row) + "\n" for row in rows)
+
+
+def make_textract_blocks(rows: List[List[str]]) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    A Textract TABLE block and the blocks map (TABLE -> CELL -> WORD) that reproduces `rows`.
+
+    :return: (table block, blocks map by Id)
+    """
+    blocks_map = {}
+    cell_ids = []
+    next_id = iter(range(1, 10 ** 9))
+    for row_index, row in enumerate(rows, start=1):
+        for col_index, value in enumerate(row, start=1):
+            word_ids = []
+            for word in value.split():
+                word_id = f"word-{next(next_id)}"
+                blocks_map[word_id] = {"Id": word_id, "BlockType": "WORD", "Text": word}
+                word_ids.append(word_id)
+            cell_id = f"cell-{next(next_id)}"
+            cell = {"Id": cell_id, "BlockType": "CELL", "RowIndex": row_index, "ColumnIndex": col_index}
+            if word_ids:
+                cell["Relationships"] = [{"Type": "CHILD", "Ids": word_ids}]
+            blocks_map[cell_id] = cell
+            cell_ids.append(cell_id)
+    table = {"Id": "table-1", "BlockType": "TABLE", "Relationships": [{"Type": "CHILD", "Ids": cell_ids}]}
+    blocks_map[table["Id"]] = table
+    return table, blocks_map
+
+
+def _pdf_string(text: str) -> str:
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def make_transcript_pdf(rows: List[List[str]], rows_per_page: int = 60) -> bytes:
+    """
+    A digital (text layer) transcript PDF laying `rows` out as table columns, the way the
+    registrar's export does. Cells are placed individually so each row reads as one line.
+    """
+    columns = (40, 80, 120, 150, 400, 450, 500, 550)
+    pages = [rows[start:start + rows_per_page] for start in range(0, len(rows), rows_per_page)] or [[]]
+    font_id = 3 + 2 * len(pages)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            " ".join(f"{3 + 2 * index} 0 R" for index in range(len(pages))).encode(), len(pages)),
+    ]
+    for index, page_rows in enumerate(pages):
+        ops = ["BT", "/F1 8 Tf"]
+        for line, row in enumerate(page_rows):
+            y = 750 - 12 * line
+            ops.extend(f"1 0 0 1 {x} {y} Tm {_pdf_string(cell)} Tj" for x, cell in zip(columns, row) if cell)
+        ops.append("ET")
+        content = "\n".join(ops).encode("latin-1")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (4 + 2 * index, font_id)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
@@ -0,0 +1,180 @@
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timezone
+
+# Allow `python benchmarks/run_benchmarks.py` as well as `python -m benchmarks.run_benchmarks`
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.baselines import extract_user_profile_and_courses  # Import after updating sys.path
+from benchmarks.generators import (
+    make_program,
+    make_textract_blocks,
+    make_transcript,
+    make_transcript_pdf,
+    transcript_rows,
+    transcript_text,
+)
+from neu_sa.utils.eligibility_kernel import compute_eligibility, consolidate_requirements, index_transcript
+from neu_sa.utils.recalculate_eligibility import check_prerequisites, parse_prerequisites
+from neu_sa.utils.pdf_transcript import parse_transcript_pdf
+from neu_sa.utils.textract_tables import TableAssembler
+from neu_sa.utils.transcript_parser import parse_transcript_rows
+
+# Where results are recorded, and how much slower than the baseline counts as a regression
+BENCHMARK_HISTORY_PATH = os.getenv(
+    "BENCHMARK_HISTORY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.json")
+)
+BENCHMARK_REGRESSION_THRESHOLD = float(os.getenv("BENCHMARK_REGRESSION_THRESHOLD", "0.25"))
+
+# Number of recent runs on the same machine the baseline is taken from
+BASELINE_RUNS = 5
+
+
+def build_benchmarks():
+    """Name -> zero-argument callable. Inputs are generated once, outside the timed code."""
+    program, codes = make_program()
+    transcript = make_transcript(codes)
+    indexed = index_transcript(transcript)
+
+    prerequisite_texts = [course.prerequisites for course in program.core_courses if course.prerequisites]
+    parsed_prerequisites = [parse_prerequisites(text) for text in prerequisite_texts]
+
+    rows = transcript_rows()
+    text = transcript_text(rows)
+    _, blocks_map = make_textract_blocks(rows)
+    blocks = list(blocks_map.values())
+    pdf = make_transcript_pdf(transcript_rows(size=40))
+
+    elective_courses = [course["course_code"] for course in transcript]
+
+    return {
+        "eligibility_rules": lambda: compute_eligibility(program, indexed),
+        "index_transcript": lambda: index_transcript(transcript),
+        "parse_prerequisites": lambda: [parse_prerequisites(text) for text in prerequisite_texts],
+        "check_prerequisites": lambda: [check_prerequisites(transcript, prerequisites) for prerequisites in parsed_prerequisites],
+        # Regex parse of the comma-joined rows (previous approach) against the row parser
+        "extract_user_profile_and_courses": lambda: extract_user_profile_and_courses(text),
+        "parse_transcript_rows": lambda: parse_transcript_rows(rows),
+        "textract_table_assembler": lambda: assemble_table_rows(blocks),
+        "parse_transcript_pdf": lambda: parse_transcript_pdf(io.BytesIO(pdf)),
+        "consolidate_requirements": lambda: consolidate_requirements(
+            24, 32, elective_courses, "elective", electives=["CSYE", "DAMG", "INFO"], exceptions=codes[:10]
+        ),
+    }
+
+
+def assemble_table_rows(blocks, page_size=1000):
+    """Table rows from blocks delivered in Textract-sized result pages."""
+    assembler = TableAssembler()
+    for start in range(0, len(blocks), page_size):
+        assembler.add(blocks[start:start + page_size])
+    return assembler.rows()
+
+
+def measure(func, repeat: int) -> float:
+    """Best seconds per call over `repeat` samples, each at least ~0.2s long."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def machine_id() -> str:
+    # Results are only comparable on the same hardware and interpreter
+    return f"{platform.node()}|{platform.machine()}|{platform.python_implementation()} {platform.python_version()}"
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path: str):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_history(path: str, history):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def baseline(history, machine: str, runs: int = BASELINE_RUNS):
+    """Per-benchmark median of the last `runs` recorded runs from this machine."""
+    samples = {}
+    for run in [run for run in history if run["machine"] == machine][-runs:]:
+        for name, seconds in run["results"].items():
+            samples.setdefault(name, []).append(seconds)
+    return {name: statistics.median(values) for name, values in samples.items()}
+
+
+def find_regressions(results, reference, threshold: float):
+    """(name, baseline seconds, current seconds, ratio) for benchmarks slower than baseline * (1 + threshold)."""
+    regressions = []
+    for name, seconds in results.items():
+        previous = reference.get(name)
+        if previous and seconds > previous * (1 + threshold):
+            regressions.append((name, previous, seconds, seconds / previous))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the backend microbenchmarks and check for regressions.")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this text.")
+    parser.add_argument("--repeat", type=int, default=5, help="Samples per benchmark (the best is kept).")
+    parser.add_argument("--threshold", type=float, default=BENCHMARK_REGRESSION_THRESHOLD,
+                        help="Allowed slowdown against the baseline, e.g. 0.25 for 25%%.")
+    parser.add_argument("--history", default=BENCHMARK_HISTORY_PATH, help="JSON file the results are recorded in.")
+    parser.add_argument("--no-record", action="store_true", help="Compare only; do not append this run to the history.")
+    args = parser.parse_args()
+
+    benchmarks = build_benchmarks()
+    if args.filter:
+        benchmarks = {name: func for name, func in benchmarks.items() if args.filter in name}
+
+    history = load_history(args.history)
+    machine = machine_id()
+    reference = baseline(history, machine)
+
+    results = {}
+    for name, func in benchmarks.items():
+        results[name] = measure(func, args.repeat)
+        previous = reference.get(name)
+        change = f"{(results[name] / previous - 1) * 100:+.1f}%" if previous else "new"
+        print(f"{name:<36} {results[name] * 1e6:>12.1f} us  ({change})")
+
+    regressions = find_regressions(results, reference, args.threshold)
+    if not args.no_record:
+        history.append({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "machine": machine,
+            "results": results,
+            "regressions": [name for name, *_ in regressions],
+        })
+        save_history(args.history, history)
+
+    if regressions:
+        for name, previous, seconds, ratio in regressions:
+            print(f"REGRESSION {name}: {previous * 1e6:.1f} us -> {seconds * 1e6:.1f} us ({ratio:.2f}x)")
+        sys.exit(1)
+    print("No regressions beyond the threshold.")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import AIMessage
 from neu_sa.agents.state import AgentState
+from neu_sa.utils.advising_context import advising_context_json
 
 load_dotenv()
 
@@ -29,7 +30,10 @@ class ResponseConstructionAgent:
                 "       - For general queries (e.g., 'How to enroll in a course'), provide step-by-step guidance or refer to appropriate resources.\n"
                 "\n"
                 "2. **Course Eligibility Validation:**\n"
-                "   - Use 'SQL Query Results' and 'user_course_details' to determine eligibility for courses:\n"
+                "   - When 'Advising Context' is given, it is computed by the eligibility engine: use its per-requirement credits, "
+                "'remaining_requirements', 'eligible_now' (program courses whose prerequisites are met) and 'blocked' (with missing prerequisites) "
+                "as they are. Do not recompute credits.\n"
+                "   - Otherwise use 'SQL Query Results' and 'user_course_details' to determine eligibility for courses:\n"
                 "       - For each course in 'SQL Query Results', extract the prerequisites, check for exceptions, If so, ensure its credits do not count towards graduation requirements and clearly state that it is excluded from the program's credit requirements.\n"
                 "       - Compare prerequisites against 'user_course_details', specifically completed courses and grades.\n"
                 "       - Check whether the course is already completed, in progress, or not started.\n"
@@ -58,6 +62,10 @@ class ResponseConstructionAgent:
                 "6. **Actionable Recommendations:**\n"
                 "   - For courses where prerequisites are not satisfied, suggest completing the prerequisite courses first.\n"
                 "   - Highlight courses with no prerequisites or courses that fit into remaining program requirements as options the user can enroll in immediately.\n"
+                "   - For questions about what to take next or how to graduate, present the 'Graduation Plans' as given: they were computed from the "
+                "program requirements, prerequisites, class offerings and credit limits. Do not recompute credit totals or invent other plans. "
+                "Mention when a term is projected (its offerings are assumed from the same term a year earlier). If no plans are given, say that no "
+                "plan could be computed from the published class schedule.\n"
                 "\n"
                 "7. **Clarity and Relevance:**\n"
                 "   - Focus only on information relevant to the user's query.\n"
@@ -80,7 +88,9 @@ class ResponseConstructionAgent:
                 "  - Program Name: {user_program_name}\n"
                 "  - Campus: {user_campus}\n"
                 "  - College: {user_college}\n\n"
-                "User Course Details: {user_course_details}\n\n (Has details about user enrolled program with all core courses(even if not completed),core option,elective,subject area)"
+                "Advising Context (precomputed credits per requirement, remaining requirements, courses eligible now): {advising_context}\n\n"
+                "User Course Details: {user_course_details}\n\n (Has details about user enrolled program with all core courses(even if not completed),core option,elective,subject area. Empty when the Advising Context is given)\n\n"
+                "Graduation Plans (computed, ranked best first): {graduation_plans}\n\n"
                 "Course Description Results: {course_description_results}\n\n"
                 "Construct a response based on all available information and which is relavent to user query. Use 'General Information Results' for general queries, "
                 "When a question on a specific program/core/elective other than the users program is asked check sql query and result. if sql result is empty then answer accordingly (mostly no for specified filter from sql query) "
@@ -102,6 +112,7 @@ class ResponseConstructionAgent:
         user_program_name = user_details.get("program_name", "N/A")
         user_campus = user_details.get("campus", "N/A")
         user_college = user_details.get("college", "N/A")
+        advising_context = state.get("advising_context")
 
         chat_history = "\n".join(
             f"{msg['role'].capitalize()}: {msg['content']}" for msg in state["chat_history"]
@@ -121,8 +132,10 @@ class ResponseConstructionAgent:
                 sql_query=state.get("sql_query", {}),
                 sql_results=state.get("sql_results", {}),
                 general_information_results=state.get("general_information_results", {}),
+                advising_context=advising_context_json(advising_context) if advising_context else "N/A",
                 user_course_details=state.get("user_course_details", []),
-                course_description_results=state.get("course_description_results",[])
+                course_description_results=state.get("course_description_results",[]),
+                graduation_plans=state.get("graduation_plans", [])
             )
         )
 
@@ -4,6 +4,8 @@ from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from neu_sa.agents.state import AgentState, create_agent_state
+from neu_sa.utils.program_catalog import program_catalog, describe_program
+from neu_sa.utils.advising_context import advising_context_json
 from enum import Enum
 from typing import Any, Tuple
 
@@ -74,6 +76,7 @@ class SQLAgent:
                 "Relevant Course Codes: {course_codes}\n\n"
                 "Relevant Course Codes are obtained after semantic match with course description.\n"
                 "User Program name: {user_program_name}\n"
+                "User Program Requirements: {user_program_requirements}\n"
                 "User Campus: {user_campus}\n"
                 "User Credits Left: {user_credits_left}\n\n"
                 "User Course Profile (to know about user's course background):\n{user_course_profile}\n\n"
@@ -151,13 +154,14 @@ class SQLAgent:
             cursor.close()
 
 
-    def generate_query(self, user_query: str, schema: str, course_codes: list, user_program_name: str, user_campus: str, user_credits_left: str,chat_history:str, user_course_profile: list) -> str:
+    def generate_query(self, user_query: str, schema: str, course_codes: list, user_program_name: str, user_campus: str, user_credits_left: str,chat_history:str, user_course_profile: list, user_program_requirements: str = "N/A") -> str:
         user_course_profile = user_course_profile or []
         response = self.llm.invoke(self.prompt.format(
             query=user_query,
             schema=schema,
             course_codes=", ".join(course_codes),
             user_program_name=user_program_name,
+            user_program_requirements=user_program_requirements,
             user_campus=user_campus,
             user_credits_left=user_credits_left,
             chat_history=chat_history,
@@ -238,7 +242,12 @@ class SQLAgent:
         user_credits_left = user_details.get("credits_left", "N/A")
         user_program_name = user_details.get("program_name", "N/A")
         user_campus = user_details.get("campus", "N/A")
-        user_course_profile=state.get("user_course_details", [])
+        advising_context = state.get("advising_context")
+        user_course_profile = advising_context_json(advising_context) if advising_context else state.get("user_course_details", [])
+
+        # Program requirements are served from the shared in-memory catalog
+        program = program_catalog.programs().get(user_details.get("program_id"))
+        user_program_requirements = describe_program(program) if program else "N/A"
 
         chat_history = "\n".join(
             f"{msg['role'].capitalize()}: {msg['content']}" for msg in state["chat_history"]
@@ -249,7 +258,7 @@ class SQLAgent:
         if state.get("course_description_results"):
             course_codes = [result["course_code"] for result in state["course_description_results"] if result["course_code"] != "Unknown"]
         
-        generated_query = self.generate_query(state["query"], schema, course_codes,user_program_name,user_campus,user_credits_left,chat_history,user_course_profile)
+        generated_query = self.generate_query(state["query"], schema, course_codes,user_program_name,user_campus,user_credits_left,chat_history,user_course_profile,user_program_requirements)
 
         if not generated_query:
             state["sql_results"] = {"error": "No valid query generated to execute."}
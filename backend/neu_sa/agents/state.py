@@ -21,6 +21,8 @@ class AgentState(TypedDict):
     course_prerequisites: List[Dict[str, Any]]
     user_details: Optional[Dict[str, Any]]
     user_course_details: List[Dict[str, Any]]
+    advising_context: Optional[Dict[str, Any]]
+    graduation_plans: List[Dict[str, Any]]
     chat_history: List[Dict[str, str]]
 
 def create_agent_state(query: str, user_id: int, chat_history: Optional[List[Dict[str, str]]] = None) -> AgentState:
@@ -42,5 +44,7 @@ def create_agent_state(query: str, user_id: int, chat_history: Optional[List[Dic
         visited_nodes=[],
         user_details=None,
         user_course_details=[],
+        advising_context=None,
+        graduation_plans=[],
         chat_history=chat_history if chat_history else []
     )
@@ -2,6 +2,10 @@ import os
 import snowflake.connector
 from dotenv import load_dotenv
 from neu_sa.agents.state import AgentState, create_agent_state
+from neu_sa.utils.program_catalog import program_catalog
+from neu_sa.utils.advising_context import build_advising_context
+from neu_sa.utils.graduation_planner import fetch_class_offerings, plan_graduation, plans_to_dicts
+from neu_sa.utils.user_context import UserContext, user_context_cache
 
 load_dotenv()
 
@@ -33,61 +37,73 @@ class UserCourseAgent:
         finally:
             cursor.close()
 
-    def get_user_details(self, user_id):
-        query = """
-        SELECT 
-            UP.USER_ID,
-            UP.USERNAME,
-            UP.GPA,
-            UP.COMPLETED_CREDITS,
-            PR.MAX_CREDIT_HOURS - UP.COMPLETED_CREDITS AS CREDITS_LEFT,
-            UP.PROGRAM_NAME,
-            UP.CAMPUS,
-            UP.COLLEGE,
-            UP.PROGRAM_ID
-        FROM 
-            USER_PROFILE UP
-        INNER JOIN 
-            PROGRAM_REQUIREMENTS PR
-        ON 
-            UP.PROGRAM_ID = PR.PROGRAM_ID
-        WHERE 
-            UP.USER_ID = %s
-        """
-        return self.db_query(query, (user_id,))
+    def get_user_context(self, user_id):
+        """Profile, courses and eligibility rows from the context cache shared with the REST endpoints."""
+        return user_context_cache.get(user_id)
 
-    def get_user_eligibility(self, user_id):
-        query = """
-        SELECT COURSE_OR_REQUIREMENT, DETAILS 
-        FROM USER_ELIGIBILITY
-        WHERE user_id = %s
-        """
-        return self.db_query(query, (user_id,))
+    def get_graduation_plans(self, context, program_id, campus):
+        """Term-by-term plans computed by the graduation planner (empty if none can be found)."""
+        program = program_catalog.programs().get(program_id)
+        if program is None:
+            return []
+        plans = plan_graduation(
+            program,
+            context.completed_courses,
+            fetch_class_offerings(self.conn, campus),
+            program_catalog.course_credits(),
+            program_catalog.prerequisite_graph(),
+        )
+        return plans_to_dicts(plans)
 
     def process(self, state: AgentState) -> AgentState:
         user_id = state["user_id"]
         
-        # Fetch user details and eligibility
-        user_details = self.get_user_details(user_id)
-        eligibility_details = self.get_user_eligibility(user_id)
+        # Profile, courses and eligibility come from one cached read
+        try:
+            context = self.get_user_context(user_id)
+        except Exception as e:
+            print(f"Failed to load user context for user_id {user_id}: {e}")
+            context = UserContext(user_id, 0, None, [], [])
+        profile = context.profile
 
-        # Assuming one user record; store details as a dictionary in state
-        if user_details and isinstance(user_details, list) and len(user_details) > 0:
-            user_details = user_details[0]  # Fetch first result
+        program = program_catalog.programs().get(profile["program_id"]) if profile else None
+        if profile:
+            # Program limits come from the shared in-memory catalog instead of a join
+            completed_credits = profile["completed_credits"] or 0
             state["user_details"] = {
-                "user_id": user_details[0],
-                "username": user_details[1],
-                "gpa": user_details[2],
-                "completed_credits": user_details[3],
-                "credits_left": user_details[4],
-                "program_name": user_details[5],
-                "campus": user_details[6],
-                "college": user_details[7],
-                "program_id": user_details[8],
+                "user_id": user_id,
+                "username": profile["username"],
+                "gpa": profile["gpa"],
+                "completed_credits": profile["completed_credits"],
+                "credits_left": program.max_credit_hours - completed_credits if program else None,
+                "program_name": profile["program_name"],
+                "campus": profile["campus"],
+                "college": profile["college"],
+                "program_id": profile["program_id"],
             }
 
-        # Store eligibility details in state
-        state["user_course_details"] = eligibility_details
+        # Pre-summarized credits, remaining requirements and eligible courses. Written with the
+        # eligibility rows; built in memory when missing (e.g. after a bulk recalculation)
+        advising_context = context.advising
+        if advising_context is None and program is not None:
+            advising_context = build_advising_context(
+                program, context.completed_courses, program_catalog.prerequisite_graph()
+            )
+        state["advising_context"] = advising_context
+
+        # Raw eligibility rows are only needed when there is no advising context
+        if advising_context is None:
+            state["user_course_details"] = [(row["course_or_requirement"], row["details"]) for row in context.eligibility]
+
+        # Plans are computed here rather than left to the response model
+        if state.get("user_details"):
+            try:
+                state["graduation_plans"] = self.get_graduation_plans(
+                    context, state["user_details"]["program_id"], state["user_details"]["campus"]
+                )
+            except Exception as e:
+                print(f"Graduation planning failed for user_id {user_id}: {e}")
+                state["graduation_plans"] = []
 
         state["visited_nodes"].append("user_course_agent")
         state["messages"].append({
@@ -1,8 +1,14 @@
 from fastapi import FastAPI
 from neu_sa.routers.auth import auth_router
 from neu_sa.routers.user_router import user_router
-from neu_sa.routers.transcript_router import transcript_router
+from neu_sa.routers.transcript_router import transcript_router, transcript_jobs
 from neu_sa.routers.task_router import task_router
+from neu_sa.utils.executor import shutdown_executors
+from neu_sa.utils.program_catalog import program_catalog
+from neu_sa.utils.eligibility_queue import eligibility_queue
+from neu_sa.utils.user_context import user_context_cache
+from neu_sa.utils.transcript_cache import transcript_parse_cache
+from neu_sa.utils.presigned_urls import presigned_url_cache
 from dotenv import load_dotenv
 import os
 import uvicorn
@@ -19,11 +25,43 @@ app.include_router(user_router, prefix="/user", tags=["user"])
 app.include_router(transcript_router, prefix="/transcripts", tags=["Transcript Processing"])
 app.include_router(task_router, prefix="/chat", tags=["Task Detection and Query"])
 
+@app.on_event("startup")
+def startup_event():
+    # Warm the program catalog so the first eligibility run does not pay for it
+    try:
+        program_catalog.load()
+    except Exception as e:
+        print(f"Error loading program catalog: {e}")
+    # Resume queued eligibility jobs (including ones interrupted by a restart)
+    eligibility_queue.start()
+    # Poll transcript analysis jobs off the request path
+    transcript_jobs.start()
+
+# Stop the eligibility and transcript workers and release the blocking-call executors when the server stops
+@app.on_event("shutdown")
+def shutdown_event():
+    eligibility_queue.stop()
+    transcript_jobs.stop()
+    shutdown_executors()
+
 # Root endpoint for health check
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the NEU-SA backend API!"}
 
+# Hit rate and occupancy of the per-user context cache
+@app.get("/metrics/user-context-cache")
+def user_context_cache_metrics():
+    return user_context_cache.stats()
+
+@app.get("/metrics/transcript-cache")
+def transcript_cache_metrics():
+    return transcript_parse_cache.stats()
+
+@app.get("/metrics/presigned-url-cache")
+def presigned_url_cache_metrics():
+    return presigned_url_cache.stats()
+
 def main():
     """Run the uvicorn server."""
     port = int(os.getenv("PORT", "8000"))
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 import os
 import re
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from neu_sa.utils.executor import run_blocking
 
 # Initialize router
 auth_router = APIRouter()
@@ -130,6 +131,37 @@ def validate_password(password: str):
         return "Password must contain at least one special character."
     return None
 
+# Insert a new user profile (blocking, run on the Snowflake executor)
+def insert_user_profile(user: RegisterModel, hashed_password: str, program_id: str):
+    conn = get_snowflake_connection()
+    cursor = conn.cursor()
+    try:
+        # Check if username already exists
+        cursor.execute("SELECT COUNT(*) FROM USER_PROFILE WHERE USERNAME = %s", (user.username,))
+        if cursor.fetchone()[0] > 0:
+            raise HTTPException(status_code=400, detail="Username already exists.")
+
+        # Insert user into the database
+        cursor.execute("""
+            INSERT INTO USER_PROFILE (USERNAME, PASSWORD, CAMPUS, PROGRAM_NAME, PROGRAM_ID, COLLEGE)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, (user.username, hashed_password, user.campus, user.program_name, program_id, user.college))
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+# Fetch stored password hash and user ID (blocking, run on the Snowflake executor)
+def fetch_user_credentials(username: str):
+    conn = get_snowflake_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT PASSWORD, USER_ID FROM USER_PROFILE WHERE USERNAME = %s", (username,))
+        return cursor.fetchone()
+    finally:
+        cursor.close()
+        conn.close()
+
 # Registration endpoint
 @auth_router.post("/register")
 async def register_user(user: RegisterModel):
@@ -153,63 +185,40 @@ async def register_user(user: RegisterModel):
     if password_error:
         raise HTTPException(status_code=400, detail=password_error)
 
-    conn = get_snowflake_connection()
-    cursor = conn.cursor()
-    try:
-        # Check if username already exists
-        cursor.execute("SELECT COUNT(*) FROM USER_PROFILE WHERE USERNAME = %s", (user.username,))
-        if cursor.fetchone()[0] > 0:
-            raise HTTPException(status_code=400, detail="Username already exists.")
-
-        # Hash password
-        hashed_password = ph.hash(user.password)
+    # Hash password off the event loop
+    hashed_password = await run_blocking("argon2", ph.hash, user.password)
 
-        # Insert user into the database
-        cursor.execute("""
-            INSERT INTO USER_PROFILE (USERNAME, PASSWORD, CAMPUS, PROGRAM_NAME, PROGRAM_ID, COLLEGE)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """, (user.username, hashed_password, user.campus, user.program_name, program_id, user.college))
-        conn.commit()
-        return {"message": "Registration successful"}
-    finally:
-        cursor.close()
-        conn.close()
+    await run_blocking("snowflake", insert_user_profile, user, hashed_password, program_id)
+    return {"message": "Registration successful"}
 
 # Login endpoint
 @auth_router.post("/login")
 async def login_user(user: LoginModel):
-    conn = get_snowflake_connection()
-    cursor = conn.cursor()
+    result = await run_blocking("snowflake", fetch_user_credentials, user.username)
+    if not result:
+        raise HTTPException(status_code=404, detail="User not found.")
+
+    hashed_password, user_id = result
+
     try:
-        cursor.execute("SELECT PASSWORD, USER_ID FROM USER_PROFILE WHERE USERNAME = %s", (user.username,))
-        result = cursor.fetchone()
-        if not result:
-            raise HTTPException(status_code=404, detail="User not found.")
-
-        hashed_password, user_id = result
-
-        try:
-            ph.verify(hashed_password, user.password)
-        except VerifyMismatchError:
-            raise HTTPException(status_code=401, detail="Incorrect password.")
-
-        token_data = {
-            "sub": user.username,
-            "user_id": user_id,
-            "exp": datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
-        }
-        access_token = jwt.encode(token_data, SECRET_KEY, algorithm=ALGORITHM)
-
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-            "user_id": user_id,
-            "username": user.username,
-            "message": "Login successful."
-        }
-    finally:
-        cursor.close()
-        conn.close()
+        await run_blocking("argon2", ph.verify, hashed_password, user.password)
+    except VerifyMismatchError:
+        raise HTTPException(status_code=401, detail="Incorrect password.")
+
+    token_data = {
+        "sub": user.username,
+        "user_id": user_id,
+        "exp": datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+    }
+    access_token = jwt.encode(token_data, SECRET_KEY, algorithm=ALGORITHM)
+
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user_id": user_id,
+        "username": user.username,
+        "message": "Login successful."
+    }
 
 # Token validation endpoint
 @auth_router.post("/validate-token")
@@ -1,14 +1,21 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
-import boto3
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Response
 import os
 from dotenv import load_dotenv
-from PyPDF2 import PdfReader
 from neu_sa.routers.auth import validate_jwt
+from neu_sa.utils.aws_clients import AWS_REGION, get_s3_client, get_textract_client
+from neu_sa.utils.executor import run_blocking
+from neu_sa.utils.pdf_transcript import parse_transcript_document
+from neu_sa.utils.presigned_urls import PRESIGNED_URL_EXPIRY, presigned_url_cache
+from neu_sa.utils.textract_tables import TableAssembler
+from neu_sa.utils.transcript_parser import parse_transcript_rows
+from neu_sa.utils.transcript_upload import InvalidTranscriptFile, StagedUpload, stage_upload
+from neu_sa.utils.transcript_cache import transcript_parse_cache
+from neu_sa.utils.transcript_jobs import FAILED, PENDING, SUCCEEDED, TranscriptJobQueue
+from neu_sa.utils.user_context import user_context_cache
 import snowflake.connector
 import re
-import time
 import pandas as pd
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Optional
 
 # Load environment variables
 load_dotenv()
@@ -18,9 +25,6 @@ transcript_router = APIRouter()
 
 # S3 Configuration
 S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
-AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
-AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
-AWS_REGION = os.getenv("AWS_REGION")
 
 # Snowflake Configuration
 def get_snowflake_connection():
@@ -33,188 +37,130 @@ def get_snowflake_connection():
         schema=os.getenv("SNOWFLAKE_SCHEMA", "NEU_SA"),
     )
 
-# Validate PDF file
-def validate_pdf(file: UploadFile):
-    try:
-        header = file.file.read(5)
-        if header != b'%PDF-':
-            raise HTTPException(status_code=400, detail="Uploaded file is not a valid PDF.")
-
-        file.file.seek(0)  # Reset file pointer
-        pdf_reader = PdfReader(file.file)
-        if len(pdf_reader.pages) > 10:
-            raise HTTPException(status_code=400, detail="PDF must not exceed 10 pages.")
+# S3 key of a user's transcript
+def transcript_key(user_id: int) -> str:
+    return f"transcripts/{user_id}_transcript.pdf"
 
-        file.file.seek(0)  # Reset file pointer for further operations
+# Read the upload once: validate it, hash it and stage it for S3
+def stage_transcript_upload(file: UploadFile, user_id: int) -> StagedUpload:
+    try:
+        return stage_upload(file.file, get_s3_client(), S3_BUCKET_NAME, transcript_key(user_id))
+    except InvalidTranscriptFile as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid PDF file: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to upload file to S3: {str(e)}")
 
-# Upload file to S3
-def upload_to_s3(file: UploadFile, user_id: int):
+# Store a staged upload in S3 and retrieve URLs
+def upload_to_s3(staged: StagedUpload) -> Tuple[str, str]:
     try:
-        s3 = boto3.client(
-            "s3",
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-            region_name=AWS_REGION,
-        )
-
-        file_path = f"transcripts/{user_id}_transcript.pdf"
-        s3.upload_fileobj(file.file, S3_BUCKET_NAME, file_path)
-
-        file_url = f"https://{S3_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com/{file_path}"
-        presigned_url = s3.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": S3_BUCKET_NAME, "Key": file_path},
-            ExpiresIn=3600,
-        )
-        return presigned_url, file_url
+        staged.complete()
+        file_url = f"https://{S3_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com/{staged.key}"
+        return presign_transcript(file_url), file_url
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload file to S3: {str(e)}")
 
-# Helper functions for processing AWS Textract results
-def get_rows_columns_map(table_result, blocks_map):
-    rows = {}
-    for relationship in table_result.get("Relationships", []):
-        if relationship["Type"] == "CHILD":
-            for child_id in relationship["Ids"]:
-                cell = blocks_map[child_id]
-                if cell["BlockType"] == "CELL":
-                    row_index = cell["RowIndex"]
-                    col_index = cell["ColumnIndex"]
-                    if row_index not in rows:
-                        rows[row_index] = {}
-                    rows[row_index][col_index] = get_text(cell, blocks_map)
-    return rows
-
-
-def get_text(result, blocks_map):
-    text = ""
-    if "Relationships" in result:
-        for relationship in result["Relationships"]:
-            if relationship["Type"] == "CHILD":
-                for child_id in relationship["Ids"]:
-                    word = blocks_map[child_id]
-                    if word["BlockType"] == "WORD":
-                        text += word["Text"] + " "
-                    elif word["BlockType"] == "SELECTION_ELEMENT":
-                        if word["SelectionStatus"] == "SELECTED":
-                            text += "X "
-    return text
-
-
-def get_textract_table_text(bucket_name: str, document_name: str, aws_access_key: str, aws_secret_key: str, aws_region: str) -> str:
-    client = boto3.client(
-        "textract",
-        aws_access_key_id=aws_access_key,
-        aws_secret_access_key=aws_secret_key,
-        region_name=aws_region,
+# Presigned URL of a stored transcript
+def presign_transcript(file_url: str, expires_in: int = PRESIGNED_URL_EXPIRY) -> str:
+    bucket_name, file_key = parse_s3_url(file_url)
+    return get_s3_client().generate_presigned_url(
+        "get_object",
+        Params={"Bucket": bucket_name, "Key": file_key},
+        ExpiresIn=expires_in,
     )
 
-    response = client.start_document_analysis(
-        DocumentLocation={"S3Object": {"Bucket": bucket_name, "Name": document_name}},
-        FeatureTypes=["TABLES"],
-    )
+# Split an S3 object URL into bucket and key
+def parse_s3_url(file_url: str) -> Tuple[str, str]:
+    match = re.match(r"https://(.*)\.s3\.(.*?)\.amazonaws\.com/(.*)", file_url)
+    if not match:
+        raise HTTPException(status_code=400, detail="Invalid S3 file URL.")
+    return match.group(1), match.group(3)
 
-    job_id = response["JobId"]
 
-    # Wait for job completion
+# Start an asynchronous Textract table analysis of an uploaded transcript
+def start_transcript_analysis(file_url: str) -> Dict[str, str]:
+    bucket_name, file_key = parse_s3_url(file_url)
+    response = get_textract_client().start_document_analysis(
+        DocumentLocation={"S3Object": {"Bucket": bucket_name, "Name": file_key}},
+        FeatureTypes=["TABLES"],
+    )
+    return {"textract_job_id": response["JobId"]}
+
+
+# Table rows of a finished analysis; None while Textract is still working on it
+def fetch_textract_table_rows(textract_job_id: str) -> Optional[List[List[str]]]:
+    """
+    Follows NextToken through every result page. Each page is indexed into the assembler and
+    dropped before the next one is requested, so memory stays flat on long transcripts.
+    """
+    textract = get_textract_client()
+    assembler = TableAssembler()
+    request = {"JobId": textract_job_id}
     while True:
-        result = client.get_document_analysis(JobId=job_id)
+        result = textract.get_document_analysis(**request)
         status = result["JobStatus"]
-        if status in ["SUCCEEDED", "FAILED"]:
-            if status == "FAILED":
-                raise HTTPException(status_code=500, detail="AWS Textract job failed.")
-            break
-        time.sleep(5)
-
-    blocks = result["Blocks"]
-    blocks_map = {block["Id"]: block for block in blocks}
-    table_blocks = [block for block in blocks if block["BlockType"] == "TABLE"]
-
-    if not table_blocks:
-        raise HTTPException(status_code=400, detail="No tables found in the document.")
-
-    combined_text = ""
-    for table in table_blocks:
-        rows = get_rows_columns_map(table, blocks_map)
-        for row_index, cols in rows.items():
-            combined_text += ",".join(cols[col].strip() for col in sorted(cols)) + "\n"
-
-    return combined_text
-
-
-def extract_user_profile_and_courses(data: str) -> Tuple[Dict, List[Dict]]:
-    college_pattern = re.compile(r"College:\s*,(.*)")
-    program_pattern = re.compile(r"Major and Department:\s*,(.*)")
-    overall_gpa_pattern = re.compile(r"Overall:.*?,.*?,.*?,.*?,.*?,.*?,.*?,([\d.]+)")
-
-    college_match = re.search(college_pattern, data)
-    program_match = re.search(program_pattern, data)
-    gpa_match = re.search(overall_gpa_pattern, data)
-
-    college = college_match.group(1).strip() if college_match else "Not Found"
-    program = program_match.group(1).strip() if program_match else "Not Found"
-    gpa = float(gpa_match.group(1)) if gpa_match else None
-
-    user_profile = {
-        "college": college,
-        "program_id": program,
-        "gpa": gpa if gpa else "Not Found",
+        if status == "IN_PROGRESS":
+            return None
+        if status != "SUCCEEDED":
+            raise RuntimeError(f"AWS Textract job failed: {result.get('StatusMessage', status)}")
+        assembler.add(result["Blocks"])
+        if not result.get("NextToken"):
+            return assembler.rows()
+        request["NextToken"] = result["NextToken"]
+
+
+# Parse the table rows of a transcript into courses and profile details
+def process_transcript(rows: List[List[str]]) -> Tuple[List[Dict], Dict]:
+    # Extract user profile and completed courses
+    parsed = parse_transcript_rows(rows)
+    for error in parsed.errors:
+        print(f"Skipped transcript row {error.row}: {error.error}")
+    courses, additional_details = summarize_transcript(parsed.user_profile, parsed.completed_courses)
+    additional_details["row_errors"] = [error._asdict() for error in parsed.errors]
+    return courses, additional_details
+
+
+def summarize_transcript(user_profile: Dict, completed_courses: List[Dict]) -> Tuple[List[Dict], Dict]:
+    # Compile additional details
+    additional_details = {
+        "courses_detected": len(completed_courses),
+        "user_profile": user_profile,
     }
 
-    course_pattern = re.compile(
-        r"(\w+)\s*,(\d+)\s*,(GR|UG)\s*,([\w\s&\/\-]+)(?:,([A-F][+-]?|S|N/A))?,([\d.]+)?,?"
-    )
-    completed_courses = []
-
-    for match in course_pattern.finditer(data):
-        subject, course, level, title, grade, credits = match.groups()
-        completed_courses.append({
-            "course_code": f"{subject} {course}",
-            "course_name": title.strip(),
-            "grade": grade if grade else "IP (In Progress)",
-            "credits": float(credits) if credits else 0.0,
-        })
+    return completed_courses, additional_details
 
-    return user_profile, completed_courses
 
+# Save the transcript link for the user and build the processed transcript response
+def complete_transcript(user_id: int, file_url: str, presigned_url: str, courses: List[Dict],
+                        additional_details: Dict) -> Dict:
+    save_transcript_link_to_snowflake(user_id, file_url)
+    user_context_cache.invalidate(user_id)
 
-# Updated process_transcript function
-def process_transcript(file_url: str) -> Tuple[List[Dict], Dict]:
-    # Parse the bucket name and file key from the file_url
-    match = re.match(r"https://(.*)\.s3\.(.*?)\.amazonaws\.com/(.*)", file_url)
-    if not match:
-        raise HTTPException(status_code=400, detail="Invalid S3 file URL.")
-
-    bucket_name = match.group(1)
-    aws_region = match.group(2)
-    file_key = match.group(3)
-
-    # Validate AWS credentials
-    aws_access_key = os.getenv("AWS_ACCESS_KEY_ID")
-    aws_secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
-
-    if not all([aws_access_key, aws_secret_key, aws_region]):
-        raise HTTPException(status_code=500, detail="AWS credentials or region are not set.")
+    return {
+        "transcript_presigned_url": presigned_url,
+        "courses": courses,
+        "additional_details": additional_details,
+    }
 
-    try:
-        # Extract table text from AWS Textract
-        table_text = get_textract_table_text(bucket_name, file_key, aws_access_key, aws_secret_key, aws_region)
 
-        # Extract user profile and completed courses
-        user_profile, completed_courses = extract_user_profile_and_courses(table_text)
+# Check a transcript job (runs on the transcript job workers, never on the event loop)
+def process_transcript_job(job) -> Optional[Dict]:
+    """
+    :return: None while Textract is still running; otherwise the parsed transcript, after the
+             transcript link has been saved for the user.
+    """
+    details = job["details"]
+    rows = fetch_textract_table_rows(details["textract_job_id"])
+    if rows is None:
+        return None
 
-        # Compile additional details
-        additional_details = {
-            "courses_detected": len(completed_courses),
-            "user_profile": user_profile,
-        }
+    courses, additional_details = process_transcript(rows)
+    transcript_parse_cache.put(job["user_id"], details["content_hash"], additional_details["user_profile"],
+                               courses, details["file_url"])
+    return complete_transcript(job["user_id"], details["file_url"], details["presigned_url"], courses, additional_details)
 
-        return completed_courses, additional_details
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to process transcript: {str(e)}")
 
+# Shared poller started and stopped with the FastAPI app
+transcript_jobs = TranscriptJobQueue(process_transcript_job)
 
 
 # Save transcript link to Snowflake
@@ -225,7 +171,7 @@ def save_transcript_link_to_snowflake(user_id: int, file_url: str):
         cursor.execute(
             """
             UPDATE USER_PROFILE
-            SET TRANSCRIPT_LINK = %s
+            SET TRANSCRIPT_LINK = %s, VERSION = COALESCE(VERSION, 0) + 1
             WHERE USER_ID = %s
             """,
             (file_url, user_id),
@@ -238,50 +184,31 @@ def save_transcript_link_to_snowflake(user_id: int, file_url: str):
         cursor.close()
         conn.close()
 
+# Look up the stored transcript through the user context cache and reuse its presigned URL
+def fetch_transcript_presigned_url(user_id: int):
+    try:
+        context = user_context_cache.get(user_id)
+        file_url = context.profile.get("transcript_link") if context.profile else None
+        if not file_url:
+            return {"message": "No transcript found for this user."}
+        return {"transcript_presigned_url": presigned_url_cache.get(user_id, file_url, presign_transcript)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch transcript link: {str(e)}")
+
 # Endpoint to fetch transcript link
 @transcript_router.get("/transcript_link/{user_id}")
 async def get_transcript_link(user_id: int, jwt_token: str = Depends(validate_jwt)):
     if jwt_token["user_id"] != user_id:
         raise HTTPException(status_code=403, detail="Unauthorized access.")
 
-    conn = get_snowflake_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            """
-            SELECT TRANSCRIPT_LINK
-            FROM USER_PROFILE
-            WHERE USER_ID = %s
-            """,
-            (user_id,),
-        )
-        result = cursor.fetchone()
-        if result and result[0]:
-            s3 = boto3.client(
-                "s3",
-                aws_access_key_id=AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-                region_name=AWS_REGION,
-            )
-            # Extract the file path from the URL
-            file_key = result[0].replace(f"https://{S3_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com/", "")
-            presigned_url = s3.generate_presigned_url(
-                "get_object",
-                Params={"Bucket": S3_BUCKET_NAME, "Key": file_key},
-                ExpiresIn=3600,
-            )
-            return {"transcript_presigned_url": presigned_url}
-        else:
-            return {"message": "No transcript found for this user."}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail="Failed to fetch transcript link.")
-    finally:
-        cursor.close()
-        conn.close()
+    return await run_blocking("snowflake", fetch_transcript_presigned_url, user_id)
 
-# Endpoint to upload and process transcript
-@transcript_router.post("/upload_transcript")
+# Endpoint to upload a transcript and start processing it
+@transcript_router.post("/upload_transcript", status_code=202)
 async def upload_transcript(
+    response: Response,
     user_id: int = Form(...),
     file: UploadFile = File(...),
     jwt_token: str = Depends(validate_jwt),
@@ -290,23 +217,81 @@ async def upload_transcript(
     if jwt_token["user_id"] != user_id:
         raise HTTPException(status_code=403, detail="Unauthorized access.")
 
-    # Validate PDF structure and size
-    validate_pdf(file)
-
-    # Upload file to S3 and retrieve URLs
-    presigned_url, file_url = upload_to_s3(file, user_id)
-
-    # Process transcript using the S3 file path
-    courses, additional_details = process_transcript(file_url)
+    # Validate PDF structure and size, hash it and start the S3 upload in one pass
+    staged = await run_blocking("aws", stage_transcript_upload, file, user_id)
+    digest = staged.digest
+
+    # Re-uploads and retries of the same file reuse its parse
+    cached = transcript_parse_cache.get(user_id, digest)
+    if cached is not None:
+        parsed = cached.user_profile, cached.completed_courses
+    else:
+        job_id = transcript_jobs.active_job(user_id, content_hash=digest)
+        if job_id is not None:
+            await run_blocking("aws", staged.abort)
+            return {"message": "Transcript is already being processed.", "job_id": job_id, "status": PENDING}
+
+        # Digital transcripts are parsed from their text layer; scans and anything that does
+        # not validate fall back to Textract. The PDF is parsed from the bytes staging already read.
+        parsed = await run_blocking("compute", parse_transcript_document, staged.reader)
+
+    # Upload file to S3 and retrieve URLs, unless these exact bytes are already stored
+    if cached is not None and cached.file_url is not None:
+        await run_blocking("aws", staged.abort)
+        file_url = cached.file_url
+        presigned_url = await run_blocking("aws", presigned_url_cache.get, user_id, file_url, presign_transcript)
+    else:
+        presigned_url, file_url = await run_blocking("aws", upload_to_s3, staged)
+        transcript_parse_cache.stored(user_id, digest, file_url)
+        presigned_url_cache.put(user_id, file_url, presigned_url)
+
+    if parsed is not None:
+        transcript_parse_cache.put(user_id, digest, *parsed, file_url)
+        courses, additional_details = summarize_transcript(*parsed)
+        result = await run_blocking("snowflake", complete_transcript, user_id, file_url, presigned_url,
+                                    courses, additional_details)
+        job_id = transcript_jobs.complete(user_id, result)
+        response.status_code = 200
+        return {
+            "message": "Transcript processed successfully.",
+            "job_id": job_id,
+            "status": SUCCEEDED,
+            **result,
+        }
 
-    # Save the transcript link to Snowflake for the user
-    save_transcript_link_to_snowflake(user_id, file_url)
+    # Start Textract; the job workers poll it, so the request returns right away
+    try:
+        analysis = await run_blocking("aws", start_transcript_analysis, file_url)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to start transcript processing: {str(e)}")
+    job_id = transcript_jobs.submit(user_id, file_url=file_url, presigned_url=presigned_url, content_hash=digest,
+                                    **analysis)
 
-    # Return response
     return {
-        "message": "Transcript processed successfully.",
+        "message": "Transcript uploaded. Processing has started.",
+        "job_id": job_id,
+        "status": PENDING,
         "transcript_presigned_url": presigned_url,
-        "courses": courses,
-        "additional_details": additional_details,
     }
 
+# Endpoint to check a transcript processing job
+@transcript_router.get("/jobs/{job_id}")
+async def get_transcript_job(job_id: str, jwt_token: str = Depends(validate_jwt)):
+    job = transcript_jobs.status(job_id)
+    # Other users' jobs are reported as missing rather than forbidden
+    if job is None or job["user_id"] != jwt_token["user_id"]:
+        raise HTTPException(status_code=404, detail="Transcript job not found.")
+
+    response = {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "created_at": job["created_at"],
+        "completed_at": job["completed_at"],
+    }
+    if job["status"] == SUCCEEDED:
+        response.update(message="Transcript processed successfully.", **job["result"])
+    elif job["status"] == FAILED:
+        response["error"] = job["error"]
+    return response
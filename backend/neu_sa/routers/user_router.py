@@ -1,12 +1,18 @@
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, List, Optional
 import snowflake.connector
 from neu_sa.routers.auth import validate_jwt
 from dotenv import load_dotenv
 import os
 import re
-from neu_sa.utils.recalculate_eligibility import recalculate_eligibility
+from neu_sa.utils.eligibility_queue import eligibility_queue
+from neu_sa.utils.executor import run_blocking
+from neu_sa.utils.program_catalog import program_catalog
+from neu_sa.utils.user_context import UserContext, user_context_cache
+from neu_sa.utils.what_if import WHAT_IF_MAX_SCENARIOS, evaluate_scenarios
 
 # Load environment variables
 load_dotenv()
@@ -49,6 +55,9 @@ VALID_COLLEGES = [
 ]
 
 # Snowflake connection
+VALID_GRADES = {"A", "A-", "B+", "B", "B-", "C+", "C", "C-", "F", "S", "IP (In Progress)"}
+VALID_CREDITS = {0, 1, 2, 3, 4}  # Valid credits: 0, 1, 2, 3, 4
+
 def get_snowflake_connection():
     return snowflake.connector.connect(
         user=os.getenv("SNOWFLAKE_USER"),
@@ -74,95 +83,85 @@ class UserCourse(BaseModel):
     grade: str
     credits: float
 
-# Fetch user profile and courses
-def fetch_user_data_from_snowflake(user_id: int):
+class HypotheticalCourse(BaseModel):
+    course_code: str
+    credits: Optional[float] = None  # Defaults to the catalog credits
+    grade: str = "IP (In Progress)"
+
+class WhatIfScenario(BaseModel):
+    name: Optional[str] = None
+    add: List[HypotheticalCourse] = []
+    drop: List[str] = []
+
+class WhatIfRequest(BaseModel):
+    scenarios: List[WhatIfScenario]
+
+# Shape a user's cached context as the GET /user/{id} payload
+def user_data_from_context(context: UserContext):
+    profile = context.profile
+    if not profile:
+        user_profile = {
+            "college": "Not Provided",
+            "program_name": "Not Provided",
+            "program_id": "Not Provided",
+            "gpa": 0.0,
+            "campus": "Not Provided",
+            "transcript_link": "",
+            "completed_credits": 0
+        }
+    else:
+        user_profile = {
+            "college": profile["college"] or "Not Provided",
+            "program_name": profile["program_name"] or "Not Provided",
+            "program_id": profile["program_id"] or "Not Provided",
+            "gpa": profile["gpa"] or 0.0,
+            "campus": profile["campus"] or "Not Provided",
+            "transcript_link": profile["transcript_link"] or "",
+            "completed_credits": profile["completed_credits"] or 0
+        }
+
+    courses = [
+        {"course_code": course["course_code"], "course_name": course["course_name"], "grade": course["grade"], "credits": course["credits"]}
+        for course in context.courses
+    ]
+    return {"profile": user_profile, "courses": courses, "version": context.version}
+
+# Current version of a user's profile and courses (one primary-key lookup)
+def fetch_user_version(user_id: int):
     conn = get_snowflake_connection()
     cursor = conn.cursor()
     try:
         cursor.execute(
             """
-            SELECT COLLEGE, PROGRAM_NAME, PROGRAM_ID, GPA, CAMPUS, TRANSCRIPT_LINK, COMPLETED_CREDITS
-            FROM USER_PROFILE
-            WHERE USER_ID = %s
+            SELECT VERSION FROM USER_PROFILE WHERE USER_ID = %s
             """,
             (user_id,)
         )
-        profile_result = cursor.fetchone()
-        if not profile_result:
-            user_profile = {
-                "college": "Not Provided",
-                "program_name": "Not Provided",
-                "program_id": "Not Provided",
-                "gpa": 0.0,
-                "campus": "Not Provided",
-                "transcript_link": "",
-                "completed_credits": 0
-            }
-        else:
-            user_profile = {
-                "college": profile_result[0] or "Not Provided",
-                "program_name": profile_result[1] or "Not Provided",
-                "program_id": profile_result[2] or "Not Provided",
-                "gpa": profile_result[3] or 0.0,
-                "campus": profile_result[4] or "Not Provided",
-                "transcript_link": profile_result[5] or "",
-                "completed_credits": profile_result[6] or 0
-            }
-
-        cursor.execute(
-            """
-            SELECT COURSE_CODE, COURSE_NAME, GRADE, CREDITS
-            FROM USER_COURSES
-            WHERE USER_ID = %s
-            """,
-            (user_id,)
-        )
-        courses_result = cursor.fetchall()
-        courses = [
-            {"course_code": row[0], "course_name": row[1], "grade": row[2], "credits": row[3]}
-            for row in courses_result
-        ] if courses_result else []
-
-        return {"profile": user_profile, "courses": courses}
+        row = cursor.fetchone()
+        return (row[0] or 0) if row else 0
     finally:
         cursor.close()
         conn.close()
 
-# Endpoint: Get user data
-@user_router.get("/{user_id}")
-async def get_user_data(user_id: int, jwt_token: str = Depends(validate_jwt)):
-    if jwt_token["user_id"] != user_id:
-        raise HTTPException(status_code=403, detail="Unauthorized access.")
-
-    user_data = fetch_user_data_from_snowflake(user_id)
-    return user_data
+def user_data_etag(user_id: int, version: int) -> str:
+    return f'"user-{user_id}-v{version}"'
 
-# Endpoint: Update user profile
-@user_router.put("/{user_id}/profile")
-async def update_user_profile(user_id: int, user_profile: UserProfile, jwt_token: str = Depends(validate_jwt)):
-    if jwt_token["user_id"] != user_id:
-        raise HTTPException(status_code=403, detail="Unauthorized access.")
-
-    if user_profile.campus not in VALID_CAMPUSES:
-        raise HTTPException(status_code=400, detail="Invalid campus selected.")
-
-    if user_profile.program_name not in VALID_PROGRAM_NAMES:
-        raise HTTPException(status_code=400, detail="Invalid program name selected.")
-
-    if user_profile.college not in VALID_COLLEGES:
-        raise HTTPException(status_code=400, detail="Invalid college selected.")
-
-    # Validate GPA
-    if user_profile.gpa < 0.0 or user_profile.gpa > 4.0:
-        raise HTTPException(status_code=400, detail="GPA must be between 0.0 and 4.0.")
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
 
+# Persist user profile changes
+def save_user_profile(user_id: int, user_profile: UserProfile):
     conn = get_snowflake_connection()
     cursor = conn.cursor()
     try:
         cursor.execute(
             """
             UPDATE USER_PROFILE
-            SET COLLEGE = %s, PROGRAM_NAME = %s, PROGRAM_ID = %s, GPA = %s, CAMPUS = %s
+            SET COLLEGE = %s, PROGRAM_NAME = %s, PROGRAM_ID = %s, GPA = %s, CAMPUS = %s,
+                VERSION = COALESCE(VERSION, 0) + 1
             WHERE USER_ID = %s
             """,
             (
@@ -175,7 +174,6 @@ async def update_user_profile(user_id: int, user_profile: UserProfile, jwt_token
             )
         )
         conn.commit()
-        return {"message": "User profile updated successfully."}
     except Exception as e:
         conn.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to update user profile: {str(e)}")
@@ -183,71 +181,85 @@ async def update_user_profile(user_id: int, user_profile: UserProfile, jwt_token
         cursor.close()
         conn.close()
 
-# Endpoint: Update user courses
-@user_router.put("/{user_id}/courses")
-async def update_user_courses(user_id: int, courses: List[UserCourse], jwt_token: str = Depends(validate_jwt), background_tasks: BackgroundTasks = None):
-    if jwt_token["user_id"] != user_id:
-        raise HTTPException(status_code=403, detail="Unauthorized access.")
+# Validate a submitted course list before anything is written
+def validate_user_courses(courses: List[UserCourse]):
+    for course in courses:
+        if not re.match(r"^[A-Z]{4} \d{4}$", course.course_code):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid course code format: {course.course_code}. Expected format: 'INFO 5490'.",
+            )
+        if course.grade not in VALID_GRADES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid grade for course {course.course_code}: {course.grade}. Valid grades are {', '.join(VALID_GRADES)}.",
+            )
+        if course.credits not in VALID_CREDITS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid credits for course {course.course_code}: {course.credits}. Credits must be one of {', '.join(map(str, VALID_CREDITS))}.",
+            )
 
-    VALID_GRADES = {"A", "A-", "B+", "B", "B-", "C+", "C", "C-", "F", "S", "IP (In Progress)"}
-    VALID_CREDITS = {0, 1, 2, 3, 4}  # Valid credits: 0, 1, 2, 3, 4
+# Apply the submitted course list for a user; returns the updated completed credits and changed course codes
+def save_user_courses(user_id: int, courses: List[UserCourse]):
+    """
+    Replaces the user's courses with the submitted list in one transaction and a fixed number of
+    statements, however long the transcript: delete unlisted courses, upsert new or changed ones
+    from a VALUES list, and recompute COMPLETED_CREDITS from the stored rows.
+    """
+    # A course listed twice keeps its last entry, as when each course was merged in turn
+    incoming = {course.course_code: course for course in courses}
 
+    conn = get_snowflake_connection()
+    cursor = conn.cursor()
     try:
-        conn = get_snowflake_connection()
-        cursor = conn.cursor()
-
-        # Convert incoming courses to a set of course codes
-        incoming_course_codes = {course.course_code for course in courses}
-
-        # Fetch existing courses for the user
+        # Fetch existing courses (with the fields eligibility depends on) for the user
         cursor.execute(
             """
-            SELECT course_code
+            SELECT course_code, course_name, grade, credits
             FROM USER_COURSES
             WHERE user_id = %s
             """,
             (user_id,),
         )
-        existing_courses = {row[0] for row in cursor.fetchall()}
+        existing_courses = {row[0]: (row[1], row[2], row[3]) for row in cursor.fetchall()}
 
         # Find courses to remove (existing courses not in incoming courses)
-        courses_to_remove = existing_courses - incoming_course_codes
+        courses_to_remove = existing_courses.keys() - incoming.keys()
+
+        # Courses whose eligibility inputs changed: removed, added, or regraded/re-credited
+        changed_courses = set(courses_to_remove)
+        courses_to_upsert = []
+        for course in incoming.values():
+            existing = existing_courses.get(course.course_code)
+            if existing is None or existing[1] != course.grade or float(existing[2] or 0) != float(course.credits):
+                changed_courses.add(course.course_code)
+                courses_to_upsert.append(course)
+            elif existing[0] != course.course_name:
+                courses_to_upsert.append(course)
+
+        cursor.execute("BEGIN;")
 
-        # Remove unlisted courses from the database
         if courses_to_remove:
-            cursor.executemany(
-                """
+            placeholders = ", ".join(["%s"] * len(incoming))
+            cursor.execute(
+                f"""
                 DELETE FROM USER_COURSES
-                WHERE user_id = %s AND course_code = %s
+                WHERE user_id = %s{f" AND course_code NOT IN ({placeholders})" if incoming else ""}
                 """,
-                [(user_id, course_code) for course_code in courses_to_remove],
+                (user_id, *sorted(incoming)),
             )
-            conn.commit()
-
-        # Validate and update or insert incoming courses
-        for course in courses:
-            # Validate course details
-            if not re.match(r"^[A-Z]{4} \d{4}$", course.course_code):
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Invalid course code format: {course.course_code}. Expected format: 'INFO 5490'.",
-                )
-            if course.grade not in VALID_GRADES:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Invalid grade for course {course.course_code}: {course.grade}. Valid grades are {', '.join(VALID_GRADES)}.",
-                )
-            if course.credits not in VALID_CREDITS:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Invalid credits for course {course.course_code}: {course.credits}. Credits must be one of {', '.join(map(str, VALID_CREDITS))}.",
-                )
 
-            # Update or insert the course
+        # Upsert every new or changed course in one statement
+        if courses_to_upsert:
+            values = ", ".join(["(%s, %s, %s, %s)"] * len(courses_to_upsert))
             cursor.execute(
-                """
+                f"""
                 MERGE INTO USER_COURSES AS target
-                USING (SELECT %s AS user_id, %s AS course_code, %s AS course_name, %s AS grade, %s AS credits) AS source
+                USING (
+                    SELECT %s AS user_id, $1 AS course_code, $2 AS course_name, $3 AS grade, $4 AS credits
+                    FROM VALUES {values}
+                ) AS source
                 ON target.user_id = source.user_id AND target.course_code = source.course_code
                 WHEN MATCHED THEN
                     UPDATE SET course_name = source.course_name, grade = source.grade, credits = source.credits
@@ -255,40 +267,32 @@ async def update_user_courses(user_id: int, courses: List[UserCourse], jwt_token
                     INSERT (user_id, course_code, course_name, grade, credits)
                     VALUES (source.user_id, source.course_code, source.course_name, source.grade, source.credits);
                 """,
-                (user_id, course.course_code, course.course_name, course.grade, course.credits),
+                (
+                    user_id,
+                    *(value for course in courses_to_upsert
+                      for value in (course.course_code, course.course_name, course.grade, course.credits)),
+                ),
             )
 
-        # Sum up the credits for all completed courses
-        cursor.execute(
-            """
-            SELECT COALESCE(SUM(credits), 0)
-            FROM USER_COURSES
-            WHERE user_id = %s
-            """,
-            (user_id,),
-        )
-        total_credits = cursor.fetchone()[0]
-
-        # Update the completed credits in the user profile
+        # Recompute the completed credits in the user profile from the stored courses; any change bumps the version
+        version_update = ", VERSION = COALESCE(VERSION, 0) + 1" if courses_to_remove or courses_to_upsert else ""
         cursor.execute(
-            """
+            f"""
             UPDATE USER_PROFILE
-            SET COMPLETED_CREDITS = %s
+            SET COMPLETED_CREDITS = (
+                SELECT COALESCE(SUM(credits), 0) FROM USER_COURSES WHERE user_id = %s
+            ){version_update}
             WHERE USER_ID = %s
             """,
-            (total_credits, user_id),
+            (user_id, user_id),
         )
 
         conn.commit()
 
-        # Run eligibility recalculation in the background
-        background_tasks.add_task(recalculate_eligibility, user_id)
-
-        return {"message": "Courses updated successfully.", "completed_credits": total_credits}
+        # The stored rows now match the submitted list, so their sum is the new total
+        total_credits = sum(course.credits for course in incoming.values())
+        return total_credits, changed_courses
 
-    except HTTPException as e:
-        conn.rollback()
-        raise e  # Reraise HTTP exceptions with specific validation messages
     except Exception as e:
         conn.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to update courses: {str(e)}")
@@ -296,3 +300,148 @@ async def update_user_courses(user_id: int, courses: List[UserCourse], jwt_token
         cursor.close()
         conn.close()
 
+# Endpoint: Get user data
+@user_router.get("/{user_id}")
+async def get_user_data(user_id: int, jwt_token: str = Depends(validate_jwt), request: Request = None):
+    if jwt_token["user_id"] != user_id:
+        raise HTTPException(status_code=403, detail="Unauthorized access.")
+
+    # Revalidate against the stored version; unchanged data costs one primary-key lookup
+    version = await run_blocking("snowflake", fetch_user_version, user_id)
+    etag = user_data_etag(user_id, version)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request is not None and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    # Served from the shared context cache unless the entry was read at an older version
+    context = await run_blocking("snowflake", user_context_cache.get, user_id, version)
+    headers["ETag"] = user_data_etag(user_id, context.version)
+    return JSONResponse(content=jsonable_encoder(user_data_from_context(context)), headers=headers)
+
+# Endpoint: Update user profile
+@user_router.put("/{user_id}/profile")
+async def update_user_profile(user_id: int, user_profile: UserProfile, jwt_token: str = Depends(validate_jwt)):
+    if jwt_token["user_id"] != user_id:
+        raise HTTPException(status_code=403, detail="Unauthorized access.")
+
+    if user_profile.campus not in VALID_CAMPUSES:
+        raise HTTPException(status_code=400, detail="Invalid campus selected.")
+
+    if user_profile.program_name not in VALID_PROGRAM_NAMES:
+        raise HTTPException(status_code=400, detail="Invalid program name selected.")
+
+    if user_profile.college not in VALID_COLLEGES:
+        raise HTTPException(status_code=400, detail="Invalid college selected.")
+
+    # Validate GPA
+    if user_profile.gpa < 0.0 or user_profile.gpa > 4.0:
+        raise HTTPException(status_code=400, detail="GPA must be between 0.0 and 4.0.")
+
+    await run_blocking("snowflake", save_user_profile, user_id, user_profile)
+    user_context_cache.invalidate(user_id)
+
+    # The program may have changed, and incremental runs only replace the new program's
+    # buckets, so queue a full rebuild (later course saves coalesce into it)
+    eligibility_version = eligibility_queue.enqueue(user_id)
+
+    return {"message": "User profile updated successfully.", "eligibility_version": eligibility_version}
+
+# Endpoint: Update user courses
+@user_router.put("/{user_id}/courses")
+async def update_user_courses(user_id: int, courses: List[UserCourse], jwt_token: str = Depends(validate_jwt)):
+    if jwt_token["user_id"] != user_id:
+        raise HTTPException(status_code=403, detail="Unauthorized access.")
+
+    validate_user_courses(courses)
+    total_credits, changed_courses = await run_blocking("snowflake", save_user_courses, user_id, courses)
+    user_context_cache.invalidate(user_id)
+
+    # Queue a recalculation of the rows affected by the changed courses (coalesced per user)
+    eligibility_version = None
+    if changed_courses:
+        eligibility_version = eligibility_queue.enqueue(user_id, changed_courses)
+
+    return {
+        "message": "Courses updated successfully.",
+        "completed_credits": total_credits,
+        "eligibility_version": eligibility_version,
+    }
+
+# Time of the user's latest eligibility write
+def fetch_last_eligibility_update(user_id: int):
+    conn = get_snowflake_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT MAX(CHECK_DATE) FROM USER_ELIGIBILITY WHERE USER_ID = %s
+            """,
+            (user_id,),
+        )
+        row = cursor.fetchone()
+        return row[0] if row else None
+    finally:
+        cursor.close()
+        conn.close()
+
+# Endpoint: Eligibility freshness
+@user_router.get("/{user_id}/eligibility/status")
+async def get_eligibility_status(user_id: int, jwt_token: str = Depends(validate_jwt)):
+    if jwt_token["user_id"] != user_id:
+        raise HTTPException(status_code=403, detail="Unauthorized access.")
+
+    status = eligibility_queue.status(user_id)
+    try:
+        status["last_calculated_at"] = await run_blocking("snowflake", fetch_last_eligibility_update, user_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch eligibility status: {str(e)}")
+    return {"user_id": user_id, **status}
+
+# Evaluate what-if scenarios against a program (None if the program is unknown)
+def evaluate_what_if(program_id: str, completed_courses: List[Dict], scenarios: List[Dict]) -> Optional[List[Dict]]:
+    # The catalog lookups may refresh from Snowflake, so they run on the worker with the evaluation
+    program = program_catalog.programs().get(program_id)
+    if program is None:
+        return None
+    # Pure in-memory evaluation; nothing is written
+    return evaluate_scenarios(program, completed_courses, scenarios, program_catalog.course_credits(),
+                              program_catalog.prerequisite_graph())
+
+# Endpoint: Evaluate hypothetical schedules against the user's degree requirements
+@user_router.post("/{user_id}/eligibility/what-if")
+async def what_if_degree_audit(user_id: int, request: WhatIfRequest, jwt_token: str = Depends(validate_jwt)):
+    if jwt_token["user_id"] != user_id:
+        raise HTTPException(status_code=403, detail="Unauthorized access.")
+
+    if not request.scenarios:
+        raise HTTPException(status_code=400, detail="At least one scenario is required.")
+    if len(request.scenarios) > WHAT_IF_MAX_SCENARIOS:
+        raise HTTPException(status_code=400, detail=f"At most {WHAT_IF_MAX_SCENARIOS} scenarios can be evaluated per request.")
+
+    # Validate hypothetical courses
+    for scenario in request.scenarios:
+        for course_code in [course.course_code for course in scenario.add] + scenario.drop:
+            if not re.match(r"^[A-Z]{4} \d{4}$", course_code):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid course code format: {course_code}. Expected format: 'INFO 5490'.",
+                )
+        for course in scenario.add:
+            if course.grade not in VALID_GRADES:
+                raise HTTPException(status_code=400, detail=f"Invalid grade for course {course.course_code}: {course.grade}.")
+            if course.credits is not None and course.credits not in VALID_CREDITS:
+                raise HTTPException(status_code=400, detail=f"Invalid credits for course {course.course_code}: {course.credits}.")
+
+    try:
+        context = await run_blocking("snowflake", user_context_cache.get, user_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch user data: {str(e)}")
+    if not context.profile:
+        raise HTTPException(status_code=404, detail=f"No user profile found for user_id: {user_id}")
+
+    program_id = context.profile["program_id"]
+    results = await run_blocking("snowflake", evaluate_what_if, program_id, context.completed_courses,
+                                 [scenario.model_dump() for scenario in request.scenarios])
+    if results is None:
+        raise HTTPException(status_code=404, detail=f"No program requirements found for program_id: {program_id}")
+    return {"user_id": user_id, "program_id": program_id, "scenarios": results}
@@ -0,0 +1,112 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional
+from neu_sa.utils.eligibility_kernel import (
+    CORE_BUCKET,
+    CORE_OPTIONS_BUCKET,
+    ELECTIVES_BUCKET,
+    FAILED_GRADE,
+    IN_PROGRESS_GRADE,
+    ProgramRequirements,
+    RequirementProgress,
+    evaluate_program,
+    index_transcript,
+)
+from neu_sa.utils.prerequisite_graph import PrerequisiteGraph, best_grades
+
+
+def build_advising_context(program: ProgramRequirements, completed_courses: List[Dict[str, Any]],
+                           prerequisite_graph: Optional[PrerequisiteGraph] = None,
+                           progress: Optional[Iterable[RequirementProgress]] = None) -> Dict[str, Any]:
+    """
+    Pre-summarized advising context for one user, small enough to paste into a prompt.
+
+    :param completed_courses: The user's courses (course_code, credits, grade).
+    :param progress: Requirement progress from evaluate_program, when the caller already has it.
+    :return: Credits per requirement bucket, remaining requirements, the program courses the user
+             can register for now and the ones still blocked by prerequisites.
+    """
+    if progress is None:
+        _, progress = evaluate_program(program, index_transcript(completed_courses))
+    progress = list(progress)
+    satisfied = {bucket.requirement for bucket in progress if bucket.satisfied}
+    graph = prerequisite_graph or PrerequisiteGraph({})
+    grades = best_grades(completed_courses)
+
+    completed, in_progress, failed = [], [], []
+    completed_credits = in_progress_credits = 0
+    for course in completed_courses:
+        credits = course["credits"] or 0
+        if course["grade"] == FAILED_GRADE:
+            failed.append(course["course_code"])
+        elif course["grade"] == IN_PROGRESS_GRADE:
+            in_progress.append(course["course_code"])
+            in_progress_credits += credits
+        else:
+            completed.append(f"{course['course_code']} ({course['grade']})")
+            completed_credits += credits
+    passed_or_taking = {code for code, grade in grades.items() if grade != FAILED_GRADE}
+
+    # Program courses still worth taking, with the requirement they would count toward
+    candidates = [(course, CORE_BUCKET) for course in program.core_courses]
+    for course in program.core_option_courses:
+        if CORE_OPTIONS_BUCKET not in satisfied:
+            candidates.append((course, CORE_OPTIONS_BUCKET))
+        elif course.course_code[:4] in program.elective_subjects and ELECTIVES_BUCKET not in satisfied:
+            candidates.append((course, ELECTIVES_BUCKET))
+
+    eligible_now, blocked, seen = [], [], set()
+    for course, requirement in candidates:
+        if course.course_code in passed_or_taking or course.course_code in seen:
+            continue
+        seen.add(course.course_code)
+        entry = {"course_code": course.course_code, "credits": course.credits, "requirement": requirement}
+        if graph.can_take(course.course_code, grades):
+            eligible_now.append(entry)
+        else:
+            blocked.append({**entry, "missing_prerequisites": graph.unmet_prerequisites(course.course_code, grades)})
+
+    return {
+        "program_id": program.program_id,
+        "program_name": program.program_name,
+        "credits": {
+            "completed": completed_credits,
+            "in_progress": in_progress_credits,
+            "program_total": program.max_credit_hours,
+            "remaining": max(program.max_credit_hours - completed_credits - in_progress_credits, 0),
+        },
+        "requirements": [
+            {
+                "requirement": bucket.requirement,
+                "credits": bucket.credits,
+                "required_credits": bucket.required_credits,
+                "remaining_credits": max(bucket.required_credits - bucket.credits, 0),
+                "courses": list(bucket.courses),
+            }
+            for bucket in progress
+        ],
+        "remaining_requirements": [bucket.requirement for bucket in progress if not bucket.satisfied],
+        "eligible_now": eligible_now,
+        "blocked": blocked,
+        "courses": {"completed": completed, "in_progress": in_progress, "failed": failed},
+        "elective_subjects": sorted(program.elective_subjects),
+        "elective_exceptions": list(program.elective_exceptions),
+    }
+
+
+def advising_context_json(advising_context: Dict[str, Any]) -> str:
+    """Compact JSON used both for the VARIANT column and the prompt."""
+    return json.dumps(advising_context, separators=(",", ":"), default=float)
+
+
+# Store a user's advising context (call inside the eligibility write transaction)
+def write_advising_context(cursor, user_id, advising_context: Dict[str, Any]):
+    cursor.execute(
+        """
+        MERGE INTO USER_ADVISING_CONTEXT AS target
+        USING (SELECT %s AS USER_ID, PARSE_JSON(%s) AS CONTEXT) AS source
+        ON target.USER_ID = source.USER_ID
+        WHEN MATCHED THEN UPDATE SET CONTEXT = source.CONTEXT, UPDATED_AT = CURRENT_TIMESTAMP
+        WHEN NOT MATCHED THEN INSERT (USER_ID, CONTEXT) VALUES (source.USER_ID, source.CONTEXT);
+        """,
+        (user_id, advising_context_json(advising_context))
+    )
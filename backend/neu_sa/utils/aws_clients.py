@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+import uuid
+from typing import Any, Dict, List, Mapping, Optional
+import boto3
+from botocore.config import Config
+
+# AWS configuration shared by the transcript pipeline
+AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
+AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
+AWS_REGION = os.getenv("AWS_REGION")
+
+# HTTP connections each client keeps open; shared by the "aws" executor pool and the transcript job workers
+AWS_MAX_POOL_CONNECTIONS = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "16"))
+
+# Directory of recorded Textract responses; when set, Textract calls are served locally by StubTextractClient
+TEXTRACT_STUB_DIR = os.getenv("TEXTRACT_STUB_DIR")
+
+# Recorded response used for documents without a recording of their own
+DEFAULT_RECORDING = "default"
+
+# Most blocks Textract returns per get_document_analysis response
+TEXTRACT_PAGE_SIZE = 1000
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _client(service: str):
+    # boto3 clients are thread-safe; creating one per call costs more than most of the calls made with it
+    with _clients_lock:
+        client = _clients.get(service)
+        if client is None:
+            client = _clients[service] = boto3.client(
+                service,
+                aws_access_key_id=AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+                region_name=AWS_REGION,
+                config=Config(max_pool_connections=AWS_MAX_POOL_CONNECTIONS),
+            )
+        return client
+
+
+def get_s3_client():
+    return _client("s3")
+
+
+def get_textract_client():
+    if TEXTRACT_STUB_DIR:
+        with _clients_lock:
+            client = _clients.get("textract-stub")
+            if client is None:
+                client = _clients["textract-stub"] = StubTextractClient.from_directory(TEXTRACT_STUB_DIR)
+            return client
+    return _client("textract")
+
+
+class StubTextractClient:
+    """
+    Local stand-in for Textract's asynchronous document analysis API, so the upload/poll
+    flow runs offline. Serves recorded `Blocks` per document (by file name without
+    extension, falling back to DEFAULT_RECORDING) after a configurable number of polls,
+    `page_size` blocks per response with a `NextToken` for the rest, like Textract.
+    """
+
+    def __init__(self, recordings: Mapping[str, List[Dict[str, Any]]], polls_until_done: int = 1,
+                 page_size: int = TEXTRACT_PAGE_SIZE):
+        self.recordings = dict(recordings)
+        self.polls_until_done = polls_until_done
+        self.page_size = page_size
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_directory(cls, path: str, polls_until_done: int = 1, page_size: int = TEXTRACT_PAGE_SIZE):
+        recordings = {}
+        for name in os.listdir(path):
+            if name.endswith(".json"):
+                with open(os.path.join(path, name)) as f:
+                    recording = json.load(f)
+                recordings[name[:-len(".json")]] = recording.get("Blocks", recording) if isinstance(recording, dict) else recording
+        return cls(recordings, polls_until_done, page_size)
+
+    def _recording(self, document_name: str) -> Optional[List[Dict[str, Any]]]:
+        name = os.path.splitext(os.path.basename(document_name))[0]
+        return self.recordings.get(name, self.recordings.get(DEFAULT_RECORDING))
+
+    def start_document_analysis(self, DocumentLocation, FeatureTypes=None, **kwargs):
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = {"document": DocumentLocation["S3Object"]["Name"], "polls": 0}
+        return {"JobId": job_id}
+
+    def get_document_analysis(self, JobId, MaxResults=None, NextToken=None, **kwargs):
+        with self._lock:
+            job = self._jobs.get(JobId)
+            if job is None:
+                raise ValueError(f"Unknown Textract job: {JobId}")
+            # Follow-up pages of a finished job are not status polls
+            if NextToken is None:
+                job["polls"] += 1
+                if job["polls"] <= self.polls_until_done:
+                    return {"JobStatus": "IN_PROGRESS"}
+        blocks = self._recording(job["document"])
+        if blocks is None:
+            return {"JobStatus": "FAILED", "StatusMessage": f"No recorded response for {job['document']}"}
+        start = int(NextToken or 0)
+        end = start + min(MaxResults or self.page_size, self.page_size)
+        response = {"JobStatus": "SUCCEEDED", "Blocks": blocks[start:end]}
+        if end < len(blocks):
+            response["NextToken"] = str(end)
+        return response
@@ -0,0 +1,255 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import snowflake.connector
+from neu_sa.utils.eligibility_kernel import compute_eligibility, index_transcript
+from neu_sa.utils.program_catalog import fetch_all_programs, fetch_catalog_generation
+
+# Users loaded, computed and written per transaction
+DEFAULT_CHUNK_SIZE = int(os.getenv("BULK_ELIGIBILITY_CHUNK_SIZE", "500"))
+# Users handed to a worker process per task
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_CHECKPOINT_PATH = os.getenv("BULK_ELIGIBILITY_CHECKPOINT", "bulk_eligibility_checkpoint.json")
+
+STAGE_TABLE = "USER_ELIGIBILITY_STAGE"
+
+
+def get_snowflake_connection():
+    return snowflake.connector.connect(
+        user=os.getenv("SNOWFLAKE_USER"),
+        password=os.getenv("SNOWFLAKE_PASSWORD"),
+        account=os.getenv("SNOWFLAKE_ACCOUNT"),
+        warehouse=os.getenv("SNOWFLAKE_WAREHOUSE", "WH_NEU_SA"),
+        database=os.getenv("SNOWFLAKE_DATABASE", "DB_NEU_SA"),
+        schema=os.getenv("SNOWFLAKE_SCHEMA", "NEU_SA"),
+    )
+
+
+# Fetch the next chunk of users (ordered by USER_ID) with all their courses in two queries
+def fetch_user_chunk(conn, after_user_id, chunk_size):
+    """
+    :return: List of (user_id, program_id, completed_courses) with completed_courses in
+             the same shape as recalculate_eligibility.fetch_user_data.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT USER_ID, PROGRAM_ID FROM USER_PROFILE
+            WHERE USER_ID > %s
+            ORDER BY USER_ID
+            LIMIT %s;
+            """,
+            (after_user_id, chunk_size)
+        )
+        profiles = cursor.fetchall()
+        if not profiles:
+            return []
+
+        courses = {user_id: [] for user_id, _ in profiles}
+        cursor.execute(
+            """
+            SELECT USER_ID, COURSE_CODE, CREDITS, GRADE FROM USER_COURSES
+            WHERE USER_ID > %s AND USER_ID <= %s;
+            """,
+            (after_user_id, profiles[-1][0])
+        )
+        for user_id, course_code, credits, grade in cursor.fetchall():
+            if user_id in courses:
+                courses[user_id].append({"course_code": course_code, "credits": credits, "grade": grade})
+    finally:
+        cursor.close()
+
+    return [(user_id, program_id, courses[user_id]) for user_id, program_id in profiles]
+
+
+# Program catalog shared by every task in a worker process (set by the pool initializer)
+_worker_programs = {}
+
+
+def _init_worker(programs):
+    global _worker_programs
+    _worker_programs = programs
+
+
+# Compute eligibility rows for a batch of users (runs in a worker process)
+def compute_batch(users, programs=None):
+    """
+    :param users: List of (user_id, program_id, completed_courses).
+    :param programs: Program catalog; defaults to the one installed by the pool initializer.
+    :return: (rows, failed) where rows are USER_ELIGIBILITY tuples and failed maps user_id to an error.
+    """
+    programs = _worker_programs if programs is None else programs
+    rows, failed = [], {}
+    for user_id, program_id, completed_courses in users:
+        program = programs.get(program_id)
+        if program is None:
+            failed[user_id] = f"No program requirements found for program_id: {program_id}"
+            continue
+        for code, eligible, details, status in compute_eligibility(program, index_transcript(completed_courses)):
+            rows.append((user_id, code, eligible, details, status))
+    return rows, failed
+
+
+# Replace the eligibility rows of every user in the stage table in one transaction
+def write_staged_rows(conn, rows):
+    """
+    Stages the rows in a temporary table, then swaps them in with set-based statements.
+    A user's rows are keyed only by (USER_ID, COURSE_OR_REQUIREMENT) and that pair is not
+    unique (a course can count toward a subject area and electives), so the swap is a
+    delete-and-insert from the stage rather than a row-matching MERGE.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"CREATE TEMPORARY TABLE IF NOT EXISTS {STAGE_TABLE} LIKE USER_ELIGIBILITY;")
+        cursor.execute(f"TRUNCATE TABLE {STAGE_TABLE};")
+        if rows:
+            cursor.executemany(
+                f"""
+                INSERT INTO {STAGE_TABLE} (USER_ID, COURSE_OR_REQUIREMENT, ELIGIBLE, DETAILS, STATUS)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                rows,
+            )
+
+        cursor.execute("BEGIN;")
+        cursor.execute(
+            f"""
+            DELETE FROM USER_ELIGIBILITY
+            WHERE USER_ID IN (SELECT DISTINCT USER_ID FROM {STAGE_TABLE});
+            """
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO USER_ELIGIBILITY (USER_ID, COURSE_OR_REQUIREMENT, ELIGIBLE, DETAILS, STATUS)
+            SELECT USER_ID, COURSE_OR_REQUIREMENT, ELIGIBLE, DETAILS, STATUS FROM {STAGE_TABLE};
+            """
+        )
+        # Advising contexts of these users are stale now; readers rebuild them until the next per-user write
+        cursor.execute(
+            f"""
+            DELETE FROM USER_ADVISING_CONTEXT
+            WHERE USER_ID IN (SELECT DISTINCT USER_ID FROM {STAGE_TABLE});
+            """
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def load_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(path, checkpoint):
+    if not path:
+        return
+    # Write then rename so an interrupted run never leaves a truncated checkpoint
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def _batches(users, batch_size):
+    for start in range(0, len(users), batch_size):
+        yield users[start:start + batch_size]
+
+
+# Recalculate eligibility for every user
+def bulk_recalculate_eligibility(workers=None, chunk_size=DEFAULT_CHUNK_SIZE, batch_size=DEFAULT_BATCH_SIZE,
+                                 checkpoint_path=DEFAULT_CHECKPOINT_PATH, resume=False, connection_factory=None):
+    """
+    Recomputes USER_ELIGIBILITY for all users in USER_ID order, one chunk per transaction.
+
+    :param workers: Worker processes for the eligibility computation (default: CPU count).
+    :param checkpoint_path: JSON file recording the last committed USER_ID and catalog generation.
+    :param resume: Continue after the checkpointed USER_ID. A checkpoint from a different catalog
+                   generation is ignored, since those users were computed against stale requirements.
+    :return: Summary metrics for the run.
+    """
+    conn = (connection_factory or get_snowflake_connection)()
+    started = time.perf_counter()
+    summary = {"users": 0, "rows": 0, "failed": {}, "chunks": 0}
+    try:
+        generation = fetch_catalog_generation(conn)
+        programs = fetch_all_programs(conn)
+        print(f"Loaded {len(programs)} programs (catalog generation {generation}).")
+
+        after_user_id = 0
+        checkpoint = load_checkpoint(checkpoint_path) if resume else None
+        if checkpoint and checkpoint.get("generation") == generation:
+            after_user_id = checkpoint["last_user_id"]
+            print(f"Resuming after user_id {after_user_id}.")
+        elif checkpoint:
+            print("Checkpoint is from a different catalog generation; starting over.")
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(programs,)) as pool:
+            while True:
+                users = fetch_user_chunk(conn, after_user_id, chunk_size)
+                if not users:
+                    break
+
+                rows = []
+                for batch_rows, batch_failed in pool.map(compute_batch, _batches(users, batch_size)):
+                    rows.extend(batch_rows)
+                    summary["failed"].update(batch_failed)
+
+                write_staged_rows(conn, rows)
+                after_user_id = users[-1][0]
+                save_checkpoint(checkpoint_path, {"last_user_id": after_user_id, "generation": generation})
+
+                summary["users"] += len(users)
+                summary["rows"] += len(rows)
+                summary["chunks"] += 1
+                elapsed = time.perf_counter() - started
+                print(
+                    f"Committed {summary['users']} users through user_id {after_user_id} "
+                    f"({summary['users'] / elapsed:.1f} users/s)."
+                )
+    finally:
+        conn.close()
+
+    # The run finished, so the next one starts from the beginning
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    summary["seconds"] = time.perf_counter() - started
+    summary["users_per_second"] = summary["users"] / summary["seconds"] if summary["seconds"] else 0.0
+    print(
+        f"Recalculated eligibility for {summary['users']} users ({summary['rows']} rows) in "
+        f"{summary['seconds']:.1f}s, {summary['users_per_second']:.1f} users/s; {len(summary['failed'])} failed."
+    )
+    for user_id, error in summary["failed"].items():
+        print(f"  user_id {user_id}: {error}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recalculate USER_ELIGIBILITY for all users.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Users per transaction.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Users per worker task.")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT_PATH, help="Checkpoint file path.")
+    parser.add_argument("--resume", action="store_true", help="Resume from the checkpoint of an interrupted run.")
+    args = parser.parse_args()
+
+    bulk_recalculate_eligibility(
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+        checkpoint_path=args.checkpoint,
+        resume=args.resume,
+    )
+
+
+if __name__ == "__main__":
+    main()
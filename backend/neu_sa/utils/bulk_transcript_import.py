@@ -0,0 +1,353 @@
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import snowflake.connector
+from neu_sa.routers.transcript_router import (
+    S3_BUCKET_NAME,
+    fetch_textract_table_rows,
+    process_transcript,
+    start_transcript_analysis,
+)
+from neu_sa.routers.user_router import VALID_CREDITS, VALID_GRADES
+from neu_sa.utils.aws_clients import AWS_REGION, get_s3_client
+from neu_sa.utils.eligibility_queue import EligibilityQueue, SQLiteJobStore
+from neu_sa.utils.pdf_transcript import parse_transcript_document
+from neu_sa.utils.recalculate_eligibility import recalculate_eligibility
+from neu_sa.utils.transcript_jobs import TRANSCRIPT_JOB_INITIAL_DELAY, TRANSCRIPT_JOB_MAX_DELAY, TRANSCRIPT_JOB_TIMEOUT
+from neu_sa.utils.transcript_upload import stage_upload
+
+# Transcripts extracted at once (each may be waiting on its own Textract job)
+DEFAULT_CONCURRENCY = int(os.getenv("BULK_TRANSCRIPT_CONCURRENCY", "8"))
+# Users whose courses are written per transaction
+DEFAULT_BATCH_SIZE = int(os.getenv("BULK_TRANSCRIPT_BATCH_SIZE", "50"))
+
+# Transcript files are named after the user they belong to, e.g. 1042.pdf or 1042_transcript.pdf
+USER_ID_FILENAME = re.compile(r"^(\d+)(?:[_\-. ].*)?\.pdf$", re.IGNORECASE)
+
+
+# S3 key of a transcript stored by one import run. The user's API upload key is left alone, so the
+# transcript they see only changes when the batch that links the new object commits.
+def import_transcript_key(user_id, import_id):
+    return f"transcripts/{user_id}_import_{import_id}.pdf"
+
+
+# Delete an imported object no profile links to; returns its state for the report
+def discard_import_object(key):
+    try:
+        get_s3_client().delete_object(Bucket=S3_BUCKET_NAME, Key=key)
+        return "deleted"
+    except Exception as e:
+        print(f"Failed to delete s3://{S3_BUCKET_NAME}/{key}: {e}")
+        return "orphaned"
+
+
+def get_snowflake_connection():
+    return snowflake.connector.connect(
+        user=os.getenv("SNOWFLAKE_USER"),
+        password=os.getenv("SNOWFLAKE_PASSWORD"),
+        account=os.getenv("SNOWFLAKE_ACCOUNT"),
+        warehouse=os.getenv("SNOWFLAKE_WAREHOUSE", "WH_NEU_SA"),
+        database=os.getenv("SNOWFLAKE_DATABASE", "DB_NEU_SA"),
+        schema=os.getenv("SNOWFLAKE_SCHEMA", "NEU_SA"),
+    )
+
+
+# PDF files named by user ID under the given files and directories, in path order
+def collect_transcripts(paths):
+    """
+    :return: (list of (path, user_id), list of failure entries for files that are not named by user ID)
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.lower().endswith(".pdf"))
+        else:
+            files.append(path)
+
+    transcripts, failures = [], []
+    for path in files:
+        match = USER_ID_FILENAME.match(os.path.basename(path))
+        if match:
+            transcripts.append((path, int(match.group(1))))
+        else:
+            failures.append({"file": path, "user_id": None, "status": "failed",
+                             "error": "File name does not start with a user ID."})
+    return transcripts, failures
+
+
+# Wait for a Textract analysis, backing off between polls like the API's transcript jobs
+def wait_for_textract_rows(textract_job_id, timeout=TRANSCRIPT_JOB_TIMEOUT):
+    delay = TRANSCRIPT_JOB_INITIAL_DELAY
+    deadline = time.monotonic() + timeout
+    while True:
+        time.sleep(delay)
+        rows = fetch_textract_table_rows(textract_job_id)
+        if rows is not None:
+            return rows
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Analysis did not finish within {timeout:.0f}s.")
+        delay = min(delay * 2, TRANSCRIPT_JOB_MAX_DELAY)
+
+
+# Upload and parse one transcript (runs on the import's worker threads)
+def extract_transcript(path, user_id, key, textract_timeout=TRANSCRIPT_JOB_TIMEOUT):
+    """
+    Stores the transcript in S3 under `key` (see import_transcript_key) and parses it from its
+    text layer, falling back to Textract.
+
+    :return: Per-file report entry; successful entries carry the parsed courses. `s3_object`
+             reports whether the file was stored ("stored"), never stored ("not stored") or
+             removed again after a failure ("deleted", or "orphaned" if that failed too).
+    """
+    started = time.perf_counter()
+    entry = {"file": path, "user_id": user_id, "s3_key": key, "s3_object": "not stored"}
+    staged = None
+    try:
+        with open(path, "rb") as stream:
+            staged = stage_upload(stream, get_s3_client(), S3_BUCKET_NAME, key)
+            parsed = parse_transcript_document(staged.reader)
+        file_url = f"https://{S3_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com/{staged.key}"
+
+        if parsed is not None:
+            source, row_errors = "text_layer", []
+            user_profile, completed_courses = parsed
+        else:
+            # Textract reads the document from S3
+            staged.complete()
+            entry["s3_object"] = "stored"
+            source = "textract"
+            analysis = start_transcript_analysis(file_url)
+            completed_courses, additional_details = process_transcript(
+                wait_for_textract_rows(analysis["textract_job_id"], textract_timeout)
+            )
+            user_profile, row_errors = additional_details["user_profile"], additional_details["row_errors"]
+
+        courses, skipped = importable_courses(completed_courses)
+        if not courses:
+            raise ValueError("No courses found in the transcript.")
+        if source == "text_layer":
+            staged.complete()
+            entry["s3_object"] = "stored"
+
+        entry.update(status="parsed", source=source, file_url=file_url, user_profile=user_profile,
+                     courses=courses, skipped=row_errors + skipped)
+    except Exception as e:
+        entry.update(status="failed", error=str(e))
+        if entry["s3_object"] == "stored":
+            entry["s3_object"] = discard_import_object(key)
+        elif staged is not None:
+            staged.abort()
+    entry["seconds"] = time.perf_counter() - started
+    return entry
+
+
+# Courses that pass the course update endpoint's rules; a course listed twice keeps its last entry
+def importable_courses(completed_courses):
+    courses, skipped = {}, []
+    for course in completed_courses:
+        if course["grade"] in VALID_GRADES and course["credits"] in VALID_CREDITS:
+            courses[course["course_code"]] = course
+        else:
+            skipped.append({"course_code": course["course_code"],
+                            "error": f"Unsupported grade or credits: {course['grade']}, {course['credits']}"})
+    return list(courses.values()), skipped
+
+
+# Users among `user_ids` that have a profile
+def fetch_known_users(conn, user_ids):
+    if not user_ids:
+        return set()
+    cursor = conn.cursor()
+    try:
+        placeholders = ", ".join(["%s"] * len(user_ids))
+        cursor.execute(f"SELECT USER_ID FROM USER_PROFILE WHERE USER_ID IN ({placeholders});", list(user_ids))
+        return {row[0] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+# Replace the courses and transcript links of a batch of users in one transaction
+def write_transcript_batch(conn, entries):
+    """
+    :param entries: Parsed report entries, at most one per user.
+    """
+    user_ids = [entry["user_id"] for entry in entries]
+    placeholders = ", ".join(["%s"] * len(user_ids))
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN;")
+        cursor.execute(f"DELETE FROM USER_COURSES WHERE USER_ID IN ({placeholders});", user_ids)
+        # The connector sends executemany INSERTs as multi-row inserts
+        cursor.executemany(
+            "INSERT INTO USER_COURSES (USER_ID, COURSE_CODE, COURSE_NAME, GRADE, CREDITS) VALUES (%s, %s, %s, %s, %s)",
+            [
+                (entry["user_id"], course["course_code"], course["course_name"], course["grade"], course["credits"])
+                for entry in entries for course in entry["courses"]
+            ],
+        )
+        values = ", ".join(["(%s, %s, %s)"] * len(entries))
+        cursor.execute(
+            f"""
+            MERGE INTO USER_PROFILE AS target
+            USING (SELECT $1 AS USER_ID, $2 AS TRANSCRIPT_LINK, $3 AS COMPLETED_CREDITS FROM VALUES {values}) AS source
+            ON target.USER_ID = source.USER_ID
+            WHEN MATCHED THEN UPDATE SET
+                TRANSCRIPT_LINK = source.TRANSCRIPT_LINK,
+                COMPLETED_CREDITS = source.COMPLETED_CREDITS,
+                VERSION = COALESCE(target.VERSION, 0) + 1;
+            """,
+            [
+                value for entry in entries
+                for value in (entry["user_id"], entry["file_url"], sum(course["credits"] for course in entry["courses"]))
+            ],
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def _write(conn, batch, queue, summary):
+    try:
+        write_transcript_batch(conn, batch)
+    except Exception as e:
+        # Nothing links to the batch's objects, and the users' previous transcripts are untouched
+        for entry in batch:
+            entry.update(status="failed", error=f"Failed to write courses: {e}",
+                         s3_object=discard_import_object(entry["s3_key"]))
+        return
+    for entry in batch:
+        entry["status"] = "imported"
+        # Full rebuild; a user already queued is coalesced into the pending job
+        entry["eligibility_version"] = queue.enqueue(entry["user_id"]) if queue is not None else None
+    summary["batches"] += 1
+
+
+# Import a set of transcripts
+def bulk_import_transcripts(paths, concurrency=DEFAULT_CONCURRENCY, batch_size=DEFAULT_BATCH_SIZE, queue=None,
+                            connection_factory=None, textract_timeout=TRANSCRIPT_JOB_TIMEOUT):
+    """
+    Extracts transcripts on `concurrency` threads and writes courses `batch_size` users per
+    transaction as results arrive. A user with several files gets the last one listed.
+    Transcripts are stored under keys of their own for this run, which TRANSCRIPT_LINK points
+    at once their batch commits.
+
+    :param queue: EligibilityQueue that receives one recalculation request per imported user.
+    :return: Summary metrics and one report entry per file.
+    """
+    started = time.perf_counter()
+    import_id = time.strftime("%Y%m%dT%H%M%S")
+    transcripts, failures = collect_transcripts(paths)
+    summary = {"files": len(transcripts) + len(failures), "batches": 0}
+
+    # Later files for the same user replace earlier ones
+    latest = {user_id: path for path, user_id in transcripts}
+    for path, user_id in transcripts:
+        if latest[user_id] != path:
+            failures.append({"file": path, "user_id": user_id, "status": "skipped",
+                             "error": f"Superseded by {latest[user_id]}."})
+    entries = []
+    conn = (connection_factory or get_snowflake_connection)()
+    try:
+        # Transcripts of unknown users are not uploaded at all
+        known = fetch_known_users(conn, sorted(latest))
+        for user_id in sorted(latest.keys() - known):
+            failures.append({"file": latest.pop(user_id), "user_id": user_id, "status": "failed",
+                             "error": "No user profile for this user ID."})
+
+        batch = []
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [
+                pool.submit(extract_transcript, path, user_id, import_transcript_key(user_id, import_id),
+                            textract_timeout)
+                for user_id, path in latest.items()
+            ]
+            for future in as_completed(futures):
+                entry = future.result()
+                entries.append(entry)
+                detail = entry["source"] if entry["status"] == "parsed" else entry["error"]
+                print(f"{entry['file']}: {entry['status']} in {entry['seconds']:.1f}s ({detail})")
+                if entry["status"] == "parsed":
+                    batch.append(entry)
+                if len(batch) >= batch_size:
+                    _write(conn, batch, queue, summary)
+                    batch = []
+        if batch:
+            _write(conn, batch, queue, summary)
+    finally:
+        conn.close()
+
+    report = failures + entries
+    summary["seconds"] = time.perf_counter() - started
+    summary["imported"] = sum(1 for entry in report if entry["status"] == "imported")
+    summary["failed"] = sum(1 for entry in report if entry["status"] == "failed")
+    summary["textract"] = sum(1 for entry in report if entry.get("source") == "textract")
+    summary["files_per_second"] = summary["imported"] / summary["seconds"] if summary["seconds"] else 0.0
+    summary["report"] = report
+    print(
+        f"Imported {summary['imported']} of {summary['files']} transcripts in {summary['seconds']:.1f}s "
+        f"({summary['files_per_second']:.2f} files/s, {summary['textract']} via Textract); {summary['failed']} failed."
+    )
+    for entry in report:
+        if entry["status"] == "failed":
+            s3_state = f" [S3 object {entry['s3_object']}]" if entry.get("s3_object", "not stored") != "not stored" else ""
+            print(f"  {entry['file']}: {entry['error']}{s3_state}")
+    return summary
+
+
+# Full eligibility rebuilds for the imported users, run here instead of through the API's queue
+def recalculate_imported(summary, concurrency=DEFAULT_CONCURRENCY):
+    imported = [entry for entry in summary["report"] if entry["status"] == "imported"]
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {
+            pool.submit(recalculate_eligibility, entry["user_id"], raise_errors=True): entry for entry in imported
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+                futures[future]["eligibility"] = "rebuilt"
+            except Exception as e:
+                futures[future]["eligibility"] = f"failed: {e}"
+    failed = sum(1 for entry in imported if entry["eligibility"] != "rebuilt")
+    print(f"Rebuilt eligibility for {len(imported) - failed} of {len(imported)} imported users.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import transcripts named <user_id>.pdf for a cohort of users.")
+    parser.add_argument("paths", nargs="+", help="Transcript PDFs or directories of them.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Transcripts extracted at once.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Users written per transaction.")
+    # The API's workers own its queue file; this process only adds requests to it
+    eligibility = parser.add_mutually_exclusive_group(required=True)
+    eligibility.add_argument("--queue",
+                             help="Path of the API's eligibility queue database (its ELIGIBILITY_QUEUE_PATH).")
+    eligibility.add_argument("--process-eligibility", action="store_true",
+                             help="Rebuild eligibility in this process and wait, without touching the API's queue.")
+    parser.add_argument("--report", help="Write the per-file report to this JSON file.")
+    args = parser.parse_args()
+
+    if args.process_eligibility:
+        summary = bulk_import_transcripts(args.paths, concurrency=args.concurrency, batch_size=args.batch_size)
+        recalculate_imported(summary, concurrency=args.concurrency)
+    else:
+        if not os.path.isfile(args.queue):
+            parser.error(f"No eligibility queue database at {args.queue}; pass the API's ELIGIBILITY_QUEUE_PATH.")
+        store = SQLiteJobStore(os.path.abspath(args.queue))
+        try:
+            summary = bulk_import_transcripts(args.paths, concurrency=args.concurrency, batch_size=args.batch_size,
+                                              queue=EligibilityQueue(store))
+        finally:
+            store.close()
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(summary, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,490 @@
+from types import MappingProxyType
+from typing import NamedTuple, Tuple, Mapping, FrozenSet, Optional, List, Iterable, Dict, Any
+
+# Grade values with special meaning in the eligibility rules
+FAILED_GRADE = "F"
+IN_PROGRESS_GRADE = "IP (In Progress)"
+
+# Grade precedence map for proper comparison (lower rank is a better grade)
+GRADE_PRECEDENCE = {
+    "A+": 1, "A": 2, "A-": 3,
+    "B+": 4, "B": 5, "B-": 6,
+    "C+": 7, "C": 8, "C-": 9,
+    "D+": 10, "D": 11, "D-": 12,
+    "F": 13,
+    "S": 14,  # Satisfactory
+    "IP (In Progress)": 15  # In Progress (highest precedence since incomplete)
+}
+
+# Requirement buckets; subject areas are SUBJECT_AREA_<subject code>. The subject area
+# and elective buckets share their name with their summary row.
+CORE_BUCKET = "CORE"
+CORE_OPTIONS_BUCKET = "CORE_OPTIONS"
+ELECTIVES_BUCKET = "ELECTIVES"
+SUBJECT_AREA_PREFIX = "SUBJECT_AREA_"
+
+
+class ProgramCourse(NamedTuple):
+    """A core or core-option course of a program, joined with its catalog data."""
+    course_code: str
+    credits: float
+    prerequisites: Optional[str] = None
+    corequisites: Optional[str] = None
+
+
+class ProgramRequirements(NamedTuple):
+    """Immutable snapshot of everything the eligibility rules need to know about a program."""
+    program_id: str
+    core_credit_req: int
+    core_options_credit_req: int
+    elective_credit_req: int
+    elective_exceptions: Tuple[str, ...]
+    core_courses: Tuple[ProgramCourse, ...]
+    core_option_courses: Tuple[ProgramCourse, ...]
+    subject_areas: Mapping[str, int]
+    elective_subjects: FrozenSet[str]
+    program_name: str = ""
+    max_credit_hours: int = 0
+    min_gpa: float = 0.0
+
+    def __reduce__(self):
+        # MappingProxyType cannot be pickled; rebuild it on load so programs can be sent to process pools
+        fields = self._asdict()
+        fields["subject_areas"] = dict(self.subject_areas)
+        return (_restore_program_requirements, (fields,))
+
+
+def _restore_program_requirements(fields):
+    return ProgramRequirements(**{**fields, "subject_areas": MappingProxyType(fields["subject_areas"])})
+
+
+class TranscriptCourse(NamedTuple):
+    course_code: str
+    credits: float
+    grade: str
+
+
+class Transcript(NamedTuple):
+    """A user's courses in transcript order plus an index by course code."""
+    courses: Tuple[TranscriptCourse, ...]
+    by_code: Mapping[str, TranscriptCourse]
+
+
+class RequirementProgress(NamedTuple):
+    """Credits counted toward one requirement bucket (in-progress courses count, failed ones do not)."""
+    requirement: str
+    credits: float
+    required_credits: float
+    courses: Tuple[str, ...]
+
+    @property
+    def satisfied(self) -> bool:
+        return self.credits >= self.required_credits
+
+
+class EligibilityRecord(NamedTuple):
+    """One USER_ELIGIBILITY row: (COURSE_OR_REQUIREMENT, ELIGIBLE, DETAILS, STATUS)."""
+    course_or_requirement: str
+    eligible: bool
+    details: str
+    status: str
+
+
+def build_program_requirements(program_requirements: Dict[str, Any], core_courses: Iterable[Dict[str, Any]],
+                               core_option_courses: Iterable[Dict[str, Any]], subject_areas: Mapping[str, int],
+                               elective_subjects: Iterable[str]) -> ProgramRequirements:
+    """
+    Freezes the program data returned by the fetch_* helpers into a ProgramRequirements.
+
+    :param program_requirements: Output of fetch_program_requirements.
+    :param core_courses: Dicts with course_code, credits and optionally prerequisites/corequisites.
+    :param core_option_courses: Same shape as core_courses.
+    :param subject_areas: Subject code -> minimum credit hours.
+    :param elective_subjects: Subject codes that count as program electives.
+    """
+    def freeze_courses(courses):
+        return tuple(
+            ProgramCourse(course["course_code"], course["credits"], course.get("prerequisites"), course.get("corequisites"))
+            for course in courses
+        )
+
+    return ProgramRequirements(
+        program_id=program_requirements["program_id"],
+        core_credit_req=program_requirements["core_credit_req"],
+        core_options_credit_req=program_requirements["core_options_credit_req"],
+        elective_credit_req=program_requirements["elective_credit_req"],
+        elective_exceptions=tuple(program_requirements.get("elective_exceptions") or ()),
+        core_courses=freeze_courses(core_courses),
+        core_option_courses=freeze_courses(core_option_courses),
+        subject_areas=MappingProxyType(dict(subject_areas)),
+        elective_subjects=frozenset(elective_subjects),
+        program_name=program_requirements.get("program_name") or "",
+        max_credit_hours=program_requirements.get("max_credit_hours") or 0,
+        min_gpa=program_requirements.get("min_gpa") or 0.0,
+    )
+
+
+def index_transcript(completed_courses: Iterable[Dict[str, Any]]) -> Transcript:
+    """
+    Builds an indexed transcript from course dicts (course_code, credits, grade).
+    The index keeps the first occurrence of a course code, matching transcript order.
+    """
+    courses = tuple(
+        TranscriptCourse(course["course_code"], course["credits"], course["grade"])
+        for course in completed_courses
+    )
+    by_code = {}
+    for course in courses:
+        by_code.setdefault(course.course_code, course)
+    return Transcript(courses=courses, by_code=MappingProxyType(by_code))
+
+
+def consolidate_requirements(completed, required, courses, category, electives=None, exceptions=None):
+    course_list = ", ".join(courses)
+    additional_info = ""
+    if electives:
+        additional_info += f" Electives are subject code with ({', '.join(electives)})."
+    if exceptions:
+        additional_info += f" Exceptions are ({', '.join(exceptions)})."
+    return (
+        f"{completed}/{required} credits completed for {category} requirements. "
+        f"Which are ({course_list})." + additional_info
+    )
+
+
+def compute_eligibility(program: ProgramRequirements, transcript: Transcript) -> List[EligibilityRecord]:
+    """
+    Applies the program rules to a transcript without any I/O.
+
+    :param program: Immutable program requirements.
+    :param transcript: Indexed transcript from index_transcript.
+    :return: Eligibility records in the order they are written to USER_ELIGIBILITY.
+    """
+    return evaluate_program(program, transcript)[0]
+
+
+def requirement_progress(program: ProgramRequirements, transcript: Transcript) -> List[RequirementProgress]:
+    """Per-bucket credit progress (core, core options, each subject area, electives) for a transcript."""
+    return evaluate_program(program, transcript)[1]
+
+
+def evaluate_program(program: ProgramRequirements,
+                     transcript: Transcript) -> Tuple[List[EligibilityRecord], List[RequirementProgress]]:
+    """Eligibility records plus the credit progress of every requirement bucket, in one pass."""
+    records = []
+    add = records.append
+    elective_subjects = program.elective_subjects
+
+    # ---- Core Requirements ----
+    processed_courses = set()  # Tracks courses processed for core, core options, and electives
+    core_credits = 0
+    core_courses_taken = []
+
+    for core_course in program.core_courses:
+        course_code = core_course.course_code
+        if course_code in processed_courses:
+            continue
+        processed_courses.add(course_code)
+
+        user_course = transcript.by_code.get(course_code)
+        if user_course:
+            grade = user_course.grade
+
+            if grade == FAILED_GRADE:
+                add(EligibilityRecord(
+                    course_code, True,
+                    f"Failed with grade '{grade}'. (Category: Core Requirement)", "CALCULATED"
+                ))
+                continue
+
+            core_credits += core_course.credits
+            core_courses_taken.append(course_code)
+
+            if grade == IN_PROGRESS_GRADE:
+                add(EligibilityRecord(
+                    course_code, False,
+                    f"In progress with grade '{grade}'. (Category: Core Requirement)", "PENDING"
+                ))
+                continue
+
+            add(EligibilityRecord(
+                course_code, False,
+                f"Already completed with grade '{grade}'. (Category: Core Requirement)", "CALCULATED"
+            ))
+        elif core_course.prerequisites:
+            add(EligibilityRecord(
+                course_code, True,
+                f"Have not started/completed Prerequisites: {core_course.prerequisites}. (Category: Core Requirement)", "CALCULATED"
+            ))
+        else:
+            add(EligibilityRecord(
+                course_code, True,
+                "Have not started/completed it has no prerequisites. (Category: Core Requirement)", "CALCULATED"
+            ))
+
+    # ---- Core Options Requirements ----
+    completed_core_option_credits = 0
+    core_option_courses_taken = []
+    core_options_as_electives = set()  # Courses counted as electives after core options are satisfied
+
+    for course in program.core_option_courses:
+        course_code = course.course_code
+        if course_code in processed_courses:
+            continue
+        processed_courses.add(course_code)
+
+        user_course = transcript.by_code.get(course_code)
+        if user_course:
+            grade = user_course.grade
+
+            if grade == FAILED_GRADE:
+                add(EligibilityRecord(
+                    course_code, True,
+                    f"Failed with grade '{grade}'. (Category: Core Options)", "CALCULATED"
+                ))
+                continue
+
+            if grade == IN_PROGRESS_GRADE:
+                completed_core_option_credits += course.credits
+                core_option_courses_taken.append(course_code)
+                add(EligibilityRecord(
+                    course_code, False,
+                    f"In progress with grade '{grade}'. (Category: Core Options)", "PENDING"
+                ))
+                continue
+
+            if completed_core_option_credits < program.core_options_credit_req:
+                completed_core_option_credits += course.credits
+                core_option_courses_taken.append(course_code)
+                add(EligibilityRecord(
+                    course_code, False,
+                    f"Already completed with grade '{grade}'. Counted toward core options. (Category: Core Options)",
+                    "CALCULATED"
+                ))
+            else:
+                subject_code = course_code[:4]
+                if subject_code in elective_subjects:
+                    core_options_as_electives.add(course_code)
+                    add(EligibilityRecord(
+                        course_code, True,
+                        f"This was one of Core options requirement but as it is already satified it can be counted as part of program electives under {subject_code}.",
+                        "CALCULATED"
+                    ))
+                else:
+                    add(EligibilityRecord(
+                        course_code, False,
+                        "Core options requirement already satisfied. (Category: Core Options)",
+                        "CALCULATED"
+                    ))
+        elif course.prerequisites:
+            add(EligibilityRecord(
+                course_code, True,
+                f"Have not started/completed Prerequisites: {course.prerequisites}. (Category: Core Options)", "CALCULATED"
+            ))
+        elif completed_core_option_credits < program.core_options_credit_req:
+            add(EligibilityRecord(
+                course_code, True,
+                "Have not started/completed. It has no prerequisites. Available to take as part of (Category: Core Options).", "CALCULATED"
+            ))
+        else:
+            subject_code = course_code[:4]
+            if subject_code in elective_subjects:
+                core_options_as_electives.add(course_code)
+                add(EligibilityRecord(
+                    course_code, True,
+                    "Core options requirement already satisfied but can be taken as an elective. (Category: Core Options and Elective)",
+                    "CALCULATED"
+                ))
+            else:
+                add(EligibilityRecord(
+                    course_code, True,
+                    "Core options requirement already satisfied. (Category: Core Options)",
+                    "CALCULATED"
+                ))
+
+    # ---- Subject Area and Program Electives ----
+    subject_areas = program.subject_areas
+    subject_credits = {subject_code: 0 for subject_code in subject_areas}
+    subject_area_courses = {subject_code: [] for subject_code in subject_areas}
+    program_elective_credits = 0
+    elective_courses = []
+
+    for course in transcript.courses:
+        course_code = course.course_code
+        subject_code = course_code[:4]
+        grade = course.grade
+
+        # Skip courses already processed in core requirements or core options
+        if course_code in processed_courses and course_code not in core_options_as_electives:
+            continue
+
+        if course_code in core_options_as_electives:
+            program_elective_credits += course.credits
+            elective_courses.append(course_code)
+            add(EligibilityRecord(
+                course_code, False,
+                f"Already completed with grade '{grade}'. (Core option course counted as elective)",
+                "CALCULATED"
+            ))
+            continue
+
+        if subject_code in subject_areas:
+            required_credits = subject_areas[subject_code]
+            available_credits = min(course.credits, required_credits - subject_credits[subject_code])
+
+            if grade == FAILED_GRADE:
+                add(EligibilityRecord(
+                    course_code, True,
+                    f"Failed with grade '{grade}'. (Category: Subject area)",
+                    "CALCULATED"
+                ))
+                continue
+
+            if grade == IN_PROGRESS_GRADE:
+                subject_credits[subject_code] += available_credits
+                subject_area_courses[subject_code].append(course_code)
+                add(EligibilityRecord(
+                    course_code, False,
+                    f"In progress with grade '{grade}'. (Category: Subject area)",
+                    "PENDING"
+                ))
+                continue
+
+            if available_credits > 0:
+                subject_credits[subject_code] += available_credits
+                subject_area_courses[subject_code].append(course_code)
+                add(EligibilityRecord(
+                    course_code, False,
+                    f"Already completed with grade '{grade}'. (Category: Subject area)",
+                    "CALCULATED"
+                ))
+
+            # Excess credits count as electives
+            excess_credits = course.credits - available_credits
+            if excess_credits > 0:
+                program_elective_credits += excess_credits
+                elective_courses.append(course_code)
+                add(EligibilityRecord(
+                    course_code, False,
+                    f"Already completed with grade '{grade}'. (Category: Program elective)",
+                    "CALCULATED"
+                ))
+            processed_courses.add(course_code)
+            continue
+
+        if subject_code in elective_subjects:
+            if grade == FAILED_GRADE:
+                add(EligibilityRecord(
+                    course_code, True,
+                    f"Failed with grade '{grade}'. (Category: Program elective)",
+                    "CALCULATED"
+                ))
+                continue
+
+            if grade == IN_PROGRESS_GRADE:
+                program_elective_credits += course.credits
+                elective_courses.append(course_code)
+                add(EligibilityRecord(
+                    course_code, False,
+                    f"In progress with grade '{grade}'. (Category: Program elective)",
+                    "PENDING"
+                ))
+                continue
+
+            program_elective_credits += course.credits
+            elective_courses.append(course_code)
+            add(EligibilityRecord(
+                course_code, False,
+                f"Already completed with grade '{grade}'. (Category: Program elective)",
+                "CALCULATED"
+            ))
+            processed_courses.add(course_code)
+
+    # Subject area summaries
+    for subject_code, required_credits in subject_areas.items():
+        completed_credits = subject_credits[subject_code]
+        add(EligibilityRecord(
+            f"SUBJECT_AREA_{subject_code}", completed_credits < required_credits,
+            consolidate_requirements(
+                completed_credits, required_credits, subject_area_courses[subject_code], f"subject area ({subject_code})"
+            ),
+            "CALCULATED"
+        ))
+
+    # Elective summary
+    elective_credit_req = program.elective_credit_req
+    add(EligibilityRecord(
+        "ELECTIVES", program_elective_credits < elective_credit_req,
+        consolidate_requirements(
+            program_elective_credits, elective_credit_req, elective_courses, "elective",
+            electives=sorted(elective_subjects), exceptions=program.elective_exceptions
+        ),
+        "CALCULATED"
+    ))
+
+    progress = [
+        RequirementProgress(CORE_BUCKET, core_credits, program.core_credit_req, tuple(core_courses_taken)),
+        RequirementProgress(CORE_OPTIONS_BUCKET, completed_core_option_credits, program.core_options_credit_req,
+                            tuple(core_option_courses_taken)),
+    ]
+    progress.extend(
+        RequirementProgress(f"{SUBJECT_AREA_PREFIX}{subject_code}", subject_credits[subject_code], required_credits,
+                            tuple(subject_area_courses[subject_code]))
+        for subject_code, required_credits in subject_areas.items()
+    )
+    progress.append(RequirementProgress(ELECTIVES_BUCKET, program_elective_credits, elective_credit_req,
+                                        tuple(elective_courses)))
+    return records, progress
+
+
+def course_buckets(program: ProgramRequirements, course_code: str) -> FrozenSet[str]:
+    """
+    Requirement buckets whose rows can change when a transcript course with this code
+    is added, removed or regraded. Mirrors the routing in compute_eligibility: core and
+    core-option courses never fall through to subject areas, and core options satisfied
+    beyond the requirement count toward electives.
+    """
+    if any(course.course_code == course_code for course in program.core_courses):
+        return frozenset({CORE_BUCKET})
+    if any(course.course_code == course_code for course in program.core_option_courses):
+        return frozenset({CORE_OPTIONS_BUCKET, ELECTIVES_BUCKET})
+    subject_code = course_code[:4]
+    if subject_code in program.subject_areas:
+        return frozenset({f"{SUBJECT_AREA_PREFIX}{subject_code}", ELECTIVES_BUCKET})
+    if subject_code in program.elective_subjects:
+        return frozenset({ELECTIVES_BUCKET})
+    return frozenset()
+
+
+def affected_buckets(program: ProgramRequirements, changed_courses: Iterable[str]) -> FrozenSet[str]:
+    """Union of course_buckets over every added, removed or changed course code."""
+    buckets = set()
+    for course_code in changed_courses:
+        buckets |= course_buckets(program, course_code)
+    return frozenset(buckets)
+
+
+def rows_to_rewrite(program: ProgramRequirements, records: Iterable[EligibilityRecord],
+                    changed_courses: Iterable[str]) -> Tuple[FrozenSet[str], List[EligibilityRecord]]:
+    """
+    Works out the minimal slice of USER_ELIGIBILITY to replace after a transcript change.
+
+    :param records: Full compute_eligibility output for the updated transcript.
+    :param changed_courses: Course codes added, removed or changed since the last write.
+    :return: (codes, records) where `codes` are the COURSE_OR_REQUIREMENT values to delete
+             and `records` the new rows to insert for them. Rows with any other code are
+             unaffected by the change.
+    """
+    changed_courses = set(changed_courses)
+    buckets = affected_buckets(program, changed_courses)
+    if not buckets:
+        return frozenset(), []
+
+    # Summary rows of affected buckets plus every course row that can belong to one
+    codes = {bucket for bucket in buckets if bucket == ELECTIVES_BUCKET or bucket.startswith(SUBJECT_AREA_PREFIX)}
+    for course_code in changed_courses | {record.course_or_requirement for record in records}:
+        if course_code not in codes and course_buckets(program, course_code) & buckets:
+            codes.add(course_code)
+
+    # A code can have rows in more than one bucket, so all of its rows are replaced together
+    return frozenset(codes), [record for record in records if record.course_or_requirement in codes]
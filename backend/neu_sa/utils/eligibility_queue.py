@@ -0,0 +1,341 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from neu_sa.utils.recalculate_eligibility import recalculate_eligibility
+
+# Local job store and worker settings
+ELIGIBILITY_QUEUE_PATH = os.getenv("ELIGIBILITY_QUEUE_PATH", "eligibility_queue.db")
+ELIGIBILITY_QUEUE_WORKERS = int(os.getenv("ELIGIBILITY_QUEUE_WORKERS", "2"))
+ELIGIBILITY_QUEUE_MAX_ATTEMPTS = int(os.getenv("ELIGIBILITY_QUEUE_MAX_ATTEMPTS", "3"))
+ELIGIBILITY_QUEUE_RETRY_BACKOFF = float(os.getenv("ELIGIBILITY_QUEUE_RETRY_BACKOFF", "5"))
+# Seconds to wait for another process's write lock on the queue file
+ELIGIBILITY_QUEUE_BUSY_TIMEOUT = float(os.getenv("ELIGIBILITY_QUEUE_BUSY_TIMEOUT", "30"))
+
+# Job states
+PENDING = "PENDING"
+RUNNING = "RUNNING"
+DONE = "DONE"
+FAILED = "FAILED"
+
+
+def merge_changes(current, new):
+    """Union of two changed-course lists; None means a full rebuild and absorbs everything."""
+    if current is None or new is None:
+        return None
+    return sorted(set(current) | set(new))
+
+
+class InMemoryJobStore:
+    """Job store kept in a dict; used as the test stand-in for SQLiteJobStore."""
+
+    def __init__(self):
+        self.jobs = {}
+
+    @contextmanager
+    def transaction(self):
+        yield
+
+    def get(self, user_id):
+        job = self.jobs.get(user_id)
+        return dict(job) if job else None
+
+    def put(self, job):
+        self.jobs[job["user_id"]] = dict(job)
+
+    def next_due(self, now):
+        due = [job for job in self.jobs.values() if job["status"] == PENDING and job["next_run_at"] <= now]
+        return dict(min(due, key=lambda job: job["next_run_at"])) if due else None
+
+    def next_wakeup(self):
+        pending = [job["next_run_at"] for job in self.jobs.values() if job["status"] == PENDING]
+        return min(pending) if pending else None
+
+    def running(self):
+        return [dict(job) for job in self.jobs.values() if job["status"] == RUNNING]
+
+
+class SQLiteJobStore:
+    """
+    Durable job store in a local SQLite file, one row per user. Pending work survives
+    restarts. The queue serializes its own threads, so they share one connection; other
+    processes on the same file (e.g. bulk_transcript_import) are kept out by the queue's
+    read-modify-write steps running in transaction(), which holds the file's write lock.
+    """
+
+    COLUMNS = (
+        "USER_ID", "STATUS", "VERSION", "CLAIMED_VERSION", "COMPLETED_VERSION", "CHANGED_COURSES",
+        "RUNNING_CHANGES", "ATTEMPTS", "NEXT_RUN_AT", "LAST_ERROR", "REQUESTED_AT", "STARTED_AT", "COMPLETED_AT",
+    )
+    JSON_COLUMNS = {"CHANGED_COURSES", "RUNNING_CHANGES"}
+
+    def __init__(self, path=ELIGIBILITY_QUEUE_PATH):
+        self.path = path
+        self._conn = None
+
+    def _connection(self):
+        # Opened lazily so importing the module does not create the file
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=ELIGIBILITY_QUEUE_BUSY_TIMEOUT,
+                                         isolation_level=None, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ELIGIBILITY_JOBS (
+                    USER_ID INTEGER PRIMARY KEY,
+                    STATUS TEXT,
+                    VERSION INTEGER,
+                    CLAIMED_VERSION INTEGER,
+                    COMPLETED_VERSION INTEGER,
+                    CHANGED_COURSES TEXT,
+                    RUNNING_CHANGES TEXT,
+                    ATTEMPTS INTEGER,
+                    NEXT_RUN_AT REAL,
+                    LAST_ERROR TEXT,
+                    REQUESTED_AT REAL,
+                    STARTED_AT REAL,
+                    COMPLETED_AT REAL
+                )
+                """
+            )
+        return self._conn
+
+    @contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE takes the write lock up front, so a read and the put based on it are atomic."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _to_job(self, row):
+        if row is None:
+            return None
+        job = {}
+        for column, value in zip(self.COLUMNS, row):
+            job[column.lower()] = json.loads(value) if column in self.JSON_COLUMNS and value is not None else value
+        return job
+
+    def _select(self, where, params=()):
+        return self._connection().execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM ELIGIBILITY_JOBS {where}", params
+        ).fetchall()
+
+    def get(self, user_id):
+        rows = self._select("WHERE USER_ID = ?", (user_id,))
+        return self._to_job(rows[0]) if rows else None
+
+    def put(self, job):
+        values = [
+            json.dumps(job.get(column.lower())) if column in self.JSON_COLUMNS else job.get(column.lower())
+            for column in self.COLUMNS
+        ]
+        self._connection().execute(
+            f"INSERT OR REPLACE INTO ELIGIBILITY_JOBS ({', '.join(self.COLUMNS)}) "
+            f"VALUES ({', '.join(['?'] * len(self.COLUMNS))})",
+            values,
+        )
+
+    def next_due(self, now):
+        rows = self._select("WHERE STATUS = ? AND NEXT_RUN_AT <= ? ORDER BY NEXT_RUN_AT LIMIT 1", (PENDING, now))
+        return self._to_job(rows[0]) if rows else None
+
+    def next_wakeup(self):
+        row = self._connection().execute(
+            "SELECT MIN(NEXT_RUN_AT) FROM ELIGIBILITY_JOBS WHERE STATUS = ?", (PENDING,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def running(self):
+        return [self._to_job(row) for row in self._select("WHERE STATUS = ?", (RUNNING,))]
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def _recalculate(user_id, changed_courses):
+    return recalculate_eligibility(user_id, changed_courses, raise_errors=True)
+
+
+def _timestamp(value):
+    return datetime.fromtimestamp(value, tz=timezone.utc).isoformat() if value else None
+
+
+class EligibilityQueue:
+    """
+    Eligibility recalculation jobs with per-user coalescing, a bounded worker pool and retries.
+
+    Each user has at most one job. Requests made while a job is pending are merged into it
+    (changed courses are unioned), so only the latest state is computed; requests made while it
+    runs schedule exactly one follow-up run.
+    """
+
+    def __init__(self, store, handler=_recalculate, workers=ELIGIBILITY_QUEUE_WORKERS,
+                 max_attempts=ELIGIBILITY_QUEUE_MAX_ATTEMPTS, retry_backoff=ELIGIBILITY_QUEUE_RETRY_BACKOFF,
+                 poll_interval=1.0):
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.poll_interval = poll_interval
+        self._condition = threading.Condition()
+        self._threads = []
+        self._stopping = False
+
+    def start(self):
+        """Requeue jobs interrupted by a restart and start the worker threads."""
+        with self._condition, self.store.transaction():
+            for job in self.store.running():
+                job.update(
+                    status=PENDING,
+                    changed_courses=merge_changes(job["running_changes"], job["changed_courses"]),
+                    running_changes=None,
+                    next_run_at=time.time(),
+                )
+                self.store.put(job)
+            self._stopping = False
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"eligibility-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=10):
+        """Stop the workers; a job still running is requeued on the next start."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def enqueue(self, user_id, changed_courses=None):
+        """
+        Requests a recalculation for a user.
+
+        :param changed_courses: Course codes that changed (incremental run), or None for a full rebuild.
+        :return: The user's requested version; the result is fresh once completed_version reaches it.
+        """
+        changed_courses = sorted(changed_courses) if changed_courses is not None else None
+        now = time.time()
+        with self._condition:
+            with self.store.transaction():
+                job = self.store.get(user_id)
+                if job is None:
+                    job = {
+                        "user_id": user_id, "status": PENDING, "version": 1, "claimed_version": None,
+                        "completed_version": 0, "changed_courses": changed_courses, "running_changes": None,
+                        "attempts": 0, "next_run_at": now, "last_error": None, "requested_at": now,
+                        "started_at": None, "completed_at": None,
+                    }
+                elif job["status"] == RUNNING:
+                    # Picked up again when the running job completes
+                    job.update(version=job["version"] + 1, requested_at=now,
+                               changed_courses=merge_changes(job["changed_courses"], changed_courses))
+                else:
+                    # A failed job still owes its changes (merged back by _finish); only DONE starts clean
+                    pending_changes = [] if job["status"] == DONE else job["changed_courses"]
+                    job.update(status=PENDING, version=job["version"] + 1, requested_at=now, attempts=0,
+                               next_run_at=now, changed_courses=merge_changes(pending_changes, changed_courses))
+                self.store.put(job)
+            self._condition.notify()
+            return job["version"]
+
+    def status(self, user_id):
+        """Freshness of a user's eligibility as seen by the queue."""
+        with self._condition:
+            job = self.store.get(user_id)
+        if job is None:
+            return {"status": "unknown", "requested_version": 0, "completed_version": 0}
+
+        if job["status"] == DONE:
+            state = "fresh"
+        elif job["status"] == PENDING and job["last_error"]:
+            state = "retrying"
+        else:
+            state = job["status"].lower()
+        return {
+            "status": state,
+            "requested_version": job["version"],
+            "completed_version": job["completed_version"],
+            "attempts": job["attempts"],
+            "last_error": job["last_error"],
+            "requested_at": _timestamp(job["requested_at"]),
+            "completed_at": _timestamp(job["completed_at"]),
+        }
+
+    def wait_until_idle(self, timeout=10):
+        """Block until no job is pending or running (used by tests and scripts)."""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self._condition:
+                if self.store.next_wakeup() is None and not self.store.running():
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def _claim(self):
+        with self._condition:
+            while not self._stopping:
+                now = time.time()
+                with self.store.transaction():
+                    job = self.store.next_due(now)
+                    if job is not None:
+                        job.update(status=RUNNING, claimed_version=job["version"], running_changes=job["changed_courses"],
+                                   changed_courses=[], started_at=now, attempts=job["attempts"] + 1)
+                        self.store.put(job)
+                if job is not None:
+                    return job
+                next_wakeup = self.store.next_wakeup()
+                wait = self.poll_interval if next_wakeup is None else min(self.poll_interval, max(next_wakeup - now, 0))
+                self._condition.wait(wait)
+            return None
+
+    def _finish(self, claimed, error=None):
+        now = time.time()
+        with self._condition, self.store.transaction():
+            job = self.store.get(claimed["user_id"])
+            superseded = job["version"] != claimed["claimed_version"]
+            if error is None:
+                job.update(completed_version=claimed["claimed_version"], completed_at=now, last_error=None,
+                           running_changes=None)
+                if superseded:
+                    job.update(status=PENDING, attempts=0, next_run_at=now)
+                else:
+                    job.update(status=DONE)
+            else:
+                job.update(changed_courses=merge_changes(claimed["running_changes"], job["changed_courses"]),
+                           running_changes=None, last_error=str(error))
+                if superseded:
+                    job.update(status=PENDING, attempts=0, next_run_at=now)
+                elif job["attempts"] < self.max_attempts:
+                    job.update(status=PENDING, next_run_at=now + self.retry_backoff * 2 ** (job["attempts"] - 1))
+                else:
+                    job.update(status=FAILED)
+            self.store.put(job)
+            self._condition.notify_all()
+
+    def _work(self):
+        while True:
+            job = self._claim()
+            if job is None:
+                return
+            try:
+                self.handler(job["user_id"], job["running_changes"])
+            except Exception as e:
+                print(f"Eligibility job for user_id {job['user_id']} failed (attempt {job['attempts']}): {e}")
+                self._finish(job, error=e)
+            else:
+                self._finish(job)
+
+
+# Shared queue started and stopped with the FastAPI app
+eligibility_queue = EligibilityQueue(SQLiteJobStore())
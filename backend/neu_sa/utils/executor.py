@@ -0,0 +1,48 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Concurrency limits for each blocking resource. Every resource gets its own
+# bounded thread pool, so a burst of slow warehouse queries cannot starve
+# password hashing (or the other way around) and neither runs on the event loop.
+RESOURCE_LIMITS = {
+    "snowflake": int(os.getenv("SNOWFLAKE_MAX_CONCURRENCY", "8")),
+    "argon2": int(os.getenv("ARGON2_MAX_CONCURRENCY", str(os.cpu_count() or 2))),
+    "compute": int(os.getenv("COMPUTE_MAX_CONCURRENCY", str(os.cpu_count() or 2))),
+    "aws": int(os.getenv("AWS_MAX_CONCURRENCY", "8")),
+}
+
+_executors = {}
+
+
+def get_executor(resource: str) -> ThreadPoolExecutor:
+    """Return the bounded executor dedicated to the given resource."""
+    if resource not in RESOURCE_LIMITS:
+        raise ValueError(f"Unknown blocking resource: {resource}")
+    executor = _executors.get(resource)
+    if executor is None:
+        executor = _executors.setdefault(
+            resource,
+            ThreadPoolExecutor(max_workers=RESOURCE_LIMITS[resource], thread_name_prefix=f"neu-sa-{resource}"),
+        )
+    return executor
+
+
+async def run_blocking(resource: str, func, *args, **kwargs):
+    """
+    Run a blocking callable on the executor for `resource` and await its result.
+
+    :param resource: Name of the resource pool (e.g. "snowflake", "argon2", "compute", "aws").
+    :param func: Blocking callable to run.
+    :return: Whatever `func` returns; exceptions are re-raised in the caller.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(resource), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executors():
+    """Shut down every resource executor (called on application shutdown)."""
+    for executor in list(_executors.values()):
+        executor.shutdown(wait=False)
+    _executors.clear()
@@ -0,0 +1,358 @@
+import heapq
+import math
+import os
+import re
+import time
+from datetime import date
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from neu_sa.utils.eligibility_kernel import (
+    CORE_BUCKET,
+    CORE_OPTIONS_BUCKET,
+    ELECTIVES_BUCKET,
+    FAILED_GRADE,
+    ProgramRequirements,
+    course_buckets,
+    evaluate_program,
+    index_transcript,
+)
+from neu_sa.utils.prerequisite_graph import PrerequisiteGraph, best_grades
+from neu_sa.utils.what_if import DEFAULT_COURSE_CREDITS
+
+# Planner limits
+GRADUATION_PLAN_TERM_CREDITS = float(os.getenv("GRADUATION_PLAN_TERM_CREDITS", "8"))
+GRADUATION_PLAN_MAX_TERMS = int(os.getenv("GRADUATION_PLAN_MAX_TERMS", "6"))
+GRADUATION_PLAN_TIME_BUDGET = float(os.getenv("GRADUATION_PLAN_TIME_BUDGET", "1.0"))
+GRADUATION_PLAN_BRANCHING = int(os.getenv("GRADUATION_PLAN_BRANCHING", "6"))
+
+# Planned courses are assumed to be passed (and to meet minimum grades of later prerequisites)
+PLANNED_GRADE = "A"
+
+# Campuses whose sections every student can register for
+ANY_CAMPUS = ("Online", "No campus, no room needed")
+
+SEASON_ORDER = {"Spring": 0, "Summer": 1, "Fall": 2}
+
+
+class Term(NamedTuple):
+    """Courses offered in one term; projected terms repeat a known term's offerings a year later."""
+    name: str
+    courses: FrozenSet[str]
+    projected: bool = False
+
+
+class PlannedTerm(NamedTuple):
+    term: str
+    courses: Tuple[str, ...]
+    credits: float
+    projected: bool
+
+
+class GraduationPlan(NamedTuple):
+    terms: Tuple[PlannedTerm, ...]
+    total_credits: float
+
+    @property
+    def graduation_term(self) -> Optional[str]:
+        return self.terms[-1].term if self.terms else None
+
+
+def term_sort_key(term: str):
+    """Chronological key for CLASSES terms such as 'Spring 2025 Semester' or 'Summer 1 2025 Semester'."""
+    year = re.search(r"\d{4}", term)
+    season = next((index for name, index in SEASON_ORDER.items() if name in term), len(SEASON_ORDER))
+    part = re.search(r"Summer (\d)", term)
+    return (int(year.group()) if year else 0, season, int(part.group(1)) if part else 0, term)
+
+
+def current_term_key(today: Optional[date] = None) -> Tuple[int, int, int]:
+    """term_sort_key prefix of the term in progress on `today` (Summer 1 runs May-June, Summer 2 July-August)."""
+    today = today or date.today()
+    if today.month <= 4:
+        return (today.year, SEASON_ORDER["Spring"], 0)
+    if today.month <= 8:
+        return (today.year, SEASON_ORDER["Summer"], 1 if today.month <= 6 else 2)
+    return (today.year, SEASON_ORDER["Fall"], 0)
+
+
+def academic_year(term: str) -> int:
+    """Calendar year in which the term's academic year (Fall through Summer) starts."""
+    year, season = term_sort_key(term)[:2]
+    return year if season == SEASON_ORDER["Fall"] else year - 1
+
+
+# Fetch the terms in which each course is offered for a campus (online sections count everywhere)
+def fetch_class_offerings(conn, campus: Optional[str]) -> List[Term]:
+    cursor = conn.cursor()
+    try:
+        campuses = ANY_CAMPUS + ((campus,) if campus else ())
+        cursor.execute(
+            f"""
+            SELECT DISTINCT TERM, COURSE_CODE
+            FROM CLASSES
+            WHERE CAMPUS IN ({', '.join(['%s'] * len(campuses))});
+            """,
+            campuses,
+        )
+        offerings = {}
+        for term, course_code in cursor.fetchall():
+            offerings.setdefault(term, set()).add(course_code)
+    finally:
+        cursor.close()
+    return [Term(term, frozenset(offerings[term])) for term in sorted(offerings, key=term_sort_key)]
+
+
+def project_terms(terms: Sequence[Term], count: int, after: Optional[Tuple[int, int, int]] = None) -> List[Term]:
+    """
+    The first `count` terms in chronological order, extending the known schedule by repeating
+    the latest academic year's offerings one, two, ... years later (CLASSES only holds the terms
+    published so far). Projected names that are already known are skipped, and projected terms
+    are flagged in the plans. With `after` (a current_term_key), terms at or before it are dropped.
+    """
+    def upcoming(term: Term) -> bool:
+        return after is None or term_sort_key(term.name)[:3] > after
+
+    if not terms:
+        return []
+    latest_year = max(academic_year(term.name) for term in terms)
+    template = [term for term in terms if academic_year(term.name) == latest_year]
+    names = {term.name for term in terms}
+    result = [term for term in terms if upcoming(term)]
+
+    cycle = 0
+    while len(result) < count:
+        cycle += 1
+        for term in template:
+            name = re.sub(r"\d{4}", lambda match: str(int(match.group()) + cycle), term.name, count=1)
+            projected = Term(name, term.courses, True)
+            if name not in names and upcoming(projected):
+                names.add(name)
+                result.append(projected)
+
+    result.sort(key=lambda term: term_sort_key(term.name))
+    return result[:count]
+
+
+class GraduationPlanner:
+    """
+    Searches term-by-term course plans that complete a program's remaining requirements.
+
+    A plan assigns offered courses to terms such that each course's prerequisites are met by
+    the transcript plus courses planned in earlier terms, no term exceeds the term credit cap
+    and the plan stays within the program's MAX_CREDIT_HOURS. Plans are ranked by graduation
+    term, then total credits.
+
+    The search is a memoized recursion over (term, courses planned so far): a state's best
+    continuations are computed once however the planned courses were split across earlier
+    terms. It runs with an increasing term horizon, so states that cannot finish within it
+    are pruned by a credit lower bound, and stops at the first horizon with k plans.
+    """
+
+    def __init__(self, program: ProgramRequirements, completed_courses: Iterable[Mapping[str, Any]],
+                 terms: Sequence[Term], course_credits: Mapping[str, float],
+                 prerequisite_graph: Optional[PrerequisiteGraph] = None,
+                 max_term_credits: float = GRADUATION_PLAN_TERM_CREDITS,
+                 max_branching: int = GRADUATION_PLAN_BRANCHING):
+        self.program = program
+        self.completed_courses = [dict(course) for course in completed_courses]
+        self.terms = list(terms)
+        self.course_credits = course_credits
+        self.prerequisite_graph = prerequisite_graph or PrerequisiteGraph({})
+        self.max_term_credits = max_term_credits
+        self.max_branching = max_branching
+
+        # Courses that already count (passed or in progress) are never planned again
+        self._done = {course["course_code"] for course in self.completed_courses if course["grade"] != FAILED_GRADE}
+        self._base_grades = best_grades(self.completed_courses)
+        completed_credits = sum(course["credits"] or 0 for course in self.completed_courses if course["grade"] != FAILED_GRADE)
+        self._credit_allowance = (
+            program.max_credit_hours - completed_credits if program.max_credit_hours else math.inf
+        )
+        self._core_courses = {course.course_code for course in program.core_courses}
+        self._exceptions = set(program.elective_exceptions)
+        self._states = {}
+        self._memo = {}
+        self._deadline = math.inf
+        self.timed_out = False
+        self.explored = 0
+
+    def credits(self, course_code: str) -> float:
+        return self.course_credits.get(course_code, DEFAULT_COURSE_CREDITS)
+
+    def _state(self, planned: FrozenSet[str]):
+        """(unmet buckets, lower bound on credits still needed) after taking `planned`."""
+        state = self._states.get(planned)
+        if state is None:
+            # Planned retakes replace failed attempts (the transcript index keeps the first occurrence)
+            courses = [course for course in self.completed_courses if course["course_code"] not in planned]
+            courses.extend(
+                {"course_code": course_code, "credits": self.credits(course_code), "grade": PLANNED_GRADE}
+                for course_code in sorted(planned)
+            )
+            _, progress = evaluate_program(self.program, index_transcript(courses))
+            unmet = {bucket.requirement: bucket.required_credits - bucket.credits
+                     for bucket in progress if not bucket.satisfied}
+
+            # Core is complete once every core course is taken, whatever the core credit requirement says
+            missing_core = self._core_courses - self._done - planned
+            if missing_core:
+                unmet[CORE_BUCKET] = max(unmet.get(CORE_BUCKET, 0), sum(self.credits(code) for code in missing_core))
+            else:
+                unmet.pop(CORE_BUCKET, None)
+
+            # A course counts toward a single bucket, so the deficits add up
+            state = (frozenset(unmet), sum(unmet.values()))
+            self._states[planned] = state
+        return state
+
+    def _candidates(self, term: Term, planned: FrozenSet[str], unmet: FrozenSet[str]) -> List[str]:
+        grades = dict(self._base_grades)
+        grades.update((course_code, PLANNED_GRADE) for course_code in planned)
+        graph = self.prerequisite_graph
+
+        by_priority = {}
+        for course_code in term.courses:
+            if course_code in self._done or course_code in planned or course_code in self._exceptions:
+                continue
+            buckets = course_buckets(self.program, course_code) & unmet
+            if not buckets:
+                continue
+            if not graph.can_take(course_code, grades):
+                continue
+            if CORE_BUCKET in buckets:
+                priority = 0
+            elif CORE_OPTIONS_BUCKET in buckets:
+                priority = 1
+            elif buckets != {ELECTIVES_BUCKET}:
+                priority = 2
+            else:
+                priority = 3
+            by_priority.setdefault(priority, []).append(course_code)
+
+        # Courses that unlock more of the catalog first; interchangeable electives are capped
+        candidates = []
+        for priority in sorted(by_priority):
+            courses = sorted(by_priority[priority], key=lambda code: (-len(graph.unlocks(code)), code))
+            candidates.extend(courses if priority == 0 else courses[:self.max_branching])
+        return candidates
+
+    def _choices(self, candidates: List[str], credit_cap: float, credits_needed: float) -> List[Tuple[str, ...]]:
+        """
+        Up to max_branching course sets, highest priority first. Sets are maximal for the credit
+        cap unless they already cover the credits still needed.
+        """
+        credits = [self.credits(code) for code in candidates]
+        choices = []
+
+        def extend(start, chosen, total):
+            if len(choices) >= self.max_branching:
+                return
+            if chosen and total >= credits_needed:
+                choices.append(tuple(sorted(candidates[index] for index in chosen)))
+                return
+            extended = False
+            for index in range(start, len(candidates)):
+                if total + credits[index] <= credit_cap:
+                    extended = True
+                    extend(index + 1, chosen + (index,), total + credits[index])
+                    if len(choices) >= self.max_branching:
+                        return
+            # Only keep sets no other candidate can be added to
+            if not extended and chosen and not any(
+                total + credits[index] <= credit_cap for index in range(len(candidates)) if index not in chosen
+            ):
+                choices.append(tuple(sorted(candidates[index] for index in chosen)))
+
+        extend(0, (), 0.0)
+        return choices
+
+    def _solve(self, index: int, planned: FrozenSet[str], planned_credits: float, horizon: int, k: int):
+        """Best (cost, terms) continuations from term `index`; cost is (graduation term, credits)."""
+        key = (index, planned)
+        if key in self._memo:
+            return self._memo[key]
+        self.explored += 1
+
+        unmet, credits_needed = self._state(planned)
+        if not unmet:
+            result = [((index, 0.0), ())]
+        elif (index >= horizon or time.perf_counter() > self._deadline
+              or credits_needed > self._credit_allowance - planned_credits
+              or index + math.ceil(credits_needed / self.max_term_credits) > horizon):
+            self.timed_out = self.timed_out or time.perf_counter() > self._deadline
+            result = []
+        else:
+            term_cap = min(self.max_term_credits, self._credit_allowance - planned_credits)
+            candidates = self._candidates(self.terms[index], planned, unmet)
+            choices = self._choices(candidates, term_cap, credits_needed) or [()]  # Nothing useful to take: skip the term
+
+            continuations = []
+            for choice in choices:
+                choice_credits = sum(self.credits(code) for code in choice)
+                for (finish, credits), suffix in self._solve(index + 1, planned | frozenset(choice),
+                                                             planned_credits + choice_credits, horizon, k):
+                    step = ((index, choice),) if choice else ()
+                    continuations.append(((finish, credits + choice_credits), step + suffix))
+            result = heapq.nsmallest(k, continuations)
+        self._memo[key] = result
+        return result
+
+    def plan(self, k: int = 3, time_budget: float = GRADUATION_PLAN_TIME_BUDGET) -> List[GraduationPlan]:
+        """
+        Top-k plans found within `time_budget` seconds (fewer, possibly none, if the budget runs
+        out or the requirements cannot be met within the known terms). Sets `timed_out`.
+        """
+        started = time.perf_counter()
+        self._deadline = started + time_budget
+        self.timed_out = False
+        self.explored = 0
+
+        _, credits_needed = self._state(frozenset())
+        results = []
+        first_horizon = min(math.ceil(credits_needed / self.max_term_credits), len(self.terms))
+        for horizon in range(first_horizon, len(self.terms) + 1):
+            self._memo = {}  # Results depend on the horizon
+            results = self._solve(0, frozenset(), 0.0, horizon, k)
+            if len(results) >= k or self.timed_out or not credits_needed:
+                break
+
+        return [
+            GraduationPlan(
+                tuple(
+                    PlannedTerm(self.terms[index].name, choice, sum(self.credits(code) for code in choice),
+                                self.terms[index].projected)
+                    for index, choice in steps
+                ),
+                total_credits,
+            )
+            for (_, total_credits), steps in results
+        ]
+
+
+def plan_graduation(program: ProgramRequirements, completed_courses: Iterable[Mapping[str, Any]],
+                    terms: Sequence[Term], course_credits: Mapping[str, float],
+                    prerequisite_graph: Optional[PrerequisiteGraph] = None, k: int = 3,
+                    time_budget: float = GRADUATION_PLAN_TIME_BUDGET,
+                    max_terms: int = GRADUATION_PLAN_MAX_TERMS, today: Optional[date] = None,
+                    **options) -> List[GraduationPlan]:
+    """
+    Plans over the terms after the one in progress on `today` (default: the current date),
+    projected to `max_terms`; see GraduationPlanner for the options.
+    """
+    upcoming = project_terms(terms, max_terms, after=current_term_key(today))
+    planner = GraduationPlanner(program, completed_courses, upcoming, course_credits, prerequisite_graph, **options)
+    plans = planner.plan(k, time_budget)
+    print(f"Graduation planner explored {planner.explored} states, found {len(plans)} plans"
+          f"{' (time budget reached)' if planner.timed_out else ''}.")
+    return plans
+
+
+def plans_to_dicts(plans: Iterable[GraduationPlan]) -> List[Dict[str, Any]]:
+    """JSON-friendly plans for the agent state and API responses."""
+    return [
+        {
+            "graduation_term": plan.graduation_term,
+            "total_credits": plan.total_credits,
+            "terms": [term._asdict() for term in plan.terms],
+        }
+        for plan in plans
+    ]
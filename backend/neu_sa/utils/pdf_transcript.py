@@ -0,0 +1,105 @@
+import re
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+from PyPDF2 import PdfReader
+from neu_sa.utils.transcript_parser import IN_PROGRESS_GRADE, MAX_COURSE_CREDITS
+
+# Local parse of registrar transcripts that have a text layer. Each table row of the
+# transcript is one line of extracted text, so rows are matched line by line; uploads
+# without a usable text layer (scans) fail validation and go to Textract instead.
+
+# SUBJ NNNN LEVEL Title [Grade] [Credit hours] [Quality points ...]
+COURSE_LINE = re.compile(
+    r"^(?P<subject>[A-Z]{2,5})\s*(?P<number>\d{4})\s*(?P<level>GR|UG)\s*(?P<title>.+?)"
+    r"(?:\s+(?P<grade>[A-F][+-]?|S|N/A))?(?:\s+(?P<credits>\d+\.\d+))?(?:\s+\d+\.\d+)*\s*$"
+)
+COLLEGE_LINE = re.compile(r"^College:\s*(.+)$")
+PROGRAM_LINE = re.compile(r"^Major and Department:\s*(.+)$")
+# The overall GPA is the last figure of the first "Overall:" totals line
+OVERALL_LINE = re.compile(r"^Overall:.*?([\d.]+)\s*$")
+
+
+def extract_text_lines(stream: BinaryIO) -> List[str]:
+    """Non-empty text lines of every page, in reading order."""
+    return reader_text_lines(PdfReader(stream))
+
+
+def reader_text_lines(reader: PdfReader) -> List[str]:
+    """extract_text_lines for an already parsed document."""
+    lines = []
+    for page in reader.pages:
+        lines.extend(line.strip() for line in (page.extract_text() or "").splitlines() if line.strip())
+    return lines
+
+
+def parse_transcript_lines(lines: List[str]) -> Tuple[Dict, List[Dict]]:
+    """
+    Parses transcript text lines into the same (user_profile, completed_courses) shapes as the
+    Textract table parser.
+    """
+    college = program = None
+    gpa = None
+    completed_courses = []
+    for line in lines:
+        match = COURSE_LINE.match(line)
+        if match:
+            grade, credits = match.group("grade"), match.group("credits")
+            completed_courses.append({
+                "course_code": f"{match.group('subject')} {match.group('number')}",
+                "course_name": match.group("title").strip(),
+                "grade": grade if grade else IN_PROGRESS_GRADE,
+                "credits": float(credits) if credits else 0.0,
+            })
+            continue
+        if college is None and (match := COLLEGE_LINE.match(line)):
+            college = match.group(1).strip()
+        elif program is None and (match := PROGRAM_LINE.match(line)):
+            program = match.group(1).strip()
+        elif gpa is None and (match := OVERALL_LINE.match(line)):
+            try:
+                gpa = float(match.group(1))
+            except ValueError:
+                pass
+
+    user_profile = {
+        "college": college or "Not Found",
+        "program_id": program or "Not Found",
+        "gpa": gpa if gpa else "Not Found",
+    }
+    return user_profile, completed_courses
+
+
+def is_valid_transcript(user_profile: Dict, completed_courses: List[Dict]) -> bool:
+    """Whether a parse looks complete enough to skip Textract."""
+    if not completed_courses:
+        return False
+    if "Not Found" in (user_profile["college"], user_profile["program_id"], user_profile["gpa"]):
+        return False
+    if not 0.0 <= user_profile["gpa"] <= 4.0:
+        return False
+    return all(0.0 <= course["credits"] <= MAX_COURSE_CREDITS for course in completed_courses)
+
+
+def parse_transcript_document(document: Callable[[], PdfReader]) -> Optional[Tuple[Dict, List[Dict]]]:
+    """
+    (user_profile, completed_courses) read from the PDF text layer, or None when the text
+    layer is missing or does not parse into a valid transcript.
+
+    :param document: Returns the parsed PDF, e.g. StagedUpload.reader, so an upload that has
+                     already been read is not parsed again.
+    """
+    try:
+        user_profile, completed_courses = parse_transcript_lines(reader_text_lines(document()))
+    except Exception as e:
+        print(f"Local transcript parse failed: {e}")
+        return None
+    if not is_valid_transcript(user_profile, completed_courses):
+        return None
+    return user_profile, completed_courses
+
+
+def parse_transcript_pdf(stream: BinaryIO) -> Optional[Tuple[Dict, List[Dict]]]:
+    """parse_transcript_document for a PDF stream. Leaves the stream at the start."""
+    try:
+        return parse_transcript_document(lambda: PdfReader(stream))
+    finally:
+        stream.seek(0)
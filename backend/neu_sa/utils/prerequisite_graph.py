@@ -0,0 +1,222 @@
+from collections import defaultdict, deque
+from types import MappingProxyType
+from typing import NamedTuple, Tuple, Optional, Mapping, FrozenSet, Iterable, Dict, List
+from neu_sa.utils.eligibility_kernel import GRADE_PRECEDENCE, FAILED_GRADE, IN_PROGRESS_GRADE
+
+# COURSE_REQUISITES.REQUISITE_TYPE values
+PREREQUISITE = "PREREQUISITE"
+COREQUISITE = "COREQUISITE"
+
+# COURSE_REQUISITES.NODE_TYPE values (written by the catalog ingestion DAG)
+AND_NODE = "AND"
+OR_NODE = "OR"
+COURSE_NODE = "COURSE"
+TEXT_NODE = "TEXT"
+
+
+class RequisiteNode(NamedTuple):
+    """One node of a parsed requisite expression: AND/OR over children, a course leaf or free text."""
+    node_type: str
+    children: Tuple["RequisiteNode", ...] = ()
+    course_code: Optional[str] = None
+    min_grade: Optional[str] = None
+    detail: Optional[str] = None
+
+
+# Fetch every requisite node
+def fetch_requisite_rows(conn):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT COURSE_CODE, REQUISITE_TYPE, NODE_ID, PARENT_ID, POSITION, NODE_TYPE, REQUIRED_COURSE, MIN_GRADE, DETAIL
+            FROM COURSE_REQUISITES
+            ORDER BY COURSE_CODE, REQUISITE_TYPE, NODE_ID;
+            """
+        )
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def build_requisite_trees(rows) -> Dict[Tuple[str, str], RequisiteNode]:
+    """
+    Rebuilds expression trees from COURSE_REQUISITES rows.
+
+    :return: (course_code, requisite_type) -> root RequisiteNode.
+    """
+    nodes = defaultdict(dict)
+    for course_code, requisite_type, node_id, parent_id, position, node_type, required_course, min_grade, detail in rows:
+        nodes[(course_code, requisite_type)][node_id] = (parent_id, position or 0, node_type, required_course, min_grade, detail)
+
+    trees = {}
+    for key, tree_nodes in nodes.items():
+        children = defaultdict(list)
+        root_id = None
+        for node_id, (parent_id, position, *_rest) in tree_nodes.items():
+            if parent_id is None:
+                root_id = node_id
+            else:
+                children[parent_id].append((position, node_id))
+
+        def build(node_id):
+            _, _, node_type, required_course, min_grade, detail = tree_nodes[node_id]
+            return RequisiteNode(
+                node_type,
+                tuple(build(child_id) for _, child_id in sorted(children[node_id])),
+                required_course,
+                min_grade,
+                detail,
+            )
+
+        if root_id is not None:
+            trees[key] = build(root_id)
+    return trees
+
+
+def required_courses(node: Optional[RequisiteNode]) -> FrozenSet[str]:
+    """Every course mentioned anywhere in the expression."""
+    if node is None:
+        return frozenset()
+    if node.node_type == COURSE_NODE:
+        return frozenset({node.course_code})
+    courses = set()
+    for child in node.children:
+        courses |= required_courses(child)
+    return frozenset(courses)
+
+
+def grade_satisfies(grade: Optional[str], min_grade: Optional[str], allow_in_progress: bool = True) -> bool:
+    """True if a transcript grade meets a requisite's minimum grade."""
+    if grade is None or grade == FAILED_GRADE:
+        return False
+    if grade == IN_PROGRESS_GRADE:
+        return allow_in_progress
+    if min_grade is None:
+        return True
+    grade_rank = GRADE_PRECEDENCE.get(grade)
+    min_grade_rank = GRADE_PRECEDENCE.get(min_grade)
+    if grade_rank is None or min_grade_rank is None:
+        return False
+    return grade_rank <= min_grade_rank
+
+
+def _attempt_rank(grade: str) -> Tuple[bool, int]:
+    # GRADE_PRECEDENCE ranks F ahead of S and IP; a failed attempt must lose to any other grade
+    return grade == FAILED_GRADE, GRADE_PRECEDENCE.get(grade, len(GRADE_PRECEDENCE) + 1)
+
+
+def best_grades(completed_courses: Iterable[Mapping]) -> Dict[str, str]:
+    """Course code -> best grade on the transcript (retakes count; F only when every attempt failed)."""
+    grades = {}
+    for course in completed_courses:
+        course_code, grade = course["course_code"], course["grade"]
+        current = grades.get(course_code)
+        if current is None or _attempt_rank(grade) < _attempt_rank(current):
+            grades[course_code] = grade
+    return grades
+
+
+def evaluate_requisites(node: Optional[RequisiteNode], grades: Mapping[str, str], allow_in_progress: bool = True) -> bool:
+    """
+    Evaluates an expression against course code -> grade. Free-text requirements (e.g. program
+    admission) cannot be checked from a transcript and are treated as met.
+    """
+    if node is None:
+        return True
+    if node.node_type == COURSE_NODE:
+        return grade_satisfies(grades.get(node.course_code), node.min_grade, allow_in_progress)
+    if node.node_type == AND_NODE:
+        return all(evaluate_requisites(child, grades, allow_in_progress) for child in node.children)
+    if node.node_type == OR_NODE:
+        return any(evaluate_requisites(child, grades, allow_in_progress) for child in node.children)
+    return True
+
+
+class PrerequisiteGraph:
+    """
+    Immutable prerequisite DAG over the course catalog with precomputed transitive closures.
+
+    Edges point from a course to the courses its prerequisite expression mentions. Closures
+    ignore AND/OR structure (they answer "which courses can be on the path to X"); `can_take`
+    evaluates the actual expression.
+    """
+
+    def __init__(self, prerequisites: Mapping[str, RequisiteNode], corequisites: Mapping[str, RequisiteNode] = None):
+        self.prerequisites = MappingProxyType(dict(prerequisites))
+        self.corequisites = MappingProxyType(dict(corequisites or {}))
+        self.direct = MappingProxyType({course: required_courses(tree) for course, tree in self.prerequisites.items()})
+        self._ancestors = MappingProxyType(self._compute_closures())
+
+        unlocks = defaultdict(set)
+        for course, ancestors in self._ancestors.items():
+            for ancestor in ancestors:
+                unlocks[ancestor].add(course)
+        self._unlocks = MappingProxyType({course: frozenset(courses) for course, courses in unlocks.items()})
+
+    @classmethod
+    def from_rows(cls, rows):
+        trees = build_requisite_trees(rows)
+        return cls(
+            {course: tree for (course, requisite_type), tree in trees.items() if requisite_type == PREREQUISITE},
+            {course: tree for (course, requisite_type), tree in trees.items() if requisite_type == COREQUISITE},
+        )
+
+    def _compute_closures(self):
+        closures = {}
+        for course in self.direct:
+            ancestors = set()
+            queue = deque(self.direct[course])
+            while queue:
+                ancestor = queue.popleft()
+                if ancestor in ancestors:
+                    continue
+                ancestors.add(ancestor)
+                known = closures.get(ancestor)
+                if known is not None:
+                    # Already complete: reuse instead of walking that subgraph again
+                    ancestors |= known
+                else:
+                    queue.extend(self.direct.get(ancestor, ()))
+            ancestors.discard(course)  # Catalog cycles must not make a course its own prerequisite
+            closures[course] = frozenset(ancestors)
+        return closures
+
+    def transitive_prerequisites(self, course_code: str) -> FrozenSet[str]:
+        """Every course that can appear on a prerequisite path to `course_code`."""
+        return self._ancestors.get(course_code, frozenset())
+
+    def unlocks(self, course_code: str) -> FrozenSet[str]:
+        """Every course that (transitively) mentions `course_code` as a prerequisite."""
+        return self._unlocks.get(course_code, frozenset())
+
+    def can_take(self, course_code: str, grades: Mapping[str, str], allow_in_progress: bool = True) -> bool:
+        """
+        Whether the prerequisites of `course_code` are met.
+
+        :param grades: Course code -> grade, e.g. from best_grades(transcript courses).
+        :param allow_in_progress: Count in-progress courses as satisfying prerequisites (registration rules).
+        """
+        return evaluate_requisites(self.prerequisites.get(course_code), grades, allow_in_progress)
+
+    def unmet_prerequisites(self, course_code: str, grades: Mapping[str, str], allow_in_progress: bool = True) -> List[str]:
+        """Prerequisite courses of `course_code` that the grades do not satisfy (for explanations)."""
+        unmet = []
+
+        def visit(node):
+            if node.node_type == COURSE_NODE:
+                if not grade_satisfies(grades.get(node.course_code), node.min_grade, allow_in_progress):
+                    unmet.append(node.course_code)
+            elif node.node_type in (AND_NODE, OR_NODE):
+                for child in node.children:
+                    visit(child)
+
+        tree = self.prerequisites.get(course_code)
+        if tree is not None and not evaluate_requisites(tree, grades, allow_in_progress):
+            visit(tree)
+        return unmet
+
+
+# Load the graph in one query
+def fetch_prerequisite_graph(conn) -> PrerequisiteGraph:
+    return PrerequisiteGraph.from_rows(fetch_requisite_rows(conn))
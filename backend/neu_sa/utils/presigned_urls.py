@@ -0,0 +1,82 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+# Lifetime (seconds) of presigned transcript URLs
+PRESIGNED_URL_EXPIRY = int(os.getenv("PRESIGNED_URL_EXPIRY", "3600"))
+
+# Shortest remaining lifetime (seconds) a URL may have when it is handed out, so a page
+# rendered with it keeps a working link for a while; URLs are reused until then
+PRESIGNED_URL_MIN_REMAINING = int(os.getenv("PRESIGNED_URL_MIN_REMAINING", "600"))
+
+# Number of presigned URLs kept in memory (least recently used are evicted first)
+PRESIGNED_URL_CACHE_SIZE = int(os.getenv("PRESIGNED_URL_CACHE_SIZE", "1024"))
+
+
+class PresignedUrlCache:
+    """
+    Read-through LRU of presigned GET URLs keyed by (user_id, object URL), so repeated
+    renders of a page reuse one signature instead of signing again. An entry is served for
+    the URL's expiry less PRESIGNED_URL_MIN_REMAINING, then signed afresh. Entries are never
+    shared between users.
+
+    A presigned URL names an object, not its contents, so replacing the object under the
+    same key does not invalidate it.
+    """
+
+    def __init__(self, maxsize=PRESIGNED_URL_CACHE_SIZE, expires_in=PRESIGNED_URL_EXPIRY,
+                 min_remaining=PRESIGNED_URL_MIN_REMAINING, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.expires_in = expires_in
+        self.ttl = max(expires_in - min_remaining, 0)
+        self._clock = clock
+        self._entries = OrderedDict()  # (user_id, file_url) -> (signed_at, presigned_url)
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, user_id: int, file_url: str, presign: Callable[[str, int], str]) -> str:
+        """
+        :param presign: Called as presign(file_url, expires_in) when no fresh URL is cached.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get((user_id, file_url))
+            if entry is not None and now - entry[0] < self.ttl:
+                self._entries.move_to_end((user_id, file_url))
+                self._metrics["hits"] += 1
+                return entry[1]
+            self._metrics["misses"] += 1
+
+        # Signed outside the lock; two concurrent misses both sign, and either URL is valid
+        presigned_url = presign(file_url, self.expires_in)
+        self.put(user_id, file_url, presigned_url, signed_at=now)
+        return presigned_url
+
+    def put(self, user_id: int, file_url: str, presigned_url: str, signed_at=None):
+        """Record a URL signed elsewhere (e.g. right after an upload) with this cache's expiry."""
+        with self._lock:
+            self._entries[(user_id, file_url)] = (self._clock() if signed_at is None else signed_at, presigned_url)
+            self._entries.move_to_end((user_id, file_url))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._metrics["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._metrics["hits"] + self._metrics["misses"]
+            return {
+                **self._metrics,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self._metrics["hits"] / lookups if lookups else 0.0,
+            }
+
+
+# Shared by the transcript endpoints in this process
+presigned_url_cache = PresignedUrlCache()
@@ -0,0 +1,231 @@
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+import snowflake.connector
+from neu_sa.utils.eligibility_kernel import ProgramRequirements, build_program_requirements
+from neu_sa.utils.prerequisite_graph import PrerequisiteGraph, fetch_prerequisite_graph
+
+# Name of the marker row bumped by the requirements/catalog load DAG tasks
+GENERATION_MARKER = "PROGRAM_CATALOG"
+
+# How often (seconds) to check the generation marker before serving from memory
+CATALOG_CHECK_INTERVAL = float(os.getenv("PROGRAM_CATALOG_CHECK_INTERVAL", "60"))
+
+
+def get_snowflake_connection():
+    return snowflake.connector.connect(
+        user=os.getenv("SNOWFLAKE_USER"),
+        password=os.getenv("SNOWFLAKE_PASSWORD"),
+        account=os.getenv("SNOWFLAKE_ACCOUNT"),
+        warehouse=os.getenv("SNOWFLAKE_WAREHOUSE", "WH_NEU_SA"),
+        database=os.getenv("SNOWFLAKE_DATABASE", "DB_NEU_SA"),
+        schema=os.getenv("SNOWFLAKE_SCHEMA", "NEU_SA"),
+    )
+
+
+# Fetch the current catalog generation
+def fetch_catalog_generation(conn):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT COALESCE(MAX(GENERATION), 0) FROM CATALOG_GENERATION WHERE NAME = %s;
+            """,
+            (GENERATION_MARKER,)
+        )
+        return cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
+
+# Load every program with a fixed number of set-based queries
+def fetch_all_programs(conn) -> Dict[str, ProgramRequirements]:
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT PROGRAM_ID, PROGRAM_NAME, MAX_CREDIT_HOURS, MIN_GPA, CORE_CREDIT_REQ,
+                   CORE_OPTIONS_CREDIT_REQ, ELECTIVE_CREDIT_REQ, SUBJECT_CREDIT_REQ, ELECTIVE_EXCEPTION
+            FROM PROGRAM_REQUIREMENTS;
+            """
+        )
+        requirements = {
+            row[0]: {
+                "program_id": row[0],
+                "program_name": row[1],
+                "max_credit_hours": row[2],
+                "min_gpa": row[3],
+                "core_credit_req": row[4],
+                "core_options_credit_req": row[5],
+                "elective_credit_req": row[6],
+                "subject_credit_req": row[7],
+                "elective_exceptions": [code.strip() for code in row[8].split(",")] if row[8] else [],
+            }
+            for row in cursor.fetchall()
+        }
+
+        cursor.execute(
+            """
+            SELECT req.PROGRAM_ID, req.CATEGORY, req.COURSE_CODE, cc.CREDITS, cc.PREREQUISITES, cc.COREQUISITES
+            FROM (
+                SELECT PROGRAM_ID, 'CORE' AS CATEGORY, COURSE_CODE FROM CORE_REQUIREMENTS
+                UNION
+                SELECT PROGRAM_ID, 'CORE_OPTION' AS CATEGORY, COURSE_CODE FROM CORE_OPTIONS_REQUIREMENTS
+            ) req
+            JOIN COURSE_CATALOG cc ON req.COURSE_CODE = cc.COURSE_CODE
+            ORDER BY req.PROGRAM_ID, req.CATEGORY, req.COURSE_CODE;
+            """
+        )
+        core_courses = {program_id: [] for program_id in requirements}
+        core_option_courses = {program_id: [] for program_id in requirements}
+        for program_id, category, course_code, credits, prerequisites, corequisites in cursor.fetchall():
+            if program_id not in requirements:
+                continue
+            course = {
+                "course_code": course_code,
+                "credits": credits,
+                "prerequisites": prerequisites.strip() if prerequisites and prerequisites.strip() else None,
+                "corequisites": corequisites.strip() if corequisites and corequisites.strip() else None,
+            }
+            (core_courses if category == "CORE" else core_option_courses)[program_id].append(course)
+
+        cursor.execute("SELECT PROGRAM_ID, SUBJECT_CODE, MIN_CREDIT_HOURS FROM SUBJECT_AREAS;")
+        subject_areas = {program_id: {} for program_id in requirements}
+        for program_id, subject_code, min_credit_hours in cursor.fetchall():
+            if program_id in subject_areas:
+                subject_areas[program_id][subject_code] = min_credit_hours
+
+        cursor.execute("SELECT PROGRAM_ID, SUBJECT_CODE FROM ELECTIVE_REQUIREMENTS;")
+        elective_subjects = {program_id: set() for program_id in requirements}
+        for program_id, subject_code in cursor.fetchall():
+            if program_id in elective_subjects:
+                elective_subjects[program_id].add(subject_code)
+    finally:
+        cursor.close()
+
+    return {
+        program_id: build_program_requirements(
+            program_requirements,
+            core_courses[program_id],
+            core_option_courses[program_id],
+            subject_areas[program_id],
+            elective_subjects[program_id],
+        )
+        for program_id, program_requirements in requirements.items()
+    }
+
+
+# Credits of every catalog course
+def fetch_course_credits(conn) -> Dict[str, float]:
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT COURSE_CODE, CREDITS FROM COURSE_CATALOG;")
+        return {course_code: credits for course_code, credits in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def describe_program(program: ProgramRequirements) -> str:
+    """Compact, prompt-friendly summary of a program's requirement buckets."""
+    subject_areas = ", ".join(f"{code} ({credits} credits)" for code, credits in program.subject_areas.items())
+    return (
+        f"{program.program_name} ({program.program_id}): {program.max_credit_hours} total credits. "
+        f"Core courses ({program.core_credit_req} credits): {', '.join(c.course_code for c in program.core_courses) or 'None'}. "
+        f"Core options ({program.core_options_credit_req} credits): {', '.join(c.course_code for c in program.core_option_courses) or 'None'}. "
+        f"Subject areas: {subject_areas or 'None'}. "
+        f"Electives ({program.elective_credit_req} credits) from subjects: {', '.join(sorted(program.elective_subjects)) or 'None'}. "
+        f"Elective exceptions: {', '.join(program.elective_exceptions) or 'None'}."
+    )
+
+
+class ProgramCatalog:
+    """
+    Process-wide, read-mostly cache of every program's requirements, the course
+    prerequisite graph and catalog course credits.
+
+    The whole catalog is loaded at once and replaced atomically. Readers check the
+    CATALOG_GENERATION marker at most once per `check_interval` seconds and reload
+    when the requirements-load DAG has bumped it.
+    """
+
+    def __init__(self, connection_factory=None, check_interval: float = CATALOG_CHECK_INTERVAL):
+        self.connection_factory = connection_factory or get_snowflake_connection
+        self.check_interval = check_interval
+        self._programs: Mapping[str, ProgramRequirements] = MappingProxyType({})
+        self._prerequisite_graph = PrerequisiteGraph({})
+        self._course_credits: Mapping[str, float] = MappingProxyType({})
+        self._generation: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> Optional[int]:
+        return self._generation
+
+    def load(self):
+        """Load (or reload) all programs and record the current generation."""
+        conn = self.connection_factory()
+        try:
+            generation = fetch_catalog_generation(conn)
+            programs = fetch_all_programs(conn)
+            prerequisite_graph = fetch_prerequisite_graph(conn)
+            course_credits = fetch_course_credits(conn)
+        finally:
+            conn.close()
+        with self._lock:
+            self._programs = MappingProxyType(programs)
+            self._prerequisite_graph = prerequisite_graph
+            self._course_credits = MappingProxyType(course_credits)
+            self._generation = generation
+            self._checked_at = time.monotonic()
+        print(
+            f"Loaded program catalog generation {generation} with {len(programs)} programs and "
+            f"prerequisites for {len(prerequisite_graph.prerequisites)} courses."
+        )
+
+    def refresh(self, force: bool = False):
+        """Reload if the generation marker moved (or unconditionally when `force`)."""
+        if force or self._generation is None:
+            self.load()
+            return
+
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return
+
+        with self._lock:
+            # Another thread may have checked while we waited for the lock
+            if time.monotonic() - self._checked_at < self.check_interval:
+                return
+            self._checked_at = time.monotonic()
+
+        conn = self.connection_factory()
+        try:
+            generation = fetch_catalog_generation(conn)
+        finally:
+            conn.close()
+        if generation != self._generation:
+            self.load()
+
+    def programs(self) -> Mapping[str, ProgramRequirements]:
+        self.refresh()
+        return self._programs
+
+    def prerequisite_graph(self) -> PrerequisiteGraph:
+        self.refresh()
+        return self._prerequisite_graph
+
+    def course_credits(self) -> Mapping[str, float]:
+        self.refresh()
+        return self._course_credits
+
+    def get(self, program_id: str) -> ProgramRequirements:
+        program = self.programs().get(program_id)
+        if program is None:
+            raise ValueError(f"No program requirements found for program_id: {program_id}")
+        return program
+
+
+# Shared instance used by the eligibility engine, routers and agents
+program_catalog = ProgramCatalog()
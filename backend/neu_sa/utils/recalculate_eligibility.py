@@ -1,9 +1,15 @@
 import os
-import snowflake.connector
-import re
-
 import re
+import time
+from collections import Counter
 import snowflake.connector
+from neu_sa.utils.advising_context import build_advising_context, write_advising_context
+from neu_sa.utils.eligibility_kernel import GRADE_PRECEDENCE, compute_eligibility, evaluate_program, index_transcript, rows_to_rewrite
+from neu_sa.utils.program_catalog import program_catalog
+from neu_sa.utils.user_context import fetch_user_context, user_context_cache
+
+# Verify incremental writes against a full rebuild (and rebuild on mismatch)
+ELIGIBILITY_CONSISTENCY_CHECK = os.getenv("ELIGIBILITY_CONSISTENCY_CHECK", "false").lower() == "true"
 
 def get_snowflake_connection():
     return snowflake.connector.connect(
@@ -15,94 +21,6 @@ def get_snowflake_connection():
         schema=os.getenv("SNOWFLAKE_SCHEMA", "NEU_SA"),
     )
 
-# Fetch program requirements
-def fetch_program_requirements(conn, program_id):
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT * FROM PROGRAM_REQUIREMENTS WHERE PROGRAM_ID = %s;
-        """,
-        (program_id,)
-    )
-    result = cursor.fetchone()
-    return {
-        "program_id": result[0],
-        "program_name": result[1],
-        "max_credit_hours": result[2],
-        "min_gpa": result[3],
-        "core_credit_req": result[4],
-        "core_options_credit_req": result[5],
-        "elective_credit_req": result[6],
-        "subject_credit_req": result[7],
-        "elective_exceptions": result[8].split(",") if result[7] else [],
-    }
-
-def fetch_core_requirements(conn, program_id):
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT DISTINCT cr.COURSE_CODE, cc.CREDITS
-        FROM CORE_REQUIREMENTS cr
-        JOIN COURSE_CATALOG cc ON cr.COURSE_CODE = cc.COURSE_CODE
-        WHERE cr.PROGRAM_ID = %s;
-        """,
-        (program_id,)
-    )
-    return [{"course_code": row[0], "credits": row[1]} for row in cursor.fetchall()]
-
-def fetch_core_option_courses(conn, program_id):
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT DISTINCT co.COURSE_CODE, cc.CREDITS
-        FROM CORE_OPTIONS_REQUIREMENTS co
-        JOIN COURSE_CATALOG cc ON co.COURSE_CODE = cc.COURSE_CODE
-        WHERE co.PROGRAM_ID = %s;
-        """,
-        (program_id,)
-    )
-    return [{"course_code": row[0], "credits": row[1]} for row in cursor.fetchall()]
-
-def fetch_subject_area_requirements(conn, program_id):
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT SUBJECT_CODE, MIN_CREDIT_HOURS
-        FROM SUBJECT_AREAS
-        WHERE PROGRAM_ID = %s;
-        """,
-        (program_id,)
-    )
-    # Return as a dictionary
-    return {row[0]: row[1] for row in cursor.fetchall()}
-
-# Fetch elective requirements
-def fetch_elective_courses(conn, program_id):
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT SUBJECT_CODE
-        FROM ELECTIVE_REQUIREMENTS
-        WHERE PROGRAM_ID = %s;
-        """,
-        (program_id,)
-    )
-    return {row[0] for row in cursor.fetchall()}
-
-# Fetch prerequisites
-def fetch_prerequisites(conn, course_code):
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT PREREQUISITES
-        FROM COURSE_CATALOG
-        WHERE COURSE_CODE = %s;
-        """,
-        (course_code,)
-    )
-    result = cursor.fetchone()
-    return result[0].strip() if result and result[0] else None
-
 # Parse prerequisites
 def parse_prerequisites(prerequisite_text):
     if not prerequisite_text:
@@ -118,17 +36,6 @@ def parse_prerequisites(prerequisite_text):
     ]
 
 
-# Grade precedence map for proper comparison
-GRADE_PRECEDENCE = {
-    "A+": 1, "A": 2, "A-": 3,
-    "B+": 4, "B": 5, "B-": 6,
-    "C+": 7, "C": 8, "C-": 9,
-    "D+": 10, "D": 11, "D-": 12,
-    "F": 13,
-    "S": 14,  # Satisfactory
-    "IP (In Progress)": 15  # In Progress (highest precedence since incomplete)
-}
-
 # Function to compare grades based on academic precedence
 def compare_grades(user_grade, min_grade):
     """
@@ -170,407 +77,178 @@ def check_prerequisites(user_courses, prerequisites):
 
     return True, "Prerequisites satisfied."
 
-# Fetch user data
+# Fetch user data (read fresh, not from the context cache, since the result is written back)
 def fetch_user_data(conn, user_id):
-    cursor = conn.cursor()
-
-    # Fetch user profile
-    cursor.execute(
-        """
-        SELECT PROGRAM_ID, GPA FROM USER_PROFILE WHERE USER_ID = %s;
-        """,
-        (user_id,)
-    )
-    profile = cursor.fetchone()
-    if not profile:
+    context = fetch_user_context(conn, user_id)
+    if not context.profile:
         raise ValueError(f"No user profile found for user_id: {user_id}")
 
-    program_id, gpa = profile
-
     # Handle null GPA
+    gpa = context.profile["gpa"]
     if gpa is None:
         gpa = 0.0
 
-    # Fetch completed courses
-    cursor.execute(
-        """
-        SELECT COURSE_CODE, CREDITS, GRADE
-        FROM USER_COURSES
-        WHERE USER_ID = %s;
-        """,
-        (user_id,)
-    )
-    courses = cursor.fetchall()
-    completed_courses = [
-        {"course_code": row[0], "credits": row[1], "grade": row[2]} for row in courses
-    ]
+    return {"program_id": context.profile["program_id"], "gpa": gpa, "completed_courses": context.completed_courses}
 
-    return {"program_id": program_id, "gpa": gpa, "completed_courses": completed_courses}
+# Replace a user's eligibility rows in a single transaction
+def write_user_eligibility(conn, user_id, rows, codes=None, advising_context=None):
+    """
+    Deletes the user's existing eligibility rows and inserts the new set inside one
+    transaction, so readers see either the previous set or the complete new one.
 
-# Clear user eligibility
-def clear_user_eligibility(conn, user_id):
+    :param rows: List of (COURSE_OR_REQUIREMENT, ELIGIBLE, DETAILS, STATUS) tuples.
+    :param codes: When given, only rows with these COURSE_OR_REQUIREMENT values are replaced.
+    :param advising_context: When given, stored in USER_ADVISING_CONTEXT in the same transaction.
+    :return: Timing metrics (seconds) for the write phase.
+    """
+    metrics = {"rows": len(rows)}
+    started = time.perf_counter()
     cursor = conn.cursor()
-    cursor.execute(
-        """
-        DELETE FROM USER_ELIGIBILITY WHERE USER_ID = %s;
-        """,
-        (user_id,)
+    try:
+        cursor.execute("BEGIN;")
+        if codes is None:
+            cursor.execute(
+                """
+                DELETE FROM USER_ELIGIBILITY WHERE USER_ID = %s;
+                """,
+                (user_id,)
+            )
+        elif codes:
+            placeholders = ", ".join(["%s"] * len(codes))
+            cursor.execute(
+                f"""
+                DELETE FROM USER_ELIGIBILITY WHERE USER_ID = %s AND COURSE_OR_REQUIREMENT IN ({placeholders});
+                """,
+                (user_id, *sorted(codes))
+            )
+        metrics["delete_seconds"] = time.perf_counter() - started
+
+        insert_started = time.perf_counter()
+        if rows:
+            # executemany folds the bound rows into one multi-row INSERT
+            cursor.executemany(
+                """
+                INSERT INTO USER_ELIGIBILITY (USER_ID, COURSE_OR_REQUIREMENT, ELIGIBLE, DETAILS, STATUS)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                [(user_id, code, eligible, reason, status) for code, eligible, reason, status in rows],
+            )
+        if advising_context is not None:
+            write_advising_context(cursor, user_id, advising_context)
+        metrics["insert_seconds"] = time.perf_counter() - insert_started
+
+        commit_started = time.perf_counter()
+        conn.commit()
+        metrics["commit_seconds"] = time.perf_counter() - commit_started
+        user_context_cache.invalidate(user_id)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    metrics["total_seconds"] = time.perf_counter() - started
+    return metrics
+
+
+# Compare stored eligibility rows with a fresh full computation
+def check_eligibility_consistency(conn, user_id):
+    """
+    Recomputes a user's eligibility from scratch and compares it with USER_ELIGIBILITY.
+
+    :return: (missing, unexpected) lists of rows that a full rebuild would add / remove.
+             Both are empty when the stored rows are consistent.
+    """
+    user_data = fetch_user_data(conn, user_id)
+    program = program_catalog.get(user_data["program_id"])
+    expected = Counter(
+        (code, bool(eligible), details, status)
+        for code, eligible, details, status in compute_eligibility(program, index_transcript(user_data["completed_courses"]))
     )
-    conn.commit()
 
-# Insert into eligibility
-def insert_into_eligibility(conn, user_id, code, eligible, reason, status):
     cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT INTO USER_ELIGIBILITY (USER_ID, COURSE_OR_REQUIREMENT, ELIGIBLE, DETAILS, STATUS)
-        VALUES (%s, %s, %s, %s, %s);
-        """,
-        (user_id, code, eligible, reason, status),
-    )
-    conn.commit()
+    try:
+        cursor.execute(
+            """
+            SELECT COURSE_OR_REQUIREMENT, ELIGIBLE, DETAILS, STATUS FROM USER_ELIGIBILITY WHERE USER_ID = %s;
+            """,
+            (user_id,)
+        )
+        stored = Counter((code, bool(eligible), details, status) for code, eligible, details, status in cursor.fetchall())
+    finally:
+        cursor.close()
+
+    return list((expected - stored).elements()), list((stored - expected).elements())
 
 
 # Main eligibility recalculation function
-def recalculate_eligibility(user_id):
+def recalculate_eligibility(user_id, changed_courses=None, raise_errors=False):
+    """
+    Recomputes a user's eligibility and writes it to USER_ELIGIBILITY.
+
+    :param changed_courses: Course codes added, removed or changed since the last write. When
+                            given, only the rows of the affected requirement buckets are replaced;
+                            when None (or if the incremental write fails) all rows are rebuilt.
+    :param raise_errors: Re-raise failures (e.g. so the eligibility queue can retry) instead of only logging them.
+    """
     conn = get_snowflake_connection()
     try:
         # Fetch user and program data
         print(f"Fetching data for user_id: {user_id}")
         user_data = fetch_user_data(conn, user_id)
-        program_requirements = fetch_program_requirements(conn, user_data["program_id"])
-        core_courses = fetch_core_requirements(conn, user_data["program_id"])
-        core_option_courses = fetch_core_option_courses(conn, user_data["program_id"])
-        subject_area_requirements = fetch_subject_area_requirements(conn, user_data["program_id"])
-        elective_subjects = fetch_elective_courses(conn, user_data["program_id"])  # Valid elective subjects
-
+        program = program_catalog.get(user_data["program_id"])
+        transcript = index_transcript(user_data["completed_courses"])
         print("Fetched all required data for eligibility calculation.")
 
-        # Clear existing eligibility data
-        print(f"Clearing existing eligibility data for user_id: {user_id}")
-        clear_user_eligibility(conn, user_id)
-        print("Cleared existing eligibility data.")
-
-        # ---- Process Core Requirements ----
-        print("Processing core requirements...")
-
-        # Track completed core credits
-        completed_core_credits = 0
-        processed_courses = set()  # Tracks courses processed for core, core options, and electives
-
-        for core_course in core_courses:
-            course_code = core_course["course_code"]
+        # ---- Apply the eligibility rules in memory ----
+        eligibility_rows, progress = evaluate_program(program, transcript)
+        print(f"Computed {len(eligibility_rows)} eligibility rows for user_id: {user_id}")
 
-            if course_code in processed_courses:
-                continue  # Skip already processed courses
-            processed_courses.add(course_code)
-
-            print(f"Processing Core Course: {course_code}")
-
-            # Check if the user has completed this course
-            matching_courses = [
-                c for c in user_data["completed_courses"] if c["course_code"] == course_code
-            ]
-            if matching_courses:
-                user_course = matching_courses[0]
-                grade = user_course["grade"]
-
-                if grade == "F":
-                    insert_into_eligibility(
-                        conn, user_id, course_code, True,
-                        f"Failed with grade '{grade}'. (Category: Core Requirement)", "CALCULATED"
-                    )
-                    continue
-
-                if grade == "IP (In Progress)":
-                    # Add in-progress credits to the completed credits
-                    completed_core_credits += core_course["credits"]
-                    insert_into_eligibility(
-                        conn, user_id, course_code, False,
-                        f"In progress with grade '{grade}'. (Category: Core Requirement)", "PENDING"
-                    )
-                    continue
+        # Summary read by the chat agents; always rewritten whole
+        advising_context = build_advising_context(
+            program, user_data["completed_courses"], program_catalog.prerequisite_graph(), progress
+        )
 
-                # Add completed credits
-                completed_core_credits += core_course["credits"]
-                insert_into_eligibility(
-                    conn, user_id, course_code, False,
-                    f"Already completed with grade '{grade}'. (Category: Core Requirement)", "CALCULATED"
+        # ---- Incremental mode: replace only the affected buckets ----
+        if changed_courses is not None:
+            try:
+                codes, rows = rows_to_rewrite(program, eligibility_rows, changed_courses)
+                if not codes:
+                    print(f"No requirement buckets affected for user_id {user_id}; only the advising context is written.")
+                    write_user_eligibility(conn, user_id, [], codes=set(), advising_context=advising_context)
+                    return {"rows": 0, "incremental": True}
+                write_metrics = write_user_eligibility(conn, user_id, rows, codes=codes, advising_context=advising_context)
+                write_metrics["incremental"] = True
+                print(
+                    f"Incrementally rewrote {write_metrics['rows']} eligibility rows ({len(codes)} codes) for user_id "
+                    f"{user_id} in {write_metrics['total_seconds']:.3f}s."
                 )
-            else:
-                # Check prerequisites for the course
-                prerequisites_text = fetch_prerequisites(conn, course_code)
-                if prerequisites_text:
-                    insert_into_eligibility(
-                        conn, user_id, course_code, True,
-                        f"Have not started/completed Prerequisites: {prerequisites_text}. (Category: Core Requirement)", "CALCULATED"
-                    )
-                else:
-                    # No prerequisites, mark the course as available
-                    insert_into_eligibility(
-                        conn, user_id, course_code, True,
-                        "Have not started/completed it has no prerequisites. (Category: Core Requirement)", "CALCULATED"
-                    )
-
-        print(f"Completed core credits: {completed_core_credits}/{program_requirements['core_credit_req']}.")
-
-
-        # ---- Process Core Options Requirements ----
-        print("Processing core options requirements...")
-
-        # Track completed core option credits
-        completed_core_option_credits = 0
-        core_options_as_electives = set()  # Track courses counted as electives after core options satisfied
-
-        for course in core_option_courses:
-            course_code = course["course_code"]
-
-            
-            if course_code in processed_courses:
-                continue  # Skip already processed courses
-            processed_courses.add(course_code)
-
-            print(f"Processing Core Option Course: {course_code}")
-
-            # Check if user has completed this course
-            matching_courses = [
-                c for c in user_data["completed_courses"] if c["course_code"] == course_code
-            ]
-            if matching_courses:
-                user_course = matching_courses[0]
-                grade = user_course["grade"]
-
-                if grade == "F":
-                    insert_into_eligibility(
-                        conn, user_id, course_code, True,
-                        f"Failed with grade '{grade}'. (Category: Core Options)", "CALCULATED"
-                    )
-                    continue
-
-                if grade == "IP (In Progress)":
-                    # Add in-progress credits to the completed credits
-                    completed_core_option_credits += course["credits"]
-                    insert_into_eligibility(
-                        conn, user_id, course_code, False,
-                        f"In progress with grade '{grade}'. (Category: Core Options)", "PENDING"
-                    )
-                    continue
-
-                # Add credits toward core options
-                if completed_core_option_credits < program_requirements["core_options_credit_req"]:
-                    completed_core_option_credits += course["credits"]
-                    insert_into_eligibility(
-                        conn, user_id, course_code, False,
-                        f"Already completed with grade '{grade}'. Counted toward core options. (Category: Core Options)",
-                        "CALCULATED"
+                if ELIGIBILITY_CONSISTENCY_CHECK:
+                    missing, unexpected = check_eligibility_consistency(conn, user_id)
+                    if not missing and not unexpected:
+                        return write_metrics
+                    print(
+                        f"Incremental eligibility for user_id {user_id} diverged from a full rebuild "
+                        f"({len(missing)} missing, {len(unexpected)} unexpected rows); rebuilding."
                     )
                 else:
-                    # Core options requirement already satisfied
-                    subject_code = course_code[:4]
-                    if subject_code in elective_subjects:
-                        core_options_as_electives.add(course_code)  # Mark as counted toward electives
-                        insert_into_eligibility(
-                            conn, user_id, course_code, True,
-                            f"This was one of Core options requirement but as it is already satified it can be counted as part of program electives under {subject_code}.",
-                            "CALCULATED"
-                        )
-                    else:
-                        insert_into_eligibility(
-                            conn, user_id, course_code, False,
-                            f"Core options requirement already satisfied. (Category: Core Options)",
-                            "CALCULATED"
-                        )
-            else:
-                # Check prerequisites for the course
-                prerequisites_text = fetch_prerequisites(conn, course_code)
-                if prerequisites_text:
-                    insert_into_eligibility(
-                        conn, user_id, course_code, True,
-                        f"Have not started/completed Prerequisites: {prerequisites_text}. (Category: Core Options)", "CALCULATED"
-                    )
-                else:
-                    # No prerequisites, mark as available to take
-                    if completed_core_option_credits < program_requirements["core_options_credit_req"]:
-                        insert_into_eligibility(
-                            conn, user_id, course_code, True,
-                            "Have not started/completed. It has no prerequisites. Available to take as part of (Category: Core Options).", "CALCULATED"
-                        )
-                    else:
-                        # After core options satisfied, check if it can be elective
-                        subject_code = course_code[:4]
-                        if subject_code in elective_subjects:
-                            core_options_as_electives.add(course_code)  # Mark as counted toward electives
-                            insert_into_eligibility(
-                                conn, user_id, course_code, True,
-                                "Core options requirement already satisfied but can be taken as an elective. (Category: Core Options and Elective)",
-                                "CALCULATED"
-                            )
-                        else:
-                            insert_into_eligibility(
-                                conn, user_id, course_code, True,
-                                "Core options requirement already satisfied. (Category: Core Options)",
-                                "CALCULATED"
-                            )
-
-        print(f"Completed core option credits: {completed_core_option_credits}/{program_requirements['core_options_credit_req']}.")
-
-
-
-        # ---- Process Subject Area and Program Electives ----
-        print("Processing subject area and program electives...")
-
-        # Track accumulated credits for each subject code
-        subject_credits = {subject_code: 0 for subject_code in subject_area_requirements.keys()}
-        subject_area_courses = {subject_code: [] for subject_code in subject_area_requirements.keys()}  # Track courses for each subject
-        program_elective_credits = 0  # Track total elective credits across all subjects
-        elective_courses = []  # Track courses contributing to electives
-
-        # Fetch elective exceptions from program requirements
-        elective_exceptions = program_requirements.get("elective_exceptions", [])
-
-        def consolidate_requirements(completed, required, courses, category, electives=None, exceptions=None):
-            course_list = ", ".join(courses)
-            additional_info = ""
-            if electives:
-                additional_info += f" Electives are subject code with ({', '.join(electives)})."
-            if exceptions:
-                additional_info += f" Exceptions are ({', '.join(exceptions)})."
-            return (
-                f"{completed}/{required} credits completed for {category} requirements. "
-                f"Which are ({course_list})." + additional_info
-            )
-
-        # Step 1: Process completed courses
-        for course in user_data["completed_courses"]:
-            course_code = course["course_code"]
-            subject_code = course_code[:4]  # Extract subject prefix (e.g., INFO, CSYE)
-
-            # Skip courses already processed in core requirements or core options
-            if course_code in processed_courses and course_code not in core_options_as_electives:
-                print(f"Skipping already processed course: {course_code}")
-                continue
-
-            print(f"Processing course_code: '{course_code}'")
-
-            # If this course was counted as a core option elective, handle it
-            if course_code in core_options_as_electives:
-                print(f"Processing core option course counted as elective: {course_code}")
-                program_elective_credits += course["credits"]  # Add to total elective credits
-                elective_courses.append(course_code)
-                insert_into_eligibility(
-                    conn, user_id, course_code, False,
-                    f"Already completed with grade '{course['grade']}'. (Core option course counted as elective)",
-                    "CALCULATED"
-                )
-                continue  # Skip further processing for this course
-
-            # Check if course counts for a specific subject area
-            if subject_code in subject_area_requirements:
-                required_credits = subject_area_requirements[subject_code]
-                available_credits = min(course["credits"], required_credits - subject_credits[subject_code])
-
-                if course["grade"] == "F":
-                    insert_into_eligibility(
-                        conn, user_id, course_code, True,
-                        f"Failed with grade '{course['grade']}'. (Category: Subject area)",
-                        "CALCULATED"
-                    )
-                    continue
-
-                if course["grade"] == "IP (In Progress)":
-                    # Add in-progress credits to the completed credits
-                    subject_credits[subject_code] += available_credits
-                    subject_area_courses[subject_code].append(course_code)
-                    insert_into_eligibility(
-                        conn, user_id, course_code, False,
-                        f"In progress with grade '{course['grade']}'. (Category: Subject area)",
-                        "PENDING"
-                    )
-                    continue
-
-                if available_credits > 0:
-                    # Allocate credits toward the specific subject area
-                    subject_credits[subject_code] += available_credits
-                    subject_area_courses[subject_code].append(course_code)
-                    insert_into_eligibility(
-                        conn, user_id, course_code, False,
-                        f"Already completed with grade '{course['grade']}'. (Category: Subject area)",
-                        "CALCULATED"
-                    )
-
-                # Handle excess credits as electives
-                excess_credits = course["credits"] - available_credits
-                if excess_credits > 0:
-                    program_elective_credits += excess_credits
-                    elective_courses.append(course_code)
-                    insert_into_eligibility(
-                        conn, user_id, course_code, False,
-                        f"Already completed with grade '{course['grade']}'. (Category: Program elective)",
-                        "CALCULATED"
-                    )
-                processed_courses.add(course_code)
-                continue  # Skip further processing for this course
-
-            # Check if course counts for program electives
-            if subject_code in elective_subjects:
-                if course["grade"] == "F":
-                    insert_into_eligibility(
-                        conn, user_id, course_code, True,
-                        f"Failed with grade '{course['grade']}'. (Category: Program elective)",
-                        "CALCULATED"
-                    )
-                    continue
-
-                if course["grade"] == "IP (In Progress)":
-                    # Add in-progress credits to the completed credits
-                    program_elective_credits += course["credits"]
-                    elective_courses.append(course_code)
-                    insert_into_eligibility(
-                        conn, user_id, course_code, False,
-                        f"In progress with grade '{course['grade']}'. (Category: Program elective)",
-                        "PENDING"
-                    )
-                    continue
-
-                program_elective_credits += course["credits"]
-                elective_courses.append(course_code)
-                insert_into_eligibility(
-                    conn, user_id, course_code, False,
-                    f"Already completed with grade '{course['grade']}'. (Category: Program elective)",
-                    "CALCULATED"
-                )
-                processed_courses.add(course_code)
-                continue
-
-        # Step 2: Summarize subject area requirements
-        for subject_code, required_credits in subject_area_requirements.items():
-            completed_credits = subject_credits[subject_code]
-            courses = subject_area_courses[subject_code]
-            subject_area_status = consolidate_requirements(
-                completed_credits, required_credits, courses, f"subject area ({subject_code})"
-            )
-            insert_into_eligibility(
-                conn, user_id, f"SUBJECT_AREA_{subject_code}", completed_credits < required_credits,
-                subject_area_status, "CALCULATED"
-            )
-
-        # Step 3: Summarize elective requirements
-        elective_credit_req = program_requirements["elective_credit_req"]  # Total required elective credits
-        elective_status = consolidate_requirements(
-            program_elective_credits, elective_credit_req, elective_courses, "elective",
-            electives=elective_subjects, exceptions=elective_exceptions
-        )
-        insert_into_eligibility(
-            conn, user_id, "ELECTIVES", program_elective_credits < elective_credit_req,
-            elective_status, "CALCULATED"
+                    return write_metrics
+            except Exception as e:
+                print(f"Incremental eligibility update failed, falling back to a full rebuild: {e}")
+
+        # ---- Write all rows in a single transaction ----
+        write_metrics = write_user_eligibility(conn, user_id, eligibility_rows, advising_context=advising_context)
+        print(
+            f"Wrote {write_metrics['rows']} eligibility rows for user_id {user_id} in "
+            f"{write_metrics['total_seconds']:.3f}s (delete {write_metrics['delete_seconds']:.3f}s, "
+            f"insert {write_metrics['insert_seconds']:.3f}s, commit {write_metrics['commit_seconds']:.3f}s)."
         )
-
-        print("Subject area and program elective requirements processing completed.")
-
-
+        return write_metrics
 
     except Exception as e:
             print(f"Error during eligibility recalculation: {e}")
+            if raise_errors:
+                raise
 
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
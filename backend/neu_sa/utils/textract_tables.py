@@ -0,0 +1,62 @@
+from typing import Any, Dict, Iterable, List
+
+# Text Textract gives a selected check box
+SELECTED_MARK = "X"
+
+
+def _child_ids(block: Dict[str, Any]) -> List[str]:
+    return [
+        child_id
+        for relationship in block.get("Relationships", ())
+        if relationship["Type"] == "CHILD"
+        for child_id in relationship["Ids"]
+    ]
+
+
+class TableAssembler:
+    """
+    Builds table rows from Textract document analysis blocks, one result page at a time.
+
+    Only word text and the cell grid are kept (no geometry or confidence scores), so the
+    raw response pages can be dropped as soon as they are added. Cells may reference words
+    on a later page, which is why rows are assembled only once every page has been added.
+    """
+
+    def __init__(self):
+        self._words = {}   # WORD / SELECTION_ELEMENT id -> text
+        self._cells = {}   # CELL id -> (row index, column index, child ids)
+        self._tables = []  # CELL ids of each TABLE, in document order
+
+    def add(self, blocks: Iterable[Dict[str, Any]]):
+        for block in blocks:
+            block_type = block["BlockType"]
+            if block_type == "WORD":
+                self._words[block["Id"]] = block["Text"]
+            elif block_type == "SELECTION_ELEMENT":
+                if block.get("SelectionStatus") == "SELECTED":
+                    self._words[block["Id"]] = SELECTED_MARK
+            elif block_type == "CELL":
+                self._cells[block["Id"]] = (block["RowIndex"], block["ColumnIndex"], _child_ids(block))
+            elif block_type == "TABLE":
+                self._tables.append(_child_ids(block))
+
+    def cell_text(self, cell_id: str) -> str:
+        words = self._words
+        return " ".join(words[child_id] for child_id in self._cells[cell_id][2] if child_id in words)
+
+    def rows(self) -> List[List[str]]:
+        """Every table row as a list of cell texts, columns in order (missing cells are empty)."""
+        if not self._tables:
+            raise ValueError("No tables found in the document.")
+
+        rows = []
+        for cell_ids in self._tables:
+            grid = {}
+            for cell_id in cell_ids:
+                if cell_id in self._cells:
+                    row_index, col_index, _ = self._cells[cell_id]
+                    grid.setdefault(row_index, {})[col_index] = self.cell_text(cell_id)
+            for row_index in sorted(grid):
+                cols = grid[row_index]
+                rows.append([cols.get(col_index, "") for col_index in range(1, max(cols) + 1)])
+        return rows
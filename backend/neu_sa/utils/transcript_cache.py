@@ -0,0 +1,78 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional
+
+# Number of parsed transcripts kept in memory (least recently used are evicted first)
+TRANSCRIPT_CACHE_SIZE = int(os.getenv("TRANSCRIPT_CACHE_SIZE", "256"))
+
+
+class ParsedTranscript(NamedTuple):
+    """A transcript parse and where its bytes were stored."""
+    user_profile: Dict[str, Any]
+    completed_courses: List[Dict[str, Any]]
+    file_url: Optional[str]  # None once the user's stored transcript has been replaced by other content
+
+
+class TranscriptParseCache:
+    """
+    LRU of transcript parses keyed by (user_id, content hash), so re-uploads and client
+    retries of the same file skip Textract and, while the file is still the one stored for
+    the user, the S3 upload too. Entries are never shared between users.
+    """
+
+    def __init__(self, maxsize=TRANSCRIPT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # (user_id, digest) -> ParsedTranscript
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, user_id: int, digest: str) -> Optional[ParsedTranscript]:
+        with self._lock:
+            entry = self._entries.get((user_id, digest))
+            if entry is None:
+                self._metrics["misses"] += 1
+                return None
+            self._entries.move_to_end((user_id, digest))
+            self._metrics["hits"] += 1
+            return entry
+
+    def put(self, user_id: int, digest: str, user_profile: Dict[str, Any],
+            completed_courses: List[Dict[str, Any]], file_url: str):
+        with self._lock:
+            self._replace_stored(user_id, digest, file_url)
+            self._entries[(user_id, digest)] = ParsedTranscript(user_profile, completed_courses, file_url)
+            self._entries.move_to_end((user_id, digest))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._metrics["evictions"] += 1
+
+    def stored(self, user_id: int, digest: str, file_url: str):
+        """Record that `file_url` now holds the upload with this hash (call after every S3 upload)."""
+        with self._lock:
+            self._replace_stored(user_id, digest, file_url)
+
+    def _replace_stored(self, user_id, digest, file_url):
+        # Transcripts are stored under one key per user, so an upload replaces the bytes
+        # behind any other entry of the user's that points at the same object
+        for key, entry in list(self._entries.items()):
+            if key[0] == user_id and key[1] != digest and entry.file_url == file_url:
+                self._entries[key] = entry._replace(file_url=None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._metrics["hits"] + self._metrics["misses"]
+            return {
+                **self._metrics,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self._metrics["hits"] / lookups if lookups else 0.0,
+            }
+
+
+# Shared by the upload endpoint and the transcript job workers
+transcript_parse_cache = TranscriptParseCache()
@@ -0,0 +1,190 @@
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+# Poller settings for transcript analysis jobs
+TRANSCRIPT_JOB_WORKERS = int(os.getenv("TRANSCRIPT_JOB_WORKERS", "2"))
+TRANSCRIPT_JOB_INITIAL_DELAY = float(os.getenv("TRANSCRIPT_JOB_INITIAL_DELAY", "1"))
+TRANSCRIPT_JOB_MAX_DELAY = float(os.getenv("TRANSCRIPT_JOB_MAX_DELAY", "15"))
+TRANSCRIPT_JOB_TIMEOUT = float(os.getenv("TRANSCRIPT_JOB_TIMEOUT", "600"))
+# How long finished jobs stay available to the status endpoint
+TRANSCRIPT_JOB_RETENTION = float(os.getenv("TRANSCRIPT_JOB_RETENTION", "3600"))
+
+# Job states
+PENDING = "PENDING"
+RUNNING = "RUNNING"
+SUCCEEDED = "SUCCEEDED"
+FAILED = "FAILED"
+
+
+def _timestamp(seconds):
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat() if seconds else None
+
+
+class TranscriptJobQueue:
+    """
+    Polls asynchronous transcript analysis jobs off the request path.
+
+    Each job is checked by `handler(job)`, which returns None while the analysis is still
+    running and the job result once it is done (or raises if it failed). Checks back off
+    exponentially from `initial_delay` to `max_delay`; a job still unfinished after
+    `timeout` seconds fails. Jobs are kept in memory: a restart loses them and clients
+    upload again.
+    """
+
+    def __init__(self, handler, workers=TRANSCRIPT_JOB_WORKERS, initial_delay=TRANSCRIPT_JOB_INITIAL_DELAY,
+                 max_delay=TRANSCRIPT_JOB_MAX_DELAY, timeout=TRANSCRIPT_JOB_TIMEOUT,
+                 retention=TRANSCRIPT_JOB_RETENTION, poll_interval=1.0):
+        self.handler = handler
+        self.workers = workers
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.retention = retention
+        self.poll_interval = poll_interval
+        self.jobs = {}
+        self._condition = threading.Condition()
+        self._threads = []
+        self._stopping = False
+
+    def start(self):
+        with self._condition:
+            self._stopping = False
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"transcript-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=10):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, user_id, **details):
+        """
+        Queues a started analysis for polling.
+
+        :param details: Whatever the handler needs (e.g. the Textract job ID and S3 location).
+        :return: The job ID the client polls with.
+        """
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._condition:
+            self._purge(now)
+            self.jobs[job_id] = {
+                "job_id": job_id, "user_id": user_id, "status": PENDING, "details": details,
+                "polls": 0, "delay": self.initial_delay, "next_poll_at": now + self.initial_delay,
+                "created_at": now, "completed_at": None, "result": None, "error": None,
+            }
+            self._condition.notify()
+        return job_id
+
+    def complete(self, user_id, result):
+        """
+        Records a transcript that was processed during the upload request, so clients read
+        it through the same job status endpoint.
+
+        :return: The job ID of the finished job.
+        """
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._condition:
+            self._purge(now)
+            self.jobs[job_id] = {
+                "job_id": job_id, "user_id": user_id, "status": SUCCEEDED, "details": {},
+                "polls": 0, "delay": None, "next_poll_at": None,
+                "created_at": now, "completed_at": now, "result": result, "error": None,
+            }
+        return job_id
+
+    def active_job(self, user_id, **details):
+        """ID of an unfinished job of the user's whose details include `details`, if any."""
+        with self._condition:
+            for job in self.jobs.values():
+                if (job["user_id"] == user_id and job["status"] in (PENDING, RUNNING)
+                        and all(job["details"].get(key) == value for key, value in details.items())):
+                    return job["job_id"]
+        return None
+
+    def status(self, job_id):
+        """Public view of a job, or None if it is unknown (or expired)."""
+        with self._condition:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            job = dict(job)
+        return {
+            "job_id": job["job_id"],
+            "user_id": job["user_id"],
+            "status": job["status"],
+            "polls": job["polls"],
+            "created_at": _timestamp(job["created_at"]),
+            "completed_at": _timestamp(job["completed_at"]),
+            "result": job["result"],
+            "error": job["error"],
+        }
+
+    def wait_until_idle(self, timeout=10):
+        """Block until every job has finished (used by tests and scripts)."""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self._condition:
+                if all(job["status"] in (SUCCEEDED, FAILED) for job in self.jobs.values()):
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def _purge(self, now):
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job["completed_at"] is not None and now - job["completed_at"] > self.retention
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def _claim(self):
+        with self._condition:
+            while not self._stopping:
+                now = time.time()
+                due = [job for job in self.jobs.values() if job["status"] == PENDING and job["next_poll_at"] <= now]
+                if due:
+                    job = min(due, key=lambda job: job["next_poll_at"])
+                    job.update(status=RUNNING, polls=job["polls"] + 1)
+                    return dict(job)
+                pending = [job["next_poll_at"] for job in self.jobs.values() if job["status"] == PENDING]
+                wait = self.poll_interval if not pending else min(self.poll_interval, max(min(pending) - now, 0))
+                self._condition.wait(wait)
+            return None
+
+    def _finish(self, claimed, result=None, error=None):
+        now = time.time()
+        with self._condition:
+            job = self.jobs[claimed["job_id"]]
+            if error is not None:
+                job.update(status=FAILED, error=str(error), completed_at=now)
+            elif result is not None:
+                job.update(status=SUCCEEDED, result=result, completed_at=now)
+            elif now - job["created_at"] > self.timeout:
+                job.update(status=FAILED, error=f"Analysis did not finish within {self.timeout:.0f}s.", completed_at=now)
+            else:
+                delay = min(job["delay"] * 2, self.max_delay)
+                job.update(status=PENDING, delay=delay, next_poll_at=now + delay)
+            self._condition.notify_all()
+
+    def _work(self):
+        while True:
+            job = self._claim()
+            if job is None:
+                return
+            try:
+                result = self.handler(job)
+            except Exception as e:
+                print(f"Transcript job {job['job_id']} for user_id {job['user_id']} failed: {e}")
+                self._finish(job, error=e)
+            else:
+                self._finish(job, result=result)
@@ -0,0 +1,149 @@
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Grade recorded for courses without a final grade
+IN_PROGRESS_GRADE = "IP (In Progress)"
+
+# Largest credit value a single course can carry
+MAX_COURSE_CREDITS = 4
+
+# Header text (lowercased, single-spaced) -> field
+HEADER_FIELDS = {
+    "subject": "subject",
+    "course": "course",
+    "course number": "course",
+    "number": "course",
+    "level": "level",
+    "title": "title",
+    "course title": "title",
+    "grade": "grade",
+    "credit hours": "credits",
+    "credits": "credits",
+    "hours": "credits",
+    "gpa": "gpa",
+}
+
+# Column layout of course tables read before any header row (the registrar's course table order)
+DEFAULT_COLUMNS = {"subject": 0, "course": 1, "level": 2, "title": 3, "grade": 4, "credits": 5}
+
+# Course fields in the order _layout returns their columns
+COURSE_FIELDS = ("subject", "course", "level", "title", "grade", "credits")
+MISSING_COLUMN = 1 << 30
+
+COURSE_LEVELS = ("GR", "UG")
+SUBJECT = re.compile(r"[A-Z]{2,5}")
+COURSE_NUMBER = re.compile(r"\d{4}")
+GRADE = re.compile(r"[A-F][+-]?|S|N/A")
+
+
+class RowError(NamedTuple):
+    row: int  # Index of the row in the table rows
+    error: str
+
+
+class TranscriptParse(NamedTuple):
+    user_profile: Dict
+    completed_courses: List[Dict]
+    errors: List[RowError]
+
+
+def _header_columns(row: Sequence[str]) -> Dict[str, int]:
+    columns = {}
+    for index, cell in enumerate(row):
+        field = HEADER_FIELDS.get(" ".join(cell.lower().split()))
+        if field is not None and field not in columns:
+            columns[field] = index
+    return columns
+
+
+def _layout(columns: Dict[str, int]) -> Tuple[int, ...]:
+    # Column index per course field; fields the table lacks point past the end of any row
+    return tuple(columns.get(field, MISSING_COLUMN) for field in COURSE_FIELDS)
+
+
+def _label_value(row: Sequence[str]) -> str:
+    return ", ".join(cell.strip() for cell in row[1:] if cell.strip())
+
+
+def parse_transcript_rows(rows: Sequence[Sequence[str]]) -> TranscriptParse:
+    """
+    Parses transcript table rows (cell texts, as assembled from Textract) in one pass.
+
+    Course columns are mapped by the most recent header row (Subject, Course, Level, Title,
+    Grade, Credit Hours, in any order), falling back to the registrar's layout before one is
+    seen. Rows that look like courses but do not validate are reported in `errors` instead of
+    being guessed at.
+    """
+    layout = _layout(DEFAULT_COLUMNS)
+    gpa_column: Optional[int] = None
+    college = program = None
+    gpa = None
+    completed_courses, errors = [], []
+
+    for index, row in enumerate(rows):
+        if not row:
+            continue
+        width = len(row)
+        subject_col, course_col, level_col, title_col, grade_col, credits_col = layout
+
+        # Course rows are by far the most common, so they are recognized first
+        if level_col < width and row[level_col].strip() in COURSE_LEVELS:
+            subject = row[subject_col].strip() if subject_col < width else ""
+            number = row[course_col].strip() if course_col < width else ""
+            title = row[title_col].strip() if title_col < width else ""
+            grade = row[grade_col].strip() if grade_col < width else ""
+            credits = row[credits_col].strip() if credits_col < width else ""
+            if not SUBJECT.fullmatch(subject) or not COURSE_NUMBER.fullmatch(number):
+                errors.append(RowError(index, f"Invalid course code: {subject!r} {number!r}"))
+                continue
+            if not title:
+                errors.append(RowError(index, f"Missing title for {subject} {number}"))
+                continue
+            if grade and not GRADE.fullmatch(grade):
+                errors.append(RowError(index, f"Unrecognized grade {grade!r} for {subject} {number}"))
+                continue
+            try:
+                credit_value = float(credits) if credits else 0.0
+            except ValueError:
+                errors.append(RowError(index, f"Credits are not a number for {subject} {number}: {credits!r}"))
+                continue
+            if not 0 <= credit_value <= MAX_COURSE_CREDITS:
+                errors.append(RowError(index, f"Credits out of range for {subject} {number}: {credit_value}"))
+                continue
+            completed_courses.append({
+                "course_code": f"{subject} {number}",
+                "course_name": title,
+                "grade": grade if grade else IN_PROGRESS_GRADE,
+                "credits": credit_value,
+            })
+            continue
+
+        label = row[0].strip()
+        if label == "College:":
+            if college is None:
+                college = _label_value(row)
+        elif label == "Major and Department:":
+            if program is None:
+                program = _label_value(row)
+        elif label == "Overall:":
+            if gpa is None:
+                values = [cell.strip() for cell in row[1:] if cell.strip()]
+                value = row[gpa_column].strip() if gpa_column is not None and gpa_column < width else (
+                    values[-1] if values else "")
+                try:
+                    gpa = float(value)
+                except ValueError:
+                    errors.append(RowError(index, f"Overall GPA is not a number: {value!r}"))
+        else:
+            header = _header_columns(row)
+            if "subject" in header and "title" in header:
+                layout = _layout(header)
+            elif "gpa" in header:
+                gpa_column = header["gpa"]
+
+    user_profile = {
+        "college": college or "Not Found",
+        "program_id": program or "Not Found",
+        "gpa": gpa if gpa else "Not Found",
+    }
+    return TranscriptParse(user_profile, completed_courses, errors)
@@ -0,0 +1,167 @@
+import hashlib
+import io
+import os
+import re
+from typing import BinaryIO, List, Optional
+from PyPDF2 import PdfReader
+
+# Largest transcript accepted, in pages
+MAX_TRANSCRIPT_PAGES = 10
+
+# Size of each S3 multipart part (S3 requires at least 5 MiB for all but the last part)
+S3_UPLOAD_PART_SIZE = max(int(os.getenv("S3_UPLOAD_PART_SIZE", str(8 * 1024 * 1024))), 5 * 1024 * 1024)
+
+# Read size while scanning an upload
+READ_CHUNK_SIZE = 256 * 1024
+
+# A page object ("/Type /Page", not "/Type /Pages")
+PAGE_OBJECT = re.compile(rb"/Type\s*/Page(?![A-Za-z0-9])")
+# Bytes carried over between chunks so a marker split across them is still found
+CHUNK_OVERLAP = 32
+
+
+class InvalidTranscriptFile(ValueError):
+    """The upload is not a PDF the transcript pipeline accepts."""
+
+
+class StagedUpload:
+    """
+    A transcript read once from the client: its SHA-256, page count and S3 upload in progress.
+
+    Files up to one part are held in memory until complete(); larger files are already being
+    sent as multipart parts. Nothing becomes visible in S3 until complete(); abort() discards it.
+    """
+
+    def __init__(self, s3, bucket: str, key: str, stream: Optional[BinaryIO] = None):
+        self.s3 = s3
+        self.bucket = bucket
+        self.key = key
+        self.digest = None
+        self.pages = 0
+        self.size = 0
+        self._stream = stream
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[dict] = []
+        self._reader: Optional[PdfReader] = None
+
+    def reader(self) -> PdfReader:
+        """
+        The parsed document, built at most once per upload (the page count fallback shares it).
+        Files held in memory are parsed from there; files larger than one part, whose bytes
+        have already gone to S3, are deliberately read a second time from the stream.
+
+        :raises InvalidTranscriptFile: The document cannot be parsed.
+        """
+        if self._reader is None:
+            # Held in memory once the whole file has been read and until complete() releases it
+            if self.digest is not None and self._upload_id is None and len(self._buffer) == self.size:
+                source = io.BytesIO(bytes(self._buffer))
+            else:
+                source = self._stream
+                source.seek(0)
+            try:
+                self._reader = PdfReader(source)
+            except Exception as e:
+                raise InvalidTranscriptFile(f"Invalid PDF file: {e}")
+        return self._reader
+
+    def _send_part(self):
+        if self._upload_id is None:
+            self._upload_id = self.s3.create_multipart_upload(Bucket=self.bucket, Key=self.key)["UploadId"]
+        part_number = len(self._parts) + 1
+        response = self.s3.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id,
+            PartNumber=part_number, Body=bytes(self._buffer),
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        self._buffer.clear()
+
+    def complete(self):
+        """Makes the upload visible in S3 under `key`."""
+        if self._upload_id is None:
+            self.s3.put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer))
+        else:
+            if self._buffer:
+                self._send_part()
+            self.s3.complete_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+        self._buffer.clear()
+
+    def abort(self):
+        """Discards the upload; the object already stored under `key` is left as it was."""
+        if self._upload_id is not None:
+            self.s3.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self._upload_id)
+            self._upload_id = None
+        self._buffer.clear()
+
+
+def _parsed_page_count(staged: StagedUpload) -> int:
+    try:
+        return len(staged.reader().pages)
+    except InvalidTranscriptFile:
+        raise
+    except Exception as e:
+        raise InvalidTranscriptFile(f"Invalid PDF file: {e}")
+
+
+def stage_upload(stream: BinaryIO, s3, bucket: str, key: str, max_pages: int = MAX_TRANSCRIPT_PAGES,
+                 part_size: int = S3_UPLOAD_PART_SIZE) -> StagedUpload:
+    """
+    Reads an uploaded PDF once: checks the header, counts pages as it goes (rejecting the file
+    as soon as it exceeds `max_pages`), hashes it and sends it to S3 part by part.
+
+    Page objects stored inside compressed object streams cannot be counted this way; when
+    none are found, the count is taken from the parsed document instead. The document is not
+    otherwise parsed here; StagedUpload.reader() parses it once, when it is needed.
+    Leaves the stream at the start.
+
+    :raises InvalidTranscriptFile: Not a PDF, unreadable, or too many pages.
+    """
+    staged = StagedUpload(s3, bucket, key, stream)
+    digest = hashlib.sha256()
+    try:
+        if stream.read(5) != b"%PDF-":
+            raise InvalidTranscriptFile("Uploaded file is not a valid PDF.")
+        stream.seek(0)
+
+        tail = b""
+        counting = True
+        for chunk in iter(lambda: stream.read(READ_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            staged.size += len(chunk)
+            if counting:
+                window = tail + chunk
+                # A marker is counted once a byte follows it (so "/Pages" split across chunks is not
+                # taken for a page); markers ending before the last tail byte were counted already
+                staged.pages += sum(
+                    1 for match in PAGE_OBJECT.finditer(window) if len(tail) <= match.end() < len(window)
+                )
+                tail = window[-CHUNK_OVERLAP:]
+                if staged.pages > max_pages:
+                    # Incremental updates repeat page objects, so confirm before rejecting
+                    position = stream.tell()
+                    staged.pages = _parsed_page_count(staged)
+                    if staged.pages > max_pages:
+                        raise InvalidTranscriptFile(f"PDF must not exceed {max_pages} pages.")
+                    stream.seek(position)
+                    counting = False
+
+            staged._buffer += chunk
+            if len(staged._buffer) >= part_size:
+                staged._send_part()
+
+        staged.digest = digest.hexdigest()
+        if staged.pages == 0:
+            staged.pages = _parsed_page_count(staged)
+            if staged.pages > max_pages:
+                raise InvalidTranscriptFile(f"PDF must not exceed {max_pages} pages.")
+    except Exception:
+        staged.abort()
+        raise
+    finally:
+        stream.seek(0)
+
+    return staged
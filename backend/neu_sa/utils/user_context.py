@@ -0,0 +1,173 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional
+import snowflake.connector
+
+# Number of users whose context is kept in memory (least recently used are evicted first)
+USER_CONTEXT_CACHE_SIZE = int(os.getenv("USER_CONTEXT_CACHE_SIZE", "1024"))
+
+# Upper bound (seconds) on how long an entry is served without a reload. Writes made by this
+# process invalidate entries immediately; this only bounds staleness from other writers
+# (the bulk recalculation CLI, other API workers).
+USER_CONTEXT_CACHE_TTL = float(os.getenv("USER_CONTEXT_CACHE_TTL", "300"))
+
+
+def get_snowflake_connection():
+    return snowflake.connector.connect(
+        user=os.getenv("SNOWFLAKE_USER"),
+        password=os.getenv("SNOWFLAKE_PASSWORD"),
+        account=os.getenv("SNOWFLAKE_ACCOUNT"),
+        warehouse=os.getenv("SNOWFLAKE_WAREHOUSE", "WH_NEU_SA"),
+        database=os.getenv("SNOWFLAKE_DATABASE", "DB_NEU_SA"),
+        schema=os.getenv("SNOWFLAKE_SCHEMA", "NEU_SA"),
+    )
+
+
+class UserContext(NamedTuple):
+    """A user's profile, courses, eligibility rows and advising context, read together."""
+    user_id: int
+    version: int
+    profile: Optional[Dict[str, Any]]  # None when the user has no profile row
+    courses: List[Dict[str, Any]]
+    eligibility: List[Dict[str, Any]]
+    advising: Optional[Dict[str, Any]] = None  # USER_ADVISING_CONTEXT pack, if one has been written
+
+    @property
+    def completed_courses(self) -> List[Dict[str, Any]]:
+        """Courses in the shape the eligibility kernel expects."""
+        return [
+            {"course_code": course["course_code"], "credits": course["credits"], "grade": course["grade"]}
+            for course in self.courses
+        ]
+
+
+def _as_object(value) -> Optional[Dict[str, Any]]:
+    # The connector returns OBJECT columns as JSON text; USER_ADVISING_CONTEXT.CONTEXT may be NULL
+    if value is None:
+        return None
+    return json.loads(value) if isinstance(value, str) else dict(value)
+
+
+# Fetch a user's profile, courses, eligibility rows and advising context in one round trip
+def fetch_user_context(conn, user_id: int) -> UserContext:
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT 'PROFILE' AS KIND, OBJECT_CONSTRUCT_KEEP_NULL(
+                'username', USERNAME, 'college', COLLEGE, 'program_name', PROGRAM_NAME,
+                'program_id', PROGRAM_ID, 'gpa', GPA, 'campus', CAMPUS, 'transcript_link', TRANSCRIPT_LINK,
+                'completed_credits', COMPLETED_CREDITS, 'version', VERSION
+            ) AS DATA
+            FROM USER_PROFILE WHERE USER_ID = %s
+            UNION ALL
+            SELECT 'COURSE', OBJECT_CONSTRUCT_KEEP_NULL(
+                'course_code', COURSE_CODE, 'course_name', COURSE_NAME, 'grade', GRADE, 'credits', CREDITS
+            )
+            FROM USER_COURSES WHERE USER_ID = %s
+            UNION ALL
+            SELECT 'ELIGIBILITY', OBJECT_CONSTRUCT_KEEP_NULL(
+                'course_or_requirement', COURSE_OR_REQUIREMENT, 'eligible', ELIGIBLE,
+                'details', DETAILS, 'status', STATUS
+            )
+            FROM USER_ELIGIBILITY WHERE USER_ID = %s
+            UNION ALL
+            SELECT 'ADVISING', CONTEXT FROM USER_ADVISING_CONTEXT WHERE USER_ID = %s;
+            """,
+            (user_id, user_id, user_id, user_id)
+        )
+        profile, courses, eligibility, advising = None, [], [], None
+        for kind, data in cursor.fetchall():
+            data = _as_object(data)
+            if kind == "PROFILE":
+                profile = data
+            elif kind == "COURSE":
+                courses.append(data)
+            elif kind == "ELIGIBILITY":
+                eligibility.append(data)
+            elif data is not None:
+                advising = data
+    finally:
+        cursor.close()
+
+    version = (profile.get("version") or 0) if profile else 0
+    return UserContext(user_id, version, profile, courses, eligibility, advising)
+
+
+def load_user_context(user_id: int) -> UserContext:
+    conn = get_snowflake_connection()
+    try:
+        return fetch_user_context(conn, user_id)
+    finally:
+        conn.close()
+
+
+class UserContextCache:
+    """
+    Read-through LRU of UserContext entries shared by the routers and the chat agents.
+
+    Every endpoint that changes a user's profile, courses or eligibility must call
+    invalidate(user_id). Callers that already know the stored version can pass it to get()
+    so an entry read at an older version is reloaded.
+    """
+
+    def __init__(self, maxsize=USER_CONTEXT_CACHE_SIZE, ttl=USER_CONTEXT_CACHE_TTL, loader=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._loader = loader
+        self._entries = OrderedDict()  # user_id -> (loaded_at, UserContext)
+        self._lock = threading.Lock()
+        self._invalidations = 0
+        self._metrics = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, user_id: int, version: Optional[int] = None) -> UserContext:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and now - entry[0] < self.ttl and (version is None or entry[1].version == version):
+                self._entries.move_to_end(user_id)
+                self._metrics["hits"] += 1
+                return entry[1]
+            self._metrics["misses"] += 1
+            invalidations = self._invalidations
+
+        # Loaded outside the lock so one slow query does not block other users
+        context = (self._loader or load_user_context)(user_id)
+
+        with self._lock:
+            # An invalidation during the load may mean the context was read before a write
+            if invalidations == self._invalidations:
+                self._entries[user_id] = (now, context)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self._metrics["evictions"] += 1
+        return context
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._invalidations += 1
+            self._metrics["invalidations"] += 1
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._metrics["hits"] + self._metrics["misses"]
+            return {
+                **self._metrics,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self._metrics["hits"] / lookups if lookups else 0.0,
+            }
+
+
+# Shared by every router and agent in this process
+user_context_cache = UserContextCache()
@@ -0,0 +1,102 @@
+import os
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+from neu_sa.utils.eligibility_kernel import (
+    FAILED_GRADE,
+    IN_PROGRESS_GRADE,
+    ProgramRequirements,
+    evaluate_program,
+    index_transcript,
+)
+from neu_sa.utils.prerequisite_graph import PrerequisiteGraph, best_grades
+
+# Upper bound on scenarios per request, so one call stays within a request budget
+WHAT_IF_MAX_SCENARIOS = int(os.getenv("WHAT_IF_MAX_SCENARIOS", "500"))
+
+# Credits assumed for a hypothetical course missing from the catalog
+DEFAULT_COURSE_CREDITS = 4.0
+
+
+def _scenario_key(scenario):
+    return (
+        tuple(sorted((course["course_code"], course.get("credits"), course.get("grade")) for course in scenario.get("add", ()))),
+        tuple(sorted(scenario.get("drop", ()))),
+    )
+
+
+def evaluate_scenario(program: ProgramRequirements, completed_courses: List[Dict[str, Any]], scenario: Mapping,
+                      course_credits: Mapping[str, float], prerequisite_graph: Optional[PrerequisiteGraph] = None,
+                      base_grades: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    """
+    Evaluates one hypothetical schedule against the user's transcript, entirely in memory.
+
+    :param completed_courses: The user's real courses (course_code, credits, grade).
+    :param scenario: {"add": [{"course_code", "credits"?, "grade"?}], "drop": [course_code, ...]}.
+                     Added courses default to in progress with their catalog credits.
+    :param base_grades: best_grades(completed_courses), precomputed when evaluating many scenarios.
+    """
+    dropped = set(scenario.get("drop", ()))
+    added = [
+        {
+            "course_code": course["course_code"],
+            "credits": course.get("credits") if course.get("credits") is not None
+            else course_credits.get(course["course_code"], DEFAULT_COURSE_CREDITS),
+            "grade": course.get("grade") or IN_PROGRESS_GRADE,
+        }
+        for course in scenario.get("add", ())
+    ]
+    # Added courses replace earlier attempts (retakes); the transcript index would keep the first occurrence
+    replaced = dropped | {course["course_code"] for course in added}
+    courses = [course for course in completed_courses if course["course_code"] not in replaced] + added
+
+    _, progress = evaluate_program(program, index_transcript(courses))
+    total_credits = sum(course["credits"] or 0 for course in courses if course["grade"] != FAILED_GRADE)
+
+    # Added courses are taken together, so only the real transcript (minus drops) counts toward their prerequisites
+    prerequisite_issues = {}
+    if prerequisite_graph is not None and added:
+        grades = base_grades if base_grades is not None and not dropped else best_grades(
+            course for course in completed_courses if course["course_code"] not in dropped
+        )
+        for course in added:
+            unmet = prerequisite_graph.unmet_prerequisites(course["course_code"], grades)
+            if unmet:
+                prerequisite_issues[course["course_code"]] = unmet
+
+    return {
+        "requirements": [
+            {
+                "requirement": bucket.requirement,
+                "credits": bucket.credits,
+                "required_credits": bucket.required_credits,
+                "remaining_credits": max(bucket.required_credits - bucket.credits, 0),
+                "satisfied": bucket.satisfied,
+                "courses": list(bucket.courses),
+            }
+            for bucket in progress
+        ],
+        "total_credits": total_credits,
+        "program_credits": program.max_credit_hours,
+        "remaining_credits": max(program.max_credit_hours - total_credits, 0),
+        "all_requirements_satisfied": all(bucket.satisfied for bucket in progress),
+        "prerequisite_issues": prerequisite_issues,
+    }
+
+
+def evaluate_scenarios(program: ProgramRequirements, completed_courses: List[Dict[str, Any]],
+                       scenarios: Iterable[Mapping], course_credits: Mapping[str, float],
+                       prerequisite_graph: Optional[PrerequisiteGraph] = None) -> List[Dict[str, Any]]:
+    """
+    Evaluates a batch of scenarios; identical scenarios are computed once.
+
+    :return: One result per scenario, in request order, each tagged with the scenario name (or index).
+    """
+    base_grades = best_grades(completed_courses)
+    cache = {}
+    results = []
+    for index, scenario in enumerate(scenarios):
+        key = _scenario_key(scenario)
+        if key not in cache:
+            cache[key] = evaluate_scenario(program, completed_courses, scenario, course_credits,
+                                           prerequisite_graph, base_grades)
+        results.append({"scenario": scenario.get("name") or str(index), **cache[key]})
+    return results
@@ -3,10 +3,12 @@ import requests
 import pandas as pd
 from dotenv import load_dotenv
 import os
+import time
 
 # Load environment variables
 load_dotenv()
 API_URL = os.getenv("BACKEND_URL")  # Backend API URL
+TRANSCRIPT_JOB_TIMEOUT = 180  # Seconds to wait for transcript processing
 
 def handle_session_expiration():
     """
@@ -63,14 +65,21 @@ CAMPUS_OPTIONS = [
 # Fetch user data
 def fetch_user_data(user_id, jwt_token):
     try:
-        response = requests.get(
-            f"{API_URL}/user/{user_id}",
-            headers={"Authorization": f"Bearer {jwt_token}"}
-        )
+        headers = {"Authorization": f"Bearer {jwt_token}"}
+        # Revalidate the cached copy; the backend answers 304 if the profile and courses are unchanged
+        cached = st.session_state.get("user_data_cache")
+        if cached and cached.get("user_id") == user_id:
+            headers["If-None-Match"] = cached["etag"]
+        response = requests.get(f"{API_URL}/user/{user_id}", headers=headers)
         if response.status_code == 401:
             handle_session_expiration()
+        if response.status_code == 304:
+            return cached["data"]
         response.raise_for_status()
-        return response.json()
+        user_data = response.json()
+        if response.headers.get("ETag"):
+            st.session_state["user_data_cache"] = {"user_id": user_id, "etag": response.headers["ETag"], "data": user_data}
+        return user_data
     except requests.exceptions.RequestException as e:
         st.error(f"Error fetching user data: {e}")
         return None
@@ -118,18 +127,48 @@ def upload_transcript(file, user_id, jwt_token):
         if response.status_code == 401:
             handle_session_expiration()
         # Handle response status
-        elif response.status_code != 200:
+        elif response.status_code not in (200, 202):
             st.error(f"Failed to upload transcript: {response.json().get('detail', 'Unknown error occurred.')}")
             return None
 
-        # Parse and return response data
-        return response.json()
+        # Digital transcripts come back processed; otherwise processing continues in the
+        # background and we wait for the job to finish
+        job = response.json()
+        if job["status"] == "SUCCEEDED":
+            return job
+        with st.spinner("Processing transcript..."):
+            return wait_for_transcript_job(job["job_id"], jwt_token)
 
     except requests.exceptions.RequestException as e:
         # Handle exceptions during the request
         st.error(f"Error uploading transcript: {e}")
         return None
 
+# Poll a transcript processing job until it finishes
+def wait_for_transcript_job(job_id, jwt_token, timeout=TRANSCRIPT_JOB_TIMEOUT):
+    headers = {"Authorization": f"Bearer {jwt_token}"}
+    delay = 1
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        response = requests.get(f"{API_URL}/transcripts/jobs/{job_id}", headers=headers)
+        if response.status_code == 401:
+            handle_session_expiration()
+        elif response.status_code != 200:
+            st.error(f"Failed to check transcript processing: {response.json().get('detail', 'Unknown error occurred.')}")
+            return None
+
+        job = response.json()
+        if job["status"] == "SUCCEEDED":
+            return job
+        if job["status"] == "FAILED":
+            st.error(f"Failed to process transcript: {job.get('error', 'Unknown error occurred.')}")
+            return None
+        time.sleep(delay)
+        delay = min(delay * 2, 5)
+
+    st.error("Transcript processing is taking longer than expected. Please try again later.")
+    return None
+
 def save_courses_to_snowflake(user_id, courses, jwt_token):
     try:
         response = requests.put(
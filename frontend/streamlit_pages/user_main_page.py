@@ -21,14 +21,21 @@ def fetch_user_data(user_id, jwt_token):
     Fetch user data from the backend API.
     """
     try:
-        response = requests.get(
-            f"{API_URL}/user/{user_id}",
-            headers={"Authorization": f"Bearer {jwt_token}"}
-        )
-        if response.status_code == 401:  
+        headers = {"Authorization": f"Bearer {jwt_token}"}
+        # Revalidate the cached copy; the backend answers 304 if the profile and courses are unchanged
+        cached = st.session_state.get("user_data_cache")
+        if cached and cached.get("user_id") == user_id:
+            headers["If-None-Match"] = cached["etag"]
+        response = requests.get(f"{API_URL}/user/{user_id}", headers=headers)
+        if response.status_code == 401:
             handle_session_expiration()
-        response.raise_for_status()  # Raise an exception for HTTP errors
-        return response.json()
+        if response.status_code == 304:
+            return cached["data"]
+        response.raise_for_status()
+        user_data = response.json()
+        if response.headers.get("ETag"):
+            st.session_state["user_data_cache"] = {"user_id": user_id, "etag": response.headers["ETag"], "data": user_data}
+        return user_data
         
     except requests.exceptions.RequestException as e:
         st.error(f"Error fetching user data: {e}")